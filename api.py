@@ -0,0 +1,162 @@
+"""Read-only HTTP/JSON API over the belt snapshot"""
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from log import log_event
+from snapshot import TOP_REIGNS, SnapshotReader, is_complete
+
+logger = logging.getLogger(__name__)
+
+
+class BeltAPI:
+    """
+    Serves the bot's latest snapshot so other tools don't have to replay
+    the lineage themselves:
+
+        GET /champion
+        GET /next
+        GET /history/{team name or ID}
+        GET /reigns/top?by=days|defenses&limit=10
+        GET /chase
+
+    Every successful response carries an ETag for the snapshot's data
+    version, and a matching If-None-Match gets a bodiless 304. Bodies are rendered once
+    per data version and then served from memory, until the next belt game
+    kicks off and /next empties.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.server = None
+        self._state = None  # (etag, reader, rendered bodies, next game), swapped whole
+        self._lock = threading.Lock()
+
+    def update(self, snapshot: Dict):
+        """Serve a new snapshot, unless it was built without the games sheet"""
+        if not is_complete(snapshot):
+            log_event(logger, 'api_snapshot_rejected', logging.WARNING, data_version=snapshot['data_version'])
+            return
+        etag = f'"{snapshot["data_version"]}-{snapshot["generated_at"]}"'
+        reader = SnapshotReader(snapshot)
+        self._state = (etag, reader, {}, reader.get_next_belt_game())
+
+    def start(self):
+        """Serve on a daemon thread"""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive for pollers
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def do_GET(self):
+                status, etag, body = api.respond(self.path, self.headers.get('If-None-Match'))
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Pollers would flood the bot's log
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='belt-api', daemon=True).start()
+        log_event(logger, 'api_serving', url=f"http://{self.host}:{self.server.server_address[1]}")
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def respond(self, path: str, if_none_match: Optional[str] = None) -> Tuple[int, Optional[str], bytes]:
+        """Return (status, etag, body) for a request path"""
+        state = self._state
+        if state is None:
+            return 503, None, self._json({'error': 'belt data not loaded yet'})
+        etag, reader, rendered, next_game = state
+        if next_game is not None and reader.get_next_belt_game() is None:
+            # The next game kicked off: /next changes without a new snapshot
+            kicked_off = (etag[:-1] + '-kickoff"', reader, {}, None)
+            with self._lock:
+                if self._state is state:
+                    self._state = kicked_off
+            etag, reader, rendered, next_game = state = kicked_off
+
+        # Only successful bodies are cached, and only they can be Not Modified
+        body = rendered.get(path)
+        if body is None:
+            status, data = self._route(reader, path)
+            body = self._json(data)
+            if status != 200:
+                return status, None, body
+            with self._lock:
+                if len(rendered) < 1000:  # Bound the cache; paths can be anything
+                    rendered[path] = body
+
+        if if_none_match == etag:
+            return 304, etag, b''
+        return 200, etag, body
+
+    def _route(self, reader: SnapshotReader, path: str) -> Tuple[int, object]:
+        url = urlparse(path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        snapshot = reader.snapshot
+
+        if parts == ['champion']:
+            champion = snapshot['champion']
+            return 200, {
+                'champion_id': champion['id'],
+                'champion_name': reader.get_school_name(champion['id']) if champion['id'] else None,
+                'start_date': champion['start_date'],
+                'defenses': champion['defenses'],
+                'provisional': champion['provisional'],
+                'data_version': snapshot['data_version']
+            }
+
+        if parts == ['next']:
+            # Same as the CLI: nothing once it has kicked off
+            return 200, snapshot['next_game'] if reader.get_next_belt_game() else None
+
+        if len(parts) == 2 and parts[0] == 'history':
+            team = parts[1]
+            if team.isdigit() and int(team) in reader.schools:
+                result = (int(team), reader.schools[int(team)])
+            else:
+                result = reader.find_team_by_name(team)
+            if not result:
+                return 404, {'error': f"no team matching '{team}'"}
+            team_id, team_name = result
+            history = snapshot['history'].get(str(team_id))
+            if history is None:
+                history = dict(reader.get_team_belt_history(team_id), last_held=None)
+            return 200, dict(history, team_id=team_id, team_name=team_name)
+
+        if parts == ['reigns', 'top']:
+            query = parse_qs(url.query)
+            by = query.get('by', ['days'])[0]
+            top_reigns = snapshot.get('top_reigns', {})
+            if by not in ('days', 'defenses'):
+                return 400, {'error': "by must be 'days' or 'defenses'"}
+            try:
+                limit = max(1, min(TOP_REIGNS, int(query.get('limit', ['10'])[0])))
+            except ValueError:
+                return 400, {'error': 'limit must be a number'}
+            return 200, top_reigns.get(by, [])[:limit]
+
+        if parts == ['chase']:
+            return 200, snapshot['chase']
+
+        return 404, {'error': 'not found'}
+
+    @staticmethod
+    def _json(data) -> bytes:
+        return json.dumps(data).encode()
@@ -0,0 +1,100 @@
+"""
+Command-line belt lookups, answered from the snapshot the bot saves.
+
+    python beltbot.py status
+    python beltbot.py history Michigan
+    python beltbot.py decade 1950s
+    python beltbot.py on-this-day 11-06
+    python beltbot.py whatif Michigan beats Ohio State
+
+Only json and the formatting code are imported on the fast path; pandas
+and the sheet loaders are imported only with --live, for whatif (which
+searches the schedule) or when there is no snapshot yet.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+import config
+from log import setup_logging
+from snapshot import SnapshotReader, load_snapshot
+
+
+def _source(args):
+    """A fetcher-like source: the saved snapshot, or the live sheets"""
+    if not args.live:
+        snapshot = load_snapshot(args.snapshot)
+        if snapshot is not None:
+            return SnapshotReader(snapshot)
+        print(f"No snapshot at {args.snapshot}, loading the sheets...", file=sys.stderr)
+
+    from data_fetcher import BeltDataFetcher
+    fetcher = BeltDataFetcher()
+    if not args.live:
+        from snapshot import build_snapshot, is_complete, write_snapshot
+        snapshot = build_snapshot(fetcher)
+        if is_complete(snapshot):
+            write_snapshot(snapshot, args.snapshot)
+    return fetcher
+
+
+def _print_post(post):
+    if not post:
+        print("Nothing to show.")
+        return
+    print(post['title'])
+    print()
+    print(post['body'])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='beltbot', description='CFB Linear Championship Belt lookups')
+    parser.add_argument('--snapshot', default=config.SNAPSHOT_PATH, help='snapshot file saved by the bot')
+    parser.add_argument('--live', action='store_true', help='load the sheets instead of the snapshot')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    subcommands.add_parser('status', help='current belt holder')
+    subcommands.add_parser('next', help='next belt game')
+    subcommands.add_parser('stats', help='overall belt statistics')
+    history = subcommands.add_parser('history', help="a team's belt history")
+    history.add_argument('argument', nargs='+', metavar='team')
+    season = subcommands.add_parser('season', help="a season's belt games")
+    season.add_argument('argument', nargs=1, metavar='year')
+    decade = subcommands.add_parser('decade', help="a decade's belt games")
+    decade.add_argument('argument', nargs=1, metavar='decade', help='e.g. 1950s')
+    conference = subcommands.add_parser('conference', help="belt games by a conference's teams")
+    conference.add_argument('argument', nargs='+', metavar='conference')
+    subcommands.add_parser('chase', help='teams that can still win the belt this season')
+    whatif = subcommands.add_parser('whatif', help='the belt chase after a hypothetical result')
+    whatif.add_argument('argument', nargs='+', metavar='result', help='e.g. Michigan beats Ohio State')
+    on_this_day = subcommands.add_parser('on-this-day', help='belt games on a date in history')
+    on_this_day.add_argument('date', nargs='?', help='MM-DD (default: today)')
+    args = parser.parse_args(argv)
+    setup_logging('WARNING', 'text', sys.stderr, background=False)  # Only problems, and not on stdout
+    if args.command == 'whatif':
+        args.live = True  # The snapshot doesn't carry the schedule
+
+    source = _source(args)
+
+    if args.command in ('status', 'next', 'stats', 'history', 'season', 'decade', 'conference', 'whatif'):
+        from commands import CommandHandler
+        argument = ' '.join(args.argument).lower() if 'argument' in args else None
+        print(CommandHandler(source).get_section(args.command, argument))
+        return 0
+
+    from scheduled_posts import ScheduledPosts
+    posts = ScheduledPosts(source)
+    if args.command == 'chase':
+        _print_post(posts.generate_belt_chase_update())
+    else:
+        now = datetime.now()
+        if args.date:
+            try:
+                now = datetime.strptime(f"{now.year}-{args.date}", '%Y-%m-%d')
+            except ValueError:
+                parser.error(f"date must be MM-DD, got {args.date!r}")
+        _print_post(posts.generate_on_this_day(now))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
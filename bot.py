@@ -1,21 +1,43 @@
 """Main CFB Belt Bot"""
+import logging
 import praw
 import time
+from functools import partial
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
-import re
+from collections import deque
 
 import config
+from api import BeltAPI
+from cadence import Cadence
+from chase import ChaseWorker, belt_chase
+from chase_history import replay_season
 from commands import CommandHandler
 from data_fetcher import BeltDataFetcher
-from scheduled_posts import ScheduledPosts
+from ingest import CheckpointStore, ListingCursor
+from ledger import WorkLedger
+from log import Sampler, log_event, setup_logging
+from rate_governor import RateGovernor
+from work_queue import PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, PRIORITY_THREAD, WorkQueue
+from scheduled_posts import PrerenderedPosts, ScheduledPosts
+from schedule_index import utc_now
+from snapshot import build_snapshot, is_complete, load_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Pre-rendered post type -> scheduler job that publishes it
+PRERENDERED_JOBS = {
+    'on_this_day': 'on_this_day',
+    'belt_chase': 'belt_chase',
+    'longest_reign': 'longest_reign_check',
+}
 
 class CFBBeltBot:
     def __init__(self):
         """Initialize the bot"""
-        print("Initializing CFB Belt Bot...")
+        log_event(logger, 'bot_initializing')
 
         # Initialize Reddit connection
         self.reddit = praw.Reddit(
@@ -26,27 +48,107 @@ class CFBBeltBot:
             user_agent=config.REDDIT_USER_AGENT
         )
 
-        print(f"Logged in as: {self.reddit.user.me()}")
+        log_event(logger, 'logged_in', user=str(self.reddit.user.me()))
 
-        self.subreddit = self.reddit.subreddit(config.TARGET_SUBREDDIT)
-        self.command_handler = CommandHandler()
+        # One combined "sub1+sub2" stream covers every subreddit, so API calls
+        # per cycle don't grow with the number of subreddits
+        self.subreddit_names = {name.lower(): name for name in config.TARGET_SUBREDDITS}
+        self.multireddit = '+'.join(config.TARGET_SUBREDDITS)
+        cold_start = time.time() - config.COLD_START_SECONDS
+        self.submission_cursor = ListingCursor(
+            lambda params: self.reddit.get(f"r/{self.multireddit}/new", params=params),
+            since=cold_start
+        )
+        self.comment_cursor = ListingCursor(
+            lambda params: self.reddit.get(f"r/{self.multireddit}/comments", params=params),
+            since=cold_start
+        )
+        self.mention_cursor = ListingCursor(
+            lambda params: self.reddit.get("message/mentions", params=params),
+            since=cold_start
+        )
+
+        # Resume each listing from where the last run stopped
+        self.checkpoints = CheckpointStore(config.CHECKPOINT_PATH)
+        self.cursors = {
+            'submissions': self.submission_cursor,
+            'comments': self.comment_cursor,
+            'mentions': self.mention_cursor,
+        }
+        self._resume = {}  # stream -> fullnames the last run had queued but not sent
+        for stream, cursor in self.cursors.items():
+            checkpoint = self.checkpoints.get(stream)
+            if checkpoint:
+                cursor.restore(checkpoint, max_age=config.CATCHUP_MAX_SECONDS)
+                self._resume[stream] = checkpoint.get('pending', [])
+                log_event(logger, 'cursor_resumed', stream=stream, item_id=checkpoint['fullname'],
+                          pending=len(self._resume[stream]))
         self.fetcher = BeltDataFetcher()
-        self.scheduled_posts = ScheduledPosts()
+        self.command_handler = CommandHandler(self.fetcher)
+        self.scheduled_posts = ScheduledPosts(self.fetcher)
+        self.prerendered = PrerenderedPosts(self.scheduled_posts)
+        self.cadence = Cadence(self.fetcher)
+        self._prerender_pending = set()
+        self._snapshot_version = None  # Data version last saved for the CLI
+        self.sampler = Sampler(config.LOG_SAMPLE_SECONDS)  # Debug events from the polling paths
+        self._snapshot_pending = False
+
+        # Belt chase searches run in a worker process, off the main loop
+        self.chase_worker = ChaseWorker(config.CHASE_WORKERS) if config.CHASE_WORKERS else None
+        self._chase = None  # (key, future, submitted at) while a search is running
+        self._chase_failed = None  # Key whose search failed; computed inline instead
+        self._season_chases = None  # (jobs, futures, submitted at) while past seasons are replayed
+
+        # Optional JSON API, seeded from the last saved snapshot until the data loads
+        self.api = None
+        if config.API_PORT:
+            self.api = BeltAPI(config.API_HOST, config.API_PORT)
+            snapshot = load_snapshot(config.SNAPSHOT_PATH)
+            if snapshot:
+                self.api.update(snapshot)
 
         # Track recent replies and posts to avoid spam
         self.recent_replies = {}
         self.commented_threads = {}  # Track which game/postgame threads we've commented on
         self.last_post_time = {}  # Track when we last made each type of post
 
+        # Work runs on the main loop, user replies first
+        self.work = WorkQueue()
+
+        # Every reply, comment and post goes through the rate governor, with
+        # limits per subreddit ("*" covers mentions from anywhere else)
+        limits = {
+            'reply:*': config.MAX_REPLIES_PER_HOUR,
+            'comment:*': config.MAX_REPLIES_PER_HOUR,
+            'post:*': config.MAX_POSTS_PER_HOUR,
+        }
+        for name in self.subreddit_names:
+            limits[f"reply:{name}"] = config.subreddit_setting(name, 'max_replies_per_hour')
+            limits[f"comment:{name}"] = config.subreddit_setting(name, 'max_replies_per_hour')
+            limits[f"post:{name}"] = config.subreddit_setting(name, 'max_posts_per_hour')
+        self.governor = RateGovernor(
+            limits=limits,
+            cooldown_seconds=config.REPLY_COOLDOWN_SECONDS,
+            budget=lambda: self.reddit.auth.limits
+        )
+
+        # Optional ledger shared with other replicas of the bot
+        self.ledger = None
+        self._unowned = deque()  # (deadline, key, enqueue) for other replicas' items
+        self._sending = set()  # Claims whose send is queued in the governor
+        self._pending = {}  # Claim key -> stream, until sent or settled; checkpointed with the cursors
+        if config.LEDGER_PATH:
+            self.ledger = WorkLedger(config.LEDGER_PATH, config.REPLICA_ID, config.LEDGER_LEASE_SECONDS)
+
         # Scheduler for automated posts
         self.scheduler = BackgroundScheduler(timezone=pytz.timezone('US/Eastern'))
 
     def start(self):
         """Start the bot"""
-        print(f"Starting bot on r/{config.TARGET_SUBREDDIT}...")
+        log_event(logger, 'bot_starting', subreddits=self.multireddit, dry_run=config.DRY_RUN)
 
-        if config.DRY_RUN:
-            print("DRY RUN MODE - No posts will be made")
+        if self.ledger:
+            log_event(logger, 'ledger_joined', path=config.LEDGER_PATH, replica=config.REPLICA_ID)
 
         # Schedule automated posts and comments
         self._schedule_posts()
@@ -54,207 +156,252 @@ class CFBBeltBot:
         # Start the scheduler
         self.scheduler.start()
 
-        print("Bot is running! Press Ctrl+C to stop.")
-        print("Monitoring for mentions, commands, and game threads...")
+        if self.api:
+            self.api.start()
+
+        log_event(logger, 'bot_running')
+        self._resume_pending()
 
         try:
             # Main loop - monitor for mentions and commands
             while True:
+                settings = self._update_cadence()
+                self._heartbeat()
                 self._check_mentions()
                 self._check_commands()
-                self._check_game_threads()
-                self._check_postgame_threads()
-                time.sleep(30)  # Check every 30 seconds
+                self._check_submissions()
+                self._check_chase()
+                self._check_season_chases()
+                self._check_prerendered_posts()
+                self._check_snapshot()
+                self._save_checkpoints()
+                self.sampler.debug(logger, 'loop', queued=len(self.work), data_version=self.fetcher.data_version,
+                                   poll_seconds=settings['poll_seconds'])
+
+                # Poll again after the cadence interval, running work as soon as it's queued
+                # (e.g. by a scheduled job) and sending it as soon as limits allow
+                deadline = time.time() + settings['poll_seconds']
+                while True:
+                    self.work.run()
+                    self.governor.run_ready()
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    wait = self.governor.seconds_until_ready()
+                    self.work.wait(remaining if wait is None else min(remaining, max(1, wait)))
 
         except KeyboardInterrupt:
-            print("\nStopping bot...")
+            log_event(logger, 'bot_stopping')
             self.scheduler.shutdown()
-            print("Bot stopped.")
+            if self.chase_worker:
+                self.chase_worker.shutdown()
+            if self.api:
+                self.api.stop()
+            if self.ledger:
+                self.ledger.leave()
+            log_event(logger, 'bot_stopped')
 
     def _check_mentions(self):
-        """Check for username mentions"""
+        """Check for username mentions since the last poll"""
+        try:
+            started = time.perf_counter()
+            mentions = self.mention_cursor.poll()
+            self.sampler.debug(logger, 'poll', key='poll:mentions', stream='mentions', items=len(mentions),
+                               latency_ms=round((time.perf_counter() - started) * 1000))
+        except Exception:
+            log_event(logger, 'poll_failed', logging.ERROR, exc_info=True, stream='mentions')
+            return
+        self._route_mentions(mentions)
+
+    def _route_mentions(self, mentions):
+        """Queue a reply to each mention"""
         try:
-            for mention in self.reddit.inbox.mentions(limit=10):
+            for mention in mentions:
                 if mention.id in self.recent_replies:
                     continue
 
-                # Check if already replied
-                mention.refresh()
-                for reply in mention.replies:
-                    if reply.author == self.reddit.user.me():
-                        self.recent_replies[mention.id] = time.time()
-                        break
-                else:
-                    # No reply yet, process it
-                    self._handle_mention(mention)
+                self.recent_replies[mention.id] = time.time()
+                self._claim('mentions', f"reply:{mention.fullname}", PRIORITY_INTERACTIVE,
+                            partial(self._handle_mention, mention), f"mention {mention.id}")
 
-        except Exception as e:
-            print(f"Error checking mentions: {e}")
+        except Exception:
+            log_event(logger, 'route_failed', logging.ERROR, exc_info=True, stream='mentions')
 
     def _check_commands(self):
-        """Check for command triggers in new comments"""
+        """Check for command triggers in comments since the last poll"""
         try:
-            for comment in self.subreddit.comments(limit=25):
+            started = time.perf_counter()
+            comments = self.comment_cursor.poll()
+            self.sampler.debug(logger, 'poll', key='poll:comments', stream='comments', items=len(comments),
+                               latency_ms=round((time.perf_counter() - started) * 1000))
+        except Exception:
+            log_event(logger, 'poll_failed', logging.ERROR, exc_info=True, stream='comments')
+            return
+        self._route_commands(comments)
+
+    def _route_commands(self, comments):
+        """Queue a reply to each comment with a command trigger"""
+        try:
+            me = self.reddit.user.me()
+            for comment in comments:
                 # Skip our own comments!
-                if comment.author == self.reddit.user.me():
+                if comment.author == me:
                     continue
 
                 # Check if comment contains command trigger
                 if not any(trigger in comment.body.lower() for trigger in config.COMMAND_TRIGGERS):
                     continue
 
-                # Check if we've already replied
-                if comment.id in self.recent_replies:
+                # Check commands are enabled in this subreddit
+                if not config.subreddit_setting(self._subreddit_of(comment), 'commands'):
                     continue
 
-                # Check cooldown
-                comment_time = datetime.fromtimestamp(comment.created_utc)
-                if (datetime.now() - comment_time).total_seconds() > 600:  # Skip comments older than 10 min
+                # Check if we've already replied
+                if comment.id in self.recent_replies:
                     continue
 
-                # Check if we already replied
-                comment.refresh()
-                for reply in comment.replies:
-                    if reply.author == self.reddit.user.me():
-                        self.recent_replies[comment.id] = time.time()
-                        break
-                else:
-                    # No reply yet, process it
-                    self._handle_command_comment(comment)
+                self.recent_replies[comment.id] = time.time()
+                self._claim('comments', f"reply:{comment.fullname}", PRIORITY_INTERACTIVE,
+                            partial(self._handle_command_comment, comment), f"command {comment.id}")
 
-        except Exception as e:
-            print(f"Error checking commands: {e}")
+        except Exception:
+            log_event(logger, 'route_failed', logging.ERROR, exc_info=True, stream='comments')
 
     def _handle_mention(self, mention):
         """Handle a username mention"""
-        print(f"Handling mention from u/{mention.author}: {mention.body[:50]}...")
-
-        response = self.command_handler.handle_command(mention.body)
-
-        if config.DRY_RUN:
-            print(f"DRY RUN - Would reply:\n{response}")
-        else:
-            try:
-                mention.reply(response)
-                print(f"Replied to mention {mention.id}")
-            except Exception as e:
-                print(f"Error replying to mention: {e}")
-
-        self.recent_replies[mention.id] = time.time()
+        self._answer(mention, 'mention')
 
     def _handle_command_comment(self, comment):
         """Handle a comment with command trigger"""
-        print(f"Handling command from u/{comment.author}: {comment.body[:50]}...")
-
-        response = self.command_handler.handle_command(comment.body)
+        self._answer(comment, 'command')
+
+    def _answer(self, item, kind: str):
+        """Reply to the commands in a mention or comment"""
+        started = time.perf_counter()
+        response = self.command_handler.handle_command(item.body)
+        log_event(
+            logger, 'command_handled',
+            item_id=item.id, kind=kind, author=str(item.author), subreddit=self._subreddit_of(item),
+            commands=[subcommand for subcommand, _ in self.command_handler.parse_commands(item.body)],
+            latency_ms=round((time.perf_counter() - started) * 1000),
+            data_version=self.fetcher.data_version, dry_run=config.DRY_RUN, reply_chars=len(response)
+        )
 
         if config.DRY_RUN:
-            print(f"DRY RUN - Would reply:\n{response}")
+            log_event(logger, 'dry_run_reply', logging.DEBUG, item_id=item.id, body=response)
         else:
-            try:
-                comment.reply(response)
-                print(f"Replied to command {comment.id}")
-            except Exception as e:
-                print(f"Error replying to command: {e}")
+            self._queue_reply('reply', item, response, f"reply to {kind} {item.id}", PRIORITY_INTERACTIVE)
 
-        self.recent_replies[comment.id] = time.time()
+        self.recent_replies[item.id] = time.time()
+
+    def _queue_job(self, job, leader_only: bool = True):
+        """Wrap a scheduled job so APScheduler only queues it for the main loop"""
+        def enqueue():
+            if leader_only and not self._is_leader():
+                return
+            self.work.put(PRIORITY_SCHEDULED, job, job.__name__)
+        return enqueue
 
     def _schedule_posts(self):
         """Schedule automated posts"""
         # "On This Day" posts - Saturday at 10 AM ET
         self.scheduler.add_job(
-            self._post_on_this_day,
+            self._queue_job(self._post_on_this_day),
             CronTrigger(day_of_week='sat', hour=10, minute=0),
             id='on_this_day'
         )
 
         # Belt Chase Updates - Sunday at 10 AM ET
         self.scheduler.add_job(
-            self._post_belt_chase,
+            self._queue_job(self._post_belt_chase),
             CronTrigger(day_of_week='sun', hour=10, minute=0),
             id='belt_chase'
         )
 
         # Check for longest reign milestones - daily at 9 AM ET
         self.scheduler.add_job(
-            self._check_longest_reign,
+            self._queue_job(self._check_longest_reign),
             CronTrigger(hour=9, minute=0),
             id='longest_reign_check'
         )
 
-        print("Scheduled jobs:")
-        for job in self.scheduler.get_jobs():
-            print(f"  - {job.id}")
+        # Report queue latency per priority every hour
+        self.scheduler.add_job(
+            self._queue_job(self._report_latency, leader_only=False),
+            CronTrigger(minute=0),
+            id='latency_report'
+        )
 
-    def _check_game_threads(self):
-        """Check for new game threads involving the belt holder"""
+        log_event(logger, 'jobs_scheduled', jobs=[job.id for job in self.scheduler.get_jobs()])
+
+    def _check_submissions(self):
+        """Route every new submission to the game/postgame thread handlers"""
         try:
-            champion_id, _, _ = self.fetcher.get_current_champion()
-            if not champion_id:
-                return
+            started = time.perf_counter()
+            submissions = self.submission_cursor.poll()
+            self.sampler.debug(logger, 'poll', key='poll:submissions', stream='submissions', items=len(submissions),
+                               latency_ms=round((time.perf_counter() - started) * 1000))
+        except Exception:
+            log_event(logger, 'poll_failed', logging.ERROR, exc_info=True, stream='submissions')
+            return
+        self._route_submissions(submissions)
 
-            champion_name = self.fetcher.get_school_name(champion_id)
+    def _route_submissions(self, submissions):
+        """Queue a comment on each game or postgame thread with the belt at stake"""
+        champion_id = None
+        champion_name = None
+        matcher = None
 
-            # Look for new submissions by CFB_Referee
-            for submission in self.subreddit.new(limit=10):
-                # Skip if not by CFB_Referee
-                if submission.author.name != 'CFB_Referee':
+        for submission in submissions:
+            try:
+                # Game and postgame threads are posted by CFB_Referee
+                if not submission.author or submission.author.name != 'CFB_Referee':
                     continue
 
-                # Check if it's a game thread
-                if not submission.title.startswith('[Game Thread]'):
+                if submission.title.startswith('[Game Thread]'):
+                    handler = self._comment_on_game_thread
+                elif submission.title.startswith('[Postgame Thread]'):
+                    handler = self._comment_on_postgame_thread
+                else:
                     continue
 
                 # Skip if we already commented
                 if submission.id in self.commented_threads:
                     continue
 
-                # Check if champion is in the game
-                if champion_name.lower() not in submission.title.lower():
+                # Check game thread comments are enabled in this subreddit
+                if not config.subreddit_setting(self._subreddit_of(submission), 'game_threads'):
                     continue
 
-                # This is a belt game thread!
-                self._comment_on_game_thread(submission, champion_name)
-
-        except Exception as e:
-            print(f"Error checking game threads: {e}")
-
-    def _check_postgame_threads(self):
-        """Check for new post-game threads involving the belt holder"""
-        try:
-            champion_id, _, _ = self.fetcher.get_current_champion()
-            if not champion_id:
-                return
-
-            champion_name = self.fetcher.get_school_name(champion_id)
-
-            # Look for new submissions by CFB_Referee
-            for submission in self.subreddit.new(limit=10):
-                # Skip if not by CFB_Referee
-                if submission.author.name != 'CFB_Referee':
-                    continue
+                # Look the champion up once per cycle, and only when needed
+                if champion_id is None:
+                    champion_id, _, _ = self.fetcher.get_current_champion()
+                    if not champion_id:
+                        return
+                    champion_name = self.fetcher.get_school_name(champion_id)
+                    matcher = self.fetcher.get_title_matcher()
 
-                # Check if it's a postgame thread
-                if not submission.title.startswith('[Postgame Thread]'):
+                # Check if champion is in the game, under any of its names
+                if champion_id not in matcher.find_thread_teams(submission.title):
                     continue
 
-                # Skip if we already commented
-                if submission.id in self.commented_threads:
-                    continue
+                self.commented_threads[submission.id] = time.time()
 
-                # Check if champion is in the game
-                if champion_name.lower() not in submission.title.lower():
-                    continue
+                # Every replica applies the result so they all agree on the holder
+                if self.ledger and handler == self._comment_on_postgame_thread:
+                    self.work.put(PRIORITY_THREAD, partial(self._apply_postgame_result, submission),
+                                  f"postgame result {submission.id}")
 
-                # This is a belt postgame thread!
-                self._comment_on_postgame_thread(submission, champion_id, champion_name)
+                self._claim('submissions', f"comment:{submission.fullname}", PRIORITY_THREAD,
+                            partial(handler, submission, champion_id, champion_name), f"thread {submission.id}")
 
-        except Exception as e:
-            print(f"Error checking postgame threads: {e}")
+            except Exception:
+                log_event(logger, 'submission_failed', logging.ERROR, exc_info=True, item_id=submission.id)
 
-    def _comment_on_game_thread(self, submission, champion_name):
+    def _comment_on_game_thread(self, submission, champion_id, champion_name):
         """Post a comment on a game thread where belt is on the line"""
-        print(f"Found belt game thread: {submission.title}")
+        log_event(logger, 'belt_thread_found', item_id=submission.id, kind='game', title=submission.title,
+                  champion_id=champion_id)
 
         comment_body = f"🏆 **The Belt is on the line in this game!** 🏆\n\n"
         comment_body += f"**Current holder:** {champion_name}\n\n"
@@ -262,34 +409,25 @@ class CFBBeltBot:
         comment_body += config.BOT_SIGNATURE
 
         if config.DRY_RUN:
-            print(f"DRY RUN - Would comment on game thread:\n{comment_body}")
+            log_event(logger, 'dry_run_comment', logging.DEBUG, item_id=submission.id, body=comment_body)
         else:
-            try:
-                submission.reply(comment_body)
-                print(f"Commented on game thread: {submission.id}")
-            except Exception as e:
-                print(f"Error commenting on game thread: {e}")
+            self._queue_reply('comment', submission, comment_body, f"comment on game thread {submission.id}", PRIORITY_THREAD)
 
         self.commented_threads[submission.id] = time.time()
 
     def _comment_on_postgame_thread(self, submission, champion_id, champion_name):
         """Post a comment on a postgame thread for a belt game"""
-        print(f"Found belt postgame thread: {submission.title}")
+        log_event(logger, 'belt_thread_found', item_id=submission.id, kind='postgame', title=submission.title,
+                  champion_id=champion_id)
 
-        # Parse the title to determine winner
-        # Format: [Postgame Thread] Winner Defeats Loser Score-Score
-        title = submission.title
-        match = re.search(r'\[Postgame Thread\]\s+(.+?)\s+Defeats\s+(.+?)\s+\d', title)
-
-        if not match:
-            print(f"Could not parse postgame thread title: {title}")
+        result = self._apply_postgame_result(submission)
+        if not result:
             return
 
-        winner_name = match.group(1).strip()
-        loser_name = match.group(2).strip()
+        winner_name = self.fetcher.get_school_name(result['winner_id'])
 
         # Determine if belt changed hands or was defended
-        belt_changed = champion_name.lower() in loser_name.lower()
+        belt_changed = result['loser_id'] == champion_id
 
         if belt_changed:
             comment_body = f"🚨 **BELT CHANGED HANDS!** 🚨\n\n"
@@ -303,110 +441,460 @@ class CFBBeltBot:
         comment_body += config.BOT_SIGNATURE
 
         if config.DRY_RUN:
-            print(f"DRY RUN - Would comment on postgame thread:\n{comment_body}")
+            log_event(logger, 'dry_run_comment', logging.DEBUG, item_id=submission.id, body=comment_body)
         else:
-            try:
-                submission.reply(comment_body)
-                print(f"Commented on postgame thread: {submission.id}")
-            except Exception as e:
-                print(f"Error commenting on postgame thread: {e}")
+            self._queue_reply('comment', submission, comment_body, f"comment on postgame thread {submission.id}", PRIORITY_THREAD)
 
         self.commented_threads[submission.id] = time.time()
 
+    def _apply_postgame_result(self, submission):
+        """Parse a postgame thread title and apply its result provisionally"""
+        # Parse the title to determine winner
+        # Format: [Postgame Thread] Winner Defeats Loser Score-Score
+        title = submission.title
+        result = self.fetcher.get_title_matcher().parse_postgame(title)
+
+        if not result:
+            log_event(logger, 'postgame_unparsed', logging.WARNING, item_id=submission.id, title=title)
+            return None
+
+        # Update the belt now instead of waiting for the games sheet
+        applied = self.fetcher.record_provisional_result(
+            result['winner_id'],
+            result['loser_id'],
+            datetime.fromtimestamp(submission.created_utc),
+            result['winner_score'],
+            result['loser_score']
+        )
+        log_event(logger, 'postgame_result', item_id=submission.id, winner_id=result['winner_id'],
+                  loser_id=result['loser_id'], applied=applied, data_version=self.fetcher.data_version)
+        return result
+
     def _post_on_this_day(self):
         """Post historical belt moments (Saturdays)"""
-        print("Generating 'On This Day' post...")
-
-        post_data = self.scheduled_posts.generate_on_this_day()
+        post_data = self.prerendered.get('on_this_day')
 
         if not post_data:
-            print("No belt games on this day in history")
+            log_event(logger, 'post_skipped', post_type='on_this_day', reason='no belt games on this day')
             return
 
         self._make_post(post_data['title'], post_data['body'], 'on_this_day')
 
     def _post_belt_chase(self):
         """Post weekly belt chase update (Sundays)"""
-        print("Generating Belt Chase Update...")
-
-        post_data = self.scheduled_posts.generate_belt_chase_update()
+        post_data = self.prerendered.get('belt_chase')
 
         if not post_data:
-            print("No belt chase data available")
+            log_event(logger, 'post_skipped', post_type='belt_chase', reason='no belt chase data')
             return
 
         self._make_post(post_data['title'], post_data['body'], 'belt_chase')
 
     def _check_longest_reign(self):
         """Check if current reign has entered top 10"""
-        print("Checking for longest reign milestones...")
-
         try:
-            champion_id, reign_start, _ = self.fetcher.get_current_champion()
-            if not champion_id or not reign_start:
-                return
-
-            # Get longest reigns
-            longest_reigns = self.fetcher.get_longest_reigns(10)
-
-            # Find current reign in the list
-            current_rank = None
-            for i, reign in enumerate(longest_reigns, 1):
-                if reign.get('current', False):
-                    current_rank = i
-                    break
-
-            if not current_rank or current_rank > 10:
-                # Not in top 10
+            # Only rendered when the current reign is in the top 10
+            post_data = self.prerendered.get('longest_reign')
+            if not post_data:
                 return
 
             # Check if we already posted about this rank
+            current_rank = post_data['rank']
             milestone_key = f"longest_reign_rank_{current_rank}"
             if milestone_key in self.last_post_time:
                 # Already posted about this rank
                 return
 
-            print(f"Current reign is #{current_rank} all-time!")
+            log_event(logger, 'reign_milestone', rank=current_rank)
+
+            self._make_post(post_data['title'], post_data['body'], milestone_key)
+
+        except Exception:
+            log_event(logger, 'milestone_check_failed', logging.ERROR, exc_info=True)
+
+    def _check_prerendered_posts(self):
+        """Queue a re-render of any upcoming scheduled post whose data changed"""
+        try:
+            self.fetcher.get_reign_leaderboard()  # Reload the data if it's due
+        except Exception:
+            log_event(logger, 'data_refresh_failed', logging.ERROR, exc_info=True)
+            return
+
+        # Only the replica running scheduled jobs needs them rendered
+        if not self._is_leader():
+            return
+
+        for post_type, job_id in PRERENDERED_JOBS.items():
+            job = self.scheduler.get_job(job_id)
+            if not job or not job.next_run_time or post_type in self._prerender_pending:
+                continue
+            if post_type == 'belt_chase' and not self._chase_ready():
+                continue  # Rendered once the worker's search is back
+
+            # Scheduler times are Eastern; the data layer works in local time
+            publish_at = job.next_run_time.astimezone().replace(tzinfo=None)
+            if self.prerendered.is_stale(post_type, publish_at):
+                self._prerender_pending.add(post_type)
+                self.work.put(
+                    PRIORITY_SCHEDULED,
+                    partial(self._prerender_post, post_type, publish_at),
+                    f"prerender {post_type}"
+                )
+
+    def _prerender_post(self, post_type: str, publish_at: datetime):
+        """Render a scheduled post ahead of its cron time"""
+        try:
+            self.prerendered.render(post_type, publish_at)
+        finally:
+            self._prerender_pending.discard(post_type)
+
+    def _check_chase(self):
+        """Collect a finished belt chase search, or start one in the worker when the data changed"""
+        if not self.chase_worker:
+            return
+
+        if self._chase is not None:
+            key, future, submitted = self._chase
+            if not future.done():
+                return
+            self._chase = None
+            try:
+                paths = future.result()
+                self.fetcher.store_chase(key, paths)
+                log_event(logger, 'chase_computed', teams=len(paths), data_version=key[0],
+                          latency_ms=round((time.time() - submitted) * 1000))
+            except Exception:
+                log_event(logger, 'chase_failed', logging.ERROR, exc_info=True, data_version=key[0])
+                self._chase_failed = key
+
+        try:
+            key = self.fetcher.chase_key()
+        except Exception:
+            log_event(logger, 'data_refresh_failed', logging.ERROR, exc_info=True)
+            return
+        if key is None or key == self._chase_failed or self.fetcher.has_chase(key):
+            return
+
+        future = self.chase_worker.submit(belt_chase, self.fetcher.schedule_index, key[1], utc_now())
+        self._chase = (key, future, time.time())
+
+    def _check_season_chases(self):
+        """Collect replayed seasons, or replay the ones whose games changed, one task per season"""
+        if not self.chase_worker:
+            return  # Replayed inline when the snapshot is written
 
-            post_data = self.scheduled_posts.generate_longest_reign_alert(current_rank)
+        if self._season_chases is not None:
+            jobs, futures, submitted = self._season_chases
+            if not all(future.done() for future in futures):
+                return
+            self._season_chases = None
+            try:
+                self.fetcher.store_season_chases(jobs, [future.result() for future in futures])
+                log_event(logger, 'season_chases_computed', seasons=len(jobs), workers=config.CHASE_WORKERS,
+                          latency_ms=round((time.time() - submitted) * 1000))
+            except Exception:
+                # The snapshot writer replays whatever is still missing
+                log_event(logger, 'season_chases_failed', logging.ERROR, exc_info=True, seasons=len(jobs))
 
-            if post_data:
-                self._make_post(post_data['title'], post_data['body'], milestone_key)
+        try:
+            jobs = self.fetcher.season_chase_jobs()
+        except Exception:
+            log_event(logger, 'data_refresh_failed', logging.ERROR, exc_info=True)
+            return
+        if jobs:
+            futures = [self.chase_worker.run(replay_season, job) for job in jobs]
+            self._season_chases = (jobs, futures, time.time())
+
+    def _chase_ready(self) -> bool:
+        """Whether the belt chase for the current data is there without searching on the main loop"""
+        if not self.chase_worker:
+            return True
+        try:
+            key = self.fetcher.chase_key()
+        except Exception:
+            return True  # Let the caller hit and report the error
+        return key is None or key == self._chase_failed or self.fetcher.has_chase(key)
+
+    def _check_snapshot(self):
+        """Queue a snapshot write for the CLI whenever the data changed"""
+        if self._snapshot_pending or self._snapshot_version == self.fetcher.data_version:
+            return
+        if not self._chase_ready() or self._season_chases is not None:
+            return  # Written once the worker's searches are back
+        self._snapshot_pending = True
+        self.work.put(PRIORITY_SCHEDULED, self._write_snapshot, "write snapshot")
 
-        except Exception as e:
-            print(f"Error checking longest reign: {e}")
+    def _write_snapshot(self):
+        """Save the belt state for the CLI and the API"""
+        try:
+            started = time.perf_counter()
+            version = self.fetcher.data_version
+            snapshot = build_snapshot(self.fetcher)
+            if self.fetcher.games_cache is None or not is_complete(snapshot):
+                # Keep the last good file until the games sheet loads again
+                self._snapshot_version = version
+                log_event(logger, 'snapshot_skipped', logging.WARNING, data_version=version,
+                          reason='games not loaded')
+                return
+            write_snapshot(snapshot, config.SNAPSHOT_PATH)
+            if self.api:
+                self.api.update(snapshot)
+            self._snapshot_version = version
+            log_event(logger, 'snapshot_written', data_version=version,
+                      latency_ms=round((time.perf_counter() - started) * 1000))
+        except Exception:
+            log_event(logger, 'snapshot_failed', logging.ERROR, exc_info=True)
+        finally:
+            self._snapshot_pending = False
+
+    def _report_latency(self):
+        """Log queue and send latency per priority"""
+        log_event(logger, 'latency', queue=self.work.latency.summary(), send=self.governor.latency.summary())
 
     def _make_post(self, title: str, body: str, post_type: str):
-        """Make a post to the subreddit"""
-        # Check rate limiting
-        now = time.time()
-        if post_type in self.last_post_time:
-            time_since_last = now - self.last_post_time[post_type]
-            if time_since_last < 3600:  # Don't post same type more than once per hour
-                print(f"Rate limited: Last {post_type} was {time_since_last/60:.1f} minutes ago")
+        """Queue a post to every subreddit that takes scheduled posts"""
+        for name in config.TARGET_SUBREDDITS:
+            if not config.subreddit_setting(name, 'scheduled_posts'):
+                continue
+
+            if config.DRY_RUN:
+                log_event(logger, 'dry_run_post', subreddit=name, post_type=post_type, title=title)
+                log_event(logger, 'dry_run_post_body', logging.DEBUG, subreddit=name, post_type=post_type, body=body)
+                continue
+
+            def send(name=name):
+                # Guard against two replicas both believing they lead
+                key = f"post:{name.lower()}:{post_type}:{time.strftime('%Y-%m-%d')}"
+                if not (self._claim_now(key) and self._start_send(key)):
+                    log_event(logger, 'post_skipped', subreddit=name, post_type=post_type,
+                              reason='another replica posted it')
+                    return
+                try:
+                    submission = self.reddit.subreddit(name).submit(title, selftext=body)
+                except Exception:
+                    self._abort_send(key)
+                    raise
+                log_event(logger, 'posted', item_id=submission.id, subreddit=name, post_type=post_type,
+                          title=title, url=submission.url)
+                self.last_post_time[post_type] = time.time()
+
+            # Don't post the same type more than once per hour
+            self.governor.submit(self._rate_key('post', name), f"{name.lower()}:{post_type}", send,
+                                 description=f"{post_type} post to r/{name}",
+                                 cooldown=3600, priority=PRIORITY_SCHEDULED)
+
+    def _queue_reply(self, action: str, target, body: str, description: str, priority: int):
+        """Queue a reply to a comment or submission through the rate governor"""
+        key = f"{action}:{target.fullname}"
+
+        def send():
+            # The claim closes here rather than when the item was queued, so
+            # another replica can still take it over until this moment
+            if not self._start_send(key):
+                self._finish(key)
+                log_event(logger, 'reply_skipped', item_id=target.id, action=action,
+                          reason='another replica took it over')
                 return
+            # Off the checkpoint before it goes out, so a restart never sends it twice
+            stream = self._pending.get(key)
+            self._finish(key)
+            self._save_checkpoints()
+            try:
+                target.reply(body)
+            except Exception:
+                self._abort_send(key)
+                if stream:
+                    self._pending[key] = stream  # Back on the checkpoint for the retry
+                    self._sending.add(key)
+                    self._save_checkpoints()
+                raise
+            log_event(logger, 'reply_sent', item_id=target.id, action=action, description=description)
+
+        def dropped():
+            self._finish(key)
+            self._settle(key)
+
+        # Cooldowns are per thread; comments carry their submission's fullname
+        name = self._subreddit_of(target)
+        thread_key = vars(target).get('link_id') or target.fullname
+        cooldown = config.subreddit_setting(name, 'reply_cooldown_seconds')
+        self._sending.add(key)
+        self.governor.submit(self._rate_key(action, name), thread_key, send,
+                             description=description, cooldown=cooldown, priority=priority, on_drop=dropped)
+
+    def _update_cadence(self):
+        """Poll and reload faster while the belt is at stake"""
+        try:
+            return self.cadence.update()
+        except Exception:
+            log_event(logger, 'cadence_failed', logging.ERROR, exc_info=True)
+            return config.CADENCE['game_day']
+
+    def _save_checkpoints(self):
+        """
+        Persist every listing cursor that moved this cycle, with the items
+        already past the cursor whose reply hasn't been sent yet
+        """
+        for stream, cursor in self.cursors.items():
+            try:
+                checkpoint = cursor.checkpoint()
+                if checkpoint is not None:
+                    checkpoint['pending'] = sorted(
+                        key.split(':', 1)[1] for key, pending in self._pending.items() if pending == stream
+                    )
+                self.checkpoints.save(stream, checkpoint)
+            except Exception:
+                log_event(logger, 'checkpoint_failed', logging.ERROR, exc_info=True, stream=stream)
+
+    def _resume_pending(self):
+        """Route again the items the last run had queued but not sent when it stopped"""
+        routes = {
+            'submissions': self._route_submissions,
+            'comments': self._route_commands,
+            'mentions': self._route_mentions,
+        }
+        oldest = time.time() - config.CATCHUP_MAX_SECONDS
+        for stream, fullnames in self._resume.items():
+            if not fullnames:
+                continue
+            try:
+                items = [item for item in self.reddit.info(fullnames=fullnames) if item.created_utc >= oldest]
+            except Exception:
+                log_event(logger, 'resume_failed', logging.ERROR, exc_info=True, stream=stream)
+                continue
+            log_event(logger, 'pending_resumed', stream=stream, items=len(items), skipped=len(fullnames) - len(items))
+            routes[stream](items)
+        self._resume = {}
+
+    def _heartbeat(self):
+        """Check in with the other replicas and take over work they dropped"""
+        if not self.ledger:
+            return
+        try:
+            self.ledger.heartbeat()
+            self._is_leader()
+        except Exception:
+            log_event(logger, 'ledger_failed', logging.ERROR, exc_info=True)
+            return
 
-        if config.DRY_RUN:
-            print(f"DRY RUN - Would post:")
-            print(f"Title: {title}")
-            print(f"Body:\n{body}")
+        # Items in another replica's partition: take over whatever it hasn't
+        # sent once its lease lapses, and keep watching what it still holds
+        now = time.time()
+        while self._unowned and self._unowned[0][0] <= now:
+            _, key, enqueue = self._unowned.popleft()
+            if self._claim_now(key):
+                log_event(logger, 'work_taken_over', key=key)
+                enqueue()
+            elif not self._is_done(key):
+                self._unowned.append((now + self.ledger.lease_seconds, key, enqueue))
+            else:
+                self._finish(key)
+
+    def _is_leader(self) -> bool:
+        """Whether this replica runs scheduled jobs (always, without a ledger)"""
+        if not self.ledger:
+            return True
+        try:
+            return self.ledger.is_leader()
+        except Exception:
+            log_event(logger, 'leadership_check_failed', logging.ERROR, exc_info=True)
+            return False
+
+    def _claim_now(self, key: str) -> bool:
+        """Claim `key` in the ledger, if there is one"""
+        if not self.ledger:
+            return True
+        try:
+            return self.ledger.claim(key)
+        except Exception:
+            log_event(logger, 'claim_failed', logging.ERROR, exc_info=True, key=key)
+            return False
+
+    def _start_send(self, key: str) -> bool:
+        """Close this replica's claim on `key` just before sending it"""
+        if not self.ledger:
+            return True
+        try:
+            return self.ledger.start_send(key)
+        except Exception:
+            log_event(logger, 'claim_failed', logging.ERROR, exc_info=True, key=key)
+            return False
+
+    def _abort_send(self, key: str):
+        """Reopen the claim on `key` after a failed send"""
+        if not self.ledger:
+            return
+        try:
+            self.ledger.abort_send(key)
+        except Exception:
+            log_event(logger, 'claim_failed', logging.ERROR, exc_info=True, key=key)
+
+    def _settle(self, key: str):
+        """Close the claim on `key` for work that finished without sending anything"""
+        self._finish(key)
+        if self.ledger:
+            self._start_send(key)
+
+    def _finish(self, key: str):
+        """`key` no longer needs sending by this replica"""
+        self._sending.discard(key)
+        self._pending.pop(key, None)
+
+    def _is_done(self, key: str) -> bool:
+        """Whether `key` was sent (or settled) by any replica"""
+        try:
+            return self.ledger.is_done(key)
+        except Exception:
+            log_event(logger, 'claim_failed', logging.ERROR, exc_info=True, key=key)
+            return False
+
+    def _claim(self, stream: str, key: str, priority: int, work, description: str):
+        """
+        Queue `work` if this replica gets `key`. Items in another replica's
+        partition, or claimed by another live replica, are only taken if
+        still unsent once its lease would lapse. Until then the item is
+        pending in `stream`'s checkpoint.
+        """
+        def enqueue():
+            self.work.put(priority, partial(self._run_claimed, key, work), description)
+
+        self._pending[key] = stream
+        if self.ledger and not self.ledger.owns(key):
+            self._unowned.append((time.time() + self.ledger.lease_seconds, key, enqueue))
+        elif self._claim_now(key):
+            enqueue()
+        elif not self._is_done(key):
+            self._unowned.append((time.time() + self.ledger.lease_seconds, key, enqueue))
         else:
-            try:
-                submission = self.subreddit.submit(title, selftext=body)
-                print(f"Posted: {title}")
-                print(f"URL: {submission.url}")
-                self.last_post_time[post_type] = now
-            except Exception as e:
-                print(f"Error making post: {e}")
+            self._finish(key)
+
+    def _run_claimed(self, key: str, work):
+        """Run claimed work; unless it queued a send, the claim is done with"""
+        try:
+            work()
+        finally:
+            if key not in self._sending:
+                self._settle(key)
+
+    def _subreddit_of(self, item) -> str:
+        """Subreddit an item was posted in, without fetching it"""
+        subreddit = vars(item).get('subreddit')
+        return str(subreddit) if subreddit else config.TARGET_SUBREDDITS[0]
+
+    def _rate_key(self, action: str, subreddit: str) -> str:
+        """Governor bucket for an action in a subreddit"""
+        name = subreddit.lower()
+        return f"{action}:{name}" if name in self.subreddit_names else f"{action}:*"
 
 
 def main():
     """Main entry point"""
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+
     # Check if credentials are set
     if not config.REDDIT_CLIENT_ID or not config.REDDIT_CLIENT_SECRET:
-        print("Error: Reddit API credentials not set!")
-        print("Please create a .env file with your credentials.")
-        print("See .env.example for template.")
+        log_event(logger, 'credentials_missing', logging.ERROR,
+                  hint='create a .env file with your Reddit credentials (see .env.example)')
         return
 
     bot = CFBBeltBot()
@@ -0,0 +1,55 @@
+"""Adaptive polling and refresh cadence around belt games"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import config
+from log import log_event
+from schedule_index import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class Cadence:
+    """
+    Picks how often the bot polls Reddit and reloads the sheets from
+    where the belt holder's next game sits in the schedule index:
+    'game' while it's being played, 'game_day' in the hours around it,
+    'idle' otherwise.
+    """
+
+    def __init__(self, fetcher, modes: Optional[Dict[str, Dict]] = None):
+        self.fetcher = fetcher
+        self.modes = modes or config.CADENCE
+        self.mode = None
+
+    def current_mode(self, now: Optional[datetime] = None) -> str:
+        """Mode for `now`, naive UTC like the schedule (default: the current time)"""
+        now = now or utc_now()
+        champion_id, _, _ = self.fetcher.get_current_champion()
+        if not champion_id:
+            return 'idle'
+
+        # A game that kicked off within the window still counts as upcoming
+        window_after = timedelta(hours=config.GAME_WINDOW_AFTER_HOURS)
+        game = self.fetcher.get_schedule_index().next_game(champion_id, now - window_after)
+        if game is None:
+            return 'idle'
+
+        kickoff = game['start_date'].to_pydatetime()
+        if kickoff - timedelta(minutes=config.GAME_WINDOW_BEFORE_MINUTES) <= now:
+            return 'game'
+        if kickoff - timedelta(hours=config.GAME_DAY_HOURS) <= now:
+            return 'game_day'
+        return 'idle'
+
+    def update(self, now: Optional[datetime] = None) -> Dict:
+        """Switch to the mode for `now`, applying its data refresh interval"""
+        mode = self.current_mode(now)
+        settings = self.modes[mode]
+        self.fetcher.cache_duration = timedelta(minutes=settings['refresh_minutes'])
+        if mode != self.mode:
+            log_event(logger, 'cadence_changed', mode=mode, poll_seconds=settings['poll_seconds'],
+                      refresh_minutes=settings['refresh_minutes'])
+            self.mode = mode
+        return settings
@@ -0,0 +1,240 @@
+"""Belt chase search, and a process pool that runs it off the main loop"""
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from schedule_index import ScheduleIndex
+
+
+# games_away / earliest_week for a team no path reaches
+UNREACHABLE = 1 << 20
+
+
+class ChaseEngine:
+    """
+    The belt chase as a memoized search over (holder, week) states.
+
+    A state's answer is, for every team, the fewest holder losses
+    (games_away) and the earliest week by which some path from that state
+    hands them the belt: at the holder's next game the opponent either
+    takes the belt or the holder keeps it. Answers are NumPy arrays over
+    the scheduled teams, so combining the two branches is two
+    element-wise minimums.
+
+    Hypothetical results ("what if X beats Y") are an overlay of schedule
+    row -> winner that prunes one branch at that game. A state whose week
+    is at or after the earliest overlaid game can't reach it, so those
+    states are answered from the memo and only earlier ones are searched
+    again.
+
+    The memo is only good until the next kickoff after `now`, when that
+    game drops out of the remaining schedule; see `usable_for`.
+    """
+
+    def __init__(self, index: ScheduleIndex, now: datetime):
+        self.index = index
+        self.now = now
+        self.team_ids = np.array(sorted(index.teams), dtype=np.int64)
+        self.codes = {team_id: code for code, team_id in enumerate(self.team_ids.tolist())}
+        self.memo = {}
+
+        starts = index.arrays.get('start_start', np.array([], dtype='datetime64[us]'))
+        upcoming = starts[starts > np.datetime64(now, 'us')]
+        self.valid_until = upcoming.min().astype(datetime) if len(upcoming) else datetime.max
+        self._nothing = (np.full(len(self.team_ids), UNREACHABLE, np.int32),) * 2
+
+    def usable_for(self, index: ScheduleIndex, now: datetime) -> bool:
+        """Whether the memo still matches the remaining schedule at `now`"""
+        return index is self.index and self.now <= now < self.valid_until
+
+    def _state(self, holder: int, week: int, overlay: Dict[int, int], after_week: int,
+               memo: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        if week >= after_week:
+            memo, overlay = self.memo, {}  # Past every overlaid game: the plain answer holds
+        key = (holder, week)
+        answer = memo.get(key)
+        if answer is not None:
+            return answer
+
+        # Find the next game for the current belt holder
+        next_game = self.index.next_game_after_week(holder, week, self.now)
+        if not next_game:
+            answer = self._nothing
+        else:
+            game_week = next_game['week_number']
+            opponent = next_game['opponent_id']
+            winner = overlay.get(next_game['row'])
+
+            games_away, earliest_week = self._nothing
+            # Scenario 1: Opponent wins (gets the belt)
+            if winner is None or winner == opponent:
+                taken_away, taken_week = self._state(opponent, game_week, overlay, after_week, memo)
+                games_away = taken_away + 1
+                earliest_week = taken_week.copy()
+                code = self.codes[opponent]
+                games_away[code] = 1
+                earliest_week[code] = min(earliest_week[code], game_week)
+
+            # Scenario 2: Current holder wins (keeps the belt)
+            if winner is None or winner == holder:
+                kept_away, kept_week = self._state(holder, game_week, overlay, after_week, memo)
+                games_away = np.minimum(games_away, kept_away)
+                earliest_week = np.minimum(earliest_week, kept_week)
+            answer = (games_away, earliest_week)
+
+        memo[key] = answer
+        return answer
+
+    def chase(self, champion_id: int, overlay: Optional[Dict[int, int]] = None) -> List[Tuple[int, int, int]]:
+        """
+        Every team that can still win the belt this season, as
+        (team_id, games_away, earliest_week), closest first. `overlay`
+        maps schedule rows to hypothetical winners.
+        """
+        if champion_id not in self.codes:
+            return []
+        overlay = overlay or {}
+        after_week = UNREACHABLE
+        if overlay:
+            overlaid = np.isin(self.index.arrays['start_row'], list(overlay))
+            after_week = int(self.index.arrays['start_week'][overlaid].min(initial=UNREACHABLE))
+        games_away, earliest_week = self._state(champion_id, 0, overlay, after_week, {} if overlay else self.memo)
+
+        reachable = np.flatnonzero(games_away < UNREACHABLE)
+        order = reachable[np.lexsort((self.team_ids[reachable], earliest_week[reachable], games_away[reachable]))]
+        return list(zip(self.team_ids[order].tolist(), games_away[order].tolist(), earliest_week[order].tolist()))
+
+
+def belt_chase(index: ScheduleIndex, champion_id: int, now: datetime) -> List[Tuple[int, int, int]]:
+    """Every team that can still win the belt this season (see ChaseEngine.chase)"""
+    return ChaseEngine(index, now).chase(champion_id)
+
+
+class SharedIndex:
+    """A schedule index's flat arrays, copied once into a shared memory block"""
+
+    def __init__(self, index: ScheduleIndex):
+        layout = []
+        size = 0
+        for name, array in index.arrays.items():
+            size = -(-size // 64) * 64  # Align each array to a cache line
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += array.nbytes
+
+        self.block = SharedMemory(create=True, size=max(size, 1))
+        for name, dtype, shape, offset in layout:
+            np.ndarray(shape, dtype, buffer=self.block.buf, offset=offset)[...] = index.arrays[name]
+
+        # All a worker needs to map the arrays back: a name and some offsets
+        self.handle = (self.block.name, tuple(layout))
+        self.tasks = 0
+        self.retired = False
+
+    def close(self):
+        self.block.close()
+        self.block.unlink()
+
+
+# Worker side: the block currently mapped, and the index over it
+_attached = {}
+
+
+def _attach(handle) -> ScheduleIndex:
+    name, layout = handle
+    if name not in _attached:
+        if _attached:
+            # Drop the views into the previous block before unmapping it
+            (previous, _), = _attached.values()
+            _attached.clear()
+            previous.close()
+        block = SharedMemory(name=name)
+        arrays = {
+            array_name: np.ndarray(shape, dtype, buffer=block.buf, offset=offset)
+            for array_name, dtype, shape, offset in layout
+        }
+        _attached[name] = (block, ScheduleIndex.from_arrays(arrays))
+    return _attached[name][1]
+
+
+def _lower_priority():
+    """Worker initializer: yield the CPU to the main loop on small hosts"""
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+def _run(fn: Callable, handle, *args):
+    return fn(_attach(handle), *args)
+
+
+class ChaseWorker:
+    """
+    Runs schedule searches (like `belt_chase`) in worker processes so they
+    don't hold the GIL on the bot's main loop.
+
+    The schedule index goes over once per schedule load, as a shared
+    memory block the workers map without copying; each task only pickles
+    its handle and arguments, and results should be small tuples. Workers
+    are spawned rather than forked since the bot already runs threads,
+    and run at a lower priority so a single-core host still favours the
+    main loop.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.pool = None
+        self._shared = None
+        self._shared_index = None  # Index the current block was copied from
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, index: ScheduleIndex, *args) -> Future:
+        """Run fn(index, *args) in a worker; fn must be a module-level function"""
+        pool = self._pool()
+        with self._lock:
+            if index is not self._shared_index:
+                self._retire(self._shared)
+                self._shared = SharedIndex(index)
+                self._shared_index = index
+            shared = self._shared
+            shared.tasks += 1
+
+        future = pool.submit(_run, fn, shared.handle, *args)
+        future.add_done_callback(lambda _: self._finished(shared))
+        return future
+
+    def run(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) in a worker, for tasks that carry their own data"""
+        return self._pool().submit(fn, *args)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'),
+                                            initializer=_lower_priority)
+        return self.pool
+
+    def _finished(self, shared: SharedIndex):
+        with self._lock:
+            shared.tasks -= 1
+            if shared.retired and not shared.tasks:
+                shared.close()
+
+    def _retire(self, shared):
+        """Free a block once the tasks using it are done"""
+        if shared is None:
+            return
+        shared.retired = True
+        if not shared.tasks:
+            shared.close()
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        with self._lock:
+            self._retire(self._shared)
+            self._shared = self._shared_index = None
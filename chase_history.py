@@ -0,0 +1,156 @@
+"""Pre-season belt chases replayed for every past season"""
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from chase import ChaseEngine, _lower_priority
+from cubes import SEASON_START_MONTH, season_of
+from lineage import BELT_CHANGE, classified, date_array
+from schedule_index import ScheduleIndex
+
+# (season, champion going in or -1, day of season, winner, loser, belt change) per game
+SeasonJob = Tuple[int, int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def season_start(season: int) -> datetime:
+    return datetime(season, SEASON_START_MONTH, 1)
+
+
+def season_jobs(games: pd.DataFrame) -> List[SeasonJob]:
+    """
+    One job per season of the games sheet, small enough to pickle: the
+    season's games as a schedule (days since the season started, winner,
+    loser, whether the belt changed hands) and who held the belt going in.
+    """
+    if games.empty:
+        return []
+
+    games = classified(games).sort_values('date', kind='mergesort')
+    dates = date_array(games['date'])
+    seasons = season_of(dates)
+    winners = games['winner_id'].to_numpy(dtype=np.int64)
+    losers = games['loser_id'].to_numpy(dtype=np.int64)
+    changes = (games['belt_game'] == BELT_CHANGE).to_numpy()
+    holders = games['holder_before'].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    starts = (seasons - 1970).astype('datetime64[Y]').astype('datetime64[M]') + \
+        np.timedelta64(SEASON_START_MONTH - 1, 'M')
+    days = (dates.astype('datetime64[D]') - starts.astype('datetime64[D]')).astype(np.int64)
+
+    jobs = []
+    bounds = np.flatnonzero(np.diff(seasons)) + 1
+    for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(games)]))):
+        champion = -1 if np.isnan(holders[lo]) else int(holders[lo])
+        jobs.append((int(seasons[lo]), champion, days[lo:hi], winners[lo:hi], losers[lo:hi], changes[lo:hi]))
+    return jobs
+
+
+def job_digest(job: SeasonJob) -> str:
+    """Changes whenever anything the season's replay depends on does"""
+    season, champion, *arrays = job
+    digest = hashlib.blake2b(f"{season}:{champion}".encode(), digest_size=16)
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def replay_season(job: SeasonJob) -> Dict:
+    """
+    The season's pre-season chase tree, with its games as the schedule
+    and the holder going in as the champion, next to the path the belt
+    actually took. The season the lineage starts in is chased from its
+    first belt game. Each change records how many games away the winner was
+    before the season; the biggest is the season's longest-odds winner.
+    """
+    season, champion, days, winners, losers, changes = job
+    start = season_start(season)
+
+    def date_of(day: int) -> str:
+        return (start + timedelta(days=int(day))).date().isoformat()
+
+    root_day = -1
+    change_rows = np.flatnonzero(changes)
+    if champion < 0 and len(change_rows):
+        champion, root_day = int(winners[change_rows[0]]), int(days[change_rows[0]])
+
+    chase = []
+    if champion >= 0:
+        schedule = pd.DataFrame({
+            'start_date': np.datetime64(start, 'D') + days.astype('timedelta64[D]'),
+            'week': days + 1,  # The chase starts from week 0
+            'completed': False,
+            'home_id': winners,
+            'away_id': losers,
+        })
+        chase = ChaseEngine(ScheduleIndex(schedule), start + timedelta(days=root_day)).chase(champion)
+    games_away = {team_id: away for team_id, away, _ in chase}
+
+    path = [{
+        'date': date_of(days[i]),
+        'winner_id': int(winners[i]),
+        'loser_id': int(losers[i]),
+        # None if the tree never reached them
+        'games_away': games_away.get(int(winners[i])) if days[i] > root_day else None
+    } for i in change_rows]
+    ranked = [change for change in path if change['games_away'] is not None]
+
+    return {
+        'champion_id': champion if champion >= 0 else None,
+        'end_champion_id': path[-1]['winner_id'] if path else (champion if champion >= 0 else None),
+        'contenders': len(chase),
+        'chase': [[team_id, away, date_of(week - 1)] for team_id, away, week in chase],
+        'path': path,
+        'longest_odds': max(ranked, key=lambda change: change['games_away']) if ranked else None
+    }
+
+
+def replay_seasons(jobs: List[SeasonJob], workers: int = 1) -> List[Dict]:
+    """Replay many seasons, across `workers` processes when there's more than one"""
+    if workers <= 1 or len(jobs) < 2:
+        return [replay_season(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                             initializer=_lower_priority) as pool:
+        return list(pool.map(replay_season, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+class ChaseHistory:
+    """
+    Replayed seasons, kept by season with a digest of the games they were
+    replayed from. A new games load only needs the seasons whose games
+    changed, which is usually just the current one.
+    """
+
+    def __init__(self):
+        self.seasons: Dict[int, Tuple[str, Dict]] = {}
+
+    def pending(self, games: pd.DataFrame) -> List[SeasonJob]:
+        """Jobs for the seasons not replayed from these games yet"""
+        return [job for job in season_jobs(games) if self.seasons.get(job[0], (None,))[0] != job_digest(job)]
+
+    def prune(self, games: pd.DataFrame):
+        """
+        Forget seasons no longer in the games sheet. Only for a sheet that
+        loaded: an empty frame (e.g. from a failed fetch) prunes nothing.
+        """
+        if games.empty:
+            return
+        current = set(np.unique(season_of(date_array(games['date']))).tolist())
+        for season in list(self.seasons):
+            if season not in current:
+                del self.seasons[season]
+
+    def store(self, jobs: List[SeasonJob], results: List[Dict]):
+        for job, result in zip(jobs, results):
+            self.seasons[job[0]] = (job_digest(job), result)
+
+    def season(self, season: int) -> Optional[Dict]:
+        entry = self.seasons.get(season)
+        return entry[1] if entry else None
+
+    def as_json(self) -> Dict[str, Dict]:
+        return {str(season): self.seasons[season][1] for season in sorted(self.seasons)}
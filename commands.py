@@ -1,54 +1,164 @@
 """Command handlers for CFB Belt Bot"""
+import re
 from datetime import datetime
-from typing import Optional
-from data_fetcher import BeltDataFetcher
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import config
 
+if TYPE_CHECKING:
+    from data_fetcher import BeltDataFetcher
+
+# Longest trigger first so "!beltbot" is not read as "!belt" + "bot"
+TRIGGER_RE = re.compile(
+    '|'.join(re.escape(trigger) for trigger in sorted(
+        config.COMMAND_TRIGGERS + [f"u/{config.REDDIT_USERNAME}"], key=len, reverse=True
+    )) + r'(?![\w])',
+    re.IGNORECASE
+)
+COMMAND_PUNCTUATION = '.,!?:;"\'()'
+MAX_COMMANDS_PER_REPLY = 5
+
+# Subcommands that take the rest of the line as an argument
+ARGUMENT_COMMANDS = ('history', 'season', 'decade', 'conference', 'whatif')
+# ...of which these take just the next word
+ONE_WORD_COMMANDS = ('season', 'decade')
+# Subcommands answered without the current champion snapshot
+NO_SNAPSHOT_COMMANDS = ('help',) + ARGUMENT_COMMANDS
+DECADE_RE = re.compile(r"^(\d{3})0'?s?$")
+WHATIF_RE = re.compile(r"^(.+?)\s+(?:beats?|defeats?|over)\s+(.+)$")
+WHATIF_LISTED = 10  # Knocked-out teams named before "and N more"
+
 class CommandHandler:
-    def __init__(self):
-        self.fetcher = BeltDataFetcher()
+    def __init__(self, fetcher: Optional['BeltDataFetcher'] = None):
+        if fetcher is None:
+            # Imported here so answering from a snapshot never loads pandas
+            from data_fetcher import BeltDataFetcher
+            fetcher = BeltDataFetcher()
+        self.fetcher = fetcher
+
+        # Subcommand -> section builder; each takes the shared belt snapshot
+        self.handlers = {
+            'status': self._status_section,
+            'help': self._help_section,
+            'next': self._next_game_section,
+            'stats': self._stats_section,
+            'history': self._history_section,
+            'season': self._season_section,
+            'decade': self._decade_section,
+            'conference': self._conference_section,
+            'whatif': self._whatif_section,
+        }
 
     def handle_command(self, command_text: str) -> str:
-        """Route command to appropriate handler"""
-        parts = command_text.lower().strip().split()
-
-        if len(parts) == 0:
-            return self.get_current_status()
-
-        # Determine if a trigger was used
-        trigger_used = parts[0] in config.COMMAND_TRIGGERS
-        subcommand = parts[0] if not trigger_used else (parts[1] if len(parts) > 1 else '')
-
-        if subcommand == 'help':
-            return self.get_help()
-        elif subcommand == 'next':
-            return self.get_next_game()
-        elif subcommand == 'stats':
-            return self.get_stats()
-        elif subcommand == 'history':
-            # Extract team name based on whether trigger was used
-            if trigger_used:
-                team_name = ' '.join(parts[2:]) if len(parts) > 2 else None
+        """Answer every command in a comment with one combined reply"""
+        commands = self.parse_commands(command_text)
+        needs_snapshot = any(subcommand not in NO_SNAPSHOT_COMMANDS for subcommand, _ in commands)
+        snapshot = self._snapshot() if needs_snapshot else {}
+
+        sections = []
+        for subcommand, argument in commands:
+            handler = self.handlers[subcommand]
+            if argument is None:
+                sections.append(handler(snapshot))
             else:
-                team_name = ' '.join(parts[1:]) if len(parts) > 1 else None
-            return self.get_team_history(team_name)
+                sections.append(handler(snapshot, argument))
+
+        return "\n\n---\n\n".join(sections) + config.BOT_SIGNATURE
+
+    def parse_commands(self, command_text: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Find every trigger in a comment and parse the subcommand after it.
+        Returns de-duplicated (subcommand, argument) pairs in order.
+        Text with no trigger at all is parsed as a single command.
+        """
+        text = command_text.lower().strip()
+        matches = list(TRIGGER_RE.finditer(text))
+        if matches:
+            segments = []
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+                # A command runs to the next trigger or the end of its line; a
+                # trigger alone at the end of its line takes the next non-empty one
+                lines = text[match.end():end].split('\n')
+                segments.append(next((line for line in lines if line.strip(COMMAND_PUNCTUATION + ' \t')), ''))
         else:
-            return self.get_current_status()
+            segments = [text]
+
+        commands = []
+        for segment in segments:
+            words = segment.split()
+            subcommand = words[0].strip(COMMAND_PUNCTUATION) if words else ''
+            if subcommand not in self.handlers:
+                command = ('status', None)
+            elif subcommand in ARGUMENT_COMMANDS:
+                argument_words = words[1:2] if subcommand in ONE_WORD_COMMANDS else words[1:]
+                argument = ' '.join(argument_words).strip(COMMAND_PUNCTUATION)
+                command = (subcommand, argument or None)
+            else:
+                command = (subcommand, None)
+
+            if command not in commands:
+                commands.append(command)
+            if len(commands) >= MAX_COMMANDS_PER_REPLY:
+                break
+
+        return commands or [('status', None)]
+
+    def _snapshot(self) -> Dict:
+        """Belt state shared by every command answered in one reply"""
+        champion_id, reign_start, defenses = self.fetcher.get_current_champion()
+        return {
+            'champion_id': champion_id,
+            'reign_start': reign_start,
+            'defenses': defenses,
+            'champion_name': self.fetcher.get_school_name(champion_id) if champion_id else None,
+            'next_game': self.fetcher.get_next_belt_game() if champion_id else None,
+            'provisional': self.fetcher.is_champion_provisional()
+        }
+
+    def get_section(self, subcommand: str, argument: Optional[str] = None) -> str:
+        """One command's answer, without the bot signature"""
+        snapshot = self._snapshot() if subcommand not in NO_SNAPSHOT_COMMANDS else {}
+        handler = self.handlers[subcommand]
+        return handler(snapshot) if argument is None else handler(snapshot, argument)
 
     def get_current_status(self) -> str:
         """Get current belt holder status"""
-        champion_id, reign_start, defenses = self.fetcher.get_current_champion()
+        return self._status_section(self._snapshot()) + config.BOT_SIGNATURE
+
+    def get_help(self) -> str:
+        """Show available commands"""
+        return self._help_section({}) + config.BOT_SIGNATURE
+
+    def get_next_game(self) -> str:
+        """Get next belt game info"""
+        return self._next_game_section(self._snapshot()) + config.BOT_SIGNATURE
+
+    def get_stats(self) -> str:
+        """Get overall belt statistics"""
+        return self._stats_section(self._snapshot()) + config.BOT_SIGNATURE
+
+    def get_team_history(self, team_name: Optional[str]) -> str:
+        """Get a team's belt history"""
+        return self._history_section({}, team_name) + config.BOT_SIGNATURE
+
+    def _status_section(self, snapshot: Dict) -> str:
+        """Current belt holder status"""
+        champion_id = snapshot['champion_id']
+        reign_start = snapshot['reign_start']
+        defenses = snapshot['defenses']
 
         if not champion_id:
-            return "Unable to fetch belt data right now. Try again later!" + config.BOT_SIGNATURE
+            return "Unable to fetch belt data right now. Try again later!"
 
-        champion_name = self.fetcher.get_school_name(champion_id)
+        champion_name = snapshot['champion_name']
         days_held = (datetime.now() - reign_start).days if reign_start else 0
 
-        next_game = self.fetcher.get_next_belt_game()
+        next_game = snapshot['next_game']
 
         response = f"🏆 **CFB Linear Championship Belt Status**\n\n"
         response += f"**Current Champion:** {champion_name}\n\n"
+        if snapshot['provisional']:
+            response += "*Includes tonight's results, pending the official data update.*\n\n"
         response += f"**Held Since:** {reign_start.strftime('%B %d, %Y') if reign_start else 'Unknown'} ({days_held} days)\n\n"
         response += f"**Defenses This Reign:** {defenses}\n\n"
 
@@ -63,40 +173,41 @@ class CommandHandler:
             response += f"**Next Game:** Schedule TBD\n\n"
 
         response += f"[View full tracker]({config.WEBSITE_URL})"
-        response += config.BOT_SIGNATURE
-
         return response
 
-    def get_help(self) -> str:
-        """Show available commands"""
+    def _help_section(self, snapshot: Dict) -> str:
+        """Available commands"""
         response = "🏆 **CFB Belt Bot Commands**\n\n"
         response += "**Available Commands:**\n\n"
         response += "• `!beltbot` - Current belt status\n\n"
         response += "• `!beltbot next` - Next belt game\n\n"
         response += "• `!beltbot stats` - Overall belt statistics\n\n"
         response += "• `!beltbot history [team]` - Team's belt history\n\n"
+        response += "• `!beltbot season [year]` - A season's belt games\n\n"
+        response += "• `!beltbot decade [1950s]` - A decade's belt games\n\n"
+        response += "• `!beltbot conference [name]` - Belt games by a conference's teams\n\n"
+        response += "• `!beltbot whatif [team] beats [team]` - The belt chase after a hypothetical result\n\n"
         response += "• `!beltbot help` - This help message\n\n"
         response += "---\n\n"
         response += "**Need Help?**\n\n"
         response += f"• Full Tracker: {config.WEBSITE_URL}\n\n"
         response += "• Report bugs or data issues: [GitHub Issues](https://github.com/raypratt/cfb-beltbot/issues)\n\n"
         response += "• Source code: [GitHub](https://github.com/raypratt/cfb-beltbot)"
-        response += config.BOT_SIGNATURE
-
         return response
 
-    def get_next_game(self) -> str:
-        """Get next belt game info"""
-        champion_id, _, defenses = self.fetcher.get_current_champion()
+    def _next_game_section(self, snapshot: Dict) -> str:
+        """Next belt game info"""
+        champion_id = snapshot['champion_id']
+        defenses = snapshot['defenses']
 
         if not champion_id:
-            return "Unable to fetch belt data right now. Try again later!" + config.BOT_SIGNATURE
+            return "Unable to fetch belt data right now. Try again later!"
 
-        champion_name = self.fetcher.get_school_name(champion_id)
-        next_game = self.fetcher.get_next_belt_game()
+        champion_name = snapshot['champion_name']
+        next_game = snapshot['next_game']
 
         if not next_game:
-            return f"🏆 **Next Belt Game**\n\n{champion_name} holds the belt, but no upcoming games are scheduled yet." + config.BOT_SIGNATURE
+            return f"🏆 **Next Belt Game**\n\n{champion_name} holds the belt, but no upcoming games are scheduled yet."
 
         next_date = next_game['date']
         is_home = next_game['home_id'] == champion_id
@@ -117,19 +228,17 @@ class CommandHandler:
             response += f"⏰ {days_until} days away\n\n"
 
         response += f"[Live tracker]({config.WEBSITE_URL})"
-        response += config.BOT_SIGNATURE
-
         return response
 
-    def get_stats(self) -> str:
-        """Get overall belt statistics"""
-        champion_id, reign_start, defenses = self.fetcher.get_current_champion()
+    def _stats_section(self, snapshot: Dict) -> str:
+        """Overall belt statistics"""
+        defenses = snapshot['defenses']
         stats = self.fetcher.get_overall_stats()
 
         if not stats:
-            return "Unable to fetch belt statistics right now. Try again later!" + config.BOT_SIGNATURE
+            return "Unable to fetch belt statistics right now. Try again later!"
 
-        champion_name = self.fetcher.get_school_name(champion_id) if champion_id else "Unknown"
+        champion_name = snapshot['champion_name'] or "Unknown"
         days_since_start = stats.get('days_since_start', 0)
         total_games = stats.get('total_games', 0)
         total_changes = stats.get('total_changes', 0)
@@ -142,26 +251,24 @@ class CommandHandler:
         response += f"**Belt Changes:** {total_changes:,}\n\n"
         response += f"**Defenses:** {total_games - total_changes:,}\n\n"
         response += f"[Full statistics]({config.WEBSITE_URL})"
-        response += config.BOT_SIGNATURE
-
         return response
 
-    def get_team_history(self, team_name: Optional[str]) -> str:
-        """Get a team's belt history"""
+    def _history_section(self, snapshot: Dict, team_name: Optional[str] = None) -> str:
+        """A team's belt history"""
         if not team_name:
-            return "Please specify a team! Example: `!beltbot history Michigan`" + config.BOT_SIGNATURE
+            return "Please specify a team! Example: `!beltbot history Michigan`"
 
         # Find team using the improved search with aliases
         result = self.fetcher.find_team_by_name(team_name)
 
         if not result:
-            return f"Couldn't find a team matching '{team_name}'. Try a different spelling!" + config.BOT_SIGNATURE
+            return f"Couldn't find a team matching '{team_name}'. Try a different spelling!"
 
         team_id, actual_team_name = result
         history = self.fetcher.get_team_belt_history(team_id)
 
         if history['total_reigns'] == 0:
-            return f"📊 **{actual_team_name} Belt History**\n\n{actual_team_name} has never held the belt... yet! 🏆" + config.BOT_SIGNATURE
+            return f"📊 **{actual_team_name} Belt History**\n\n{actual_team_name} has never held the belt... yet! 🏆"
 
         response = f"📊 **{actual_team_name} Belt History**\n\n"
         response += f"**Total Reigns:** {history['total_reigns']}\n\n"
@@ -183,8 +290,116 @@ class CommandHandler:
             response += f"**Last Lost To:** {history['last_lost_to']}\n\n"
 
         response += f"[Full history]({config.WEBSITE_URL})"
-        response += config.BOT_SIGNATURE
+        return response
 
+    def _aggregate_section(self, title: str, stats: Dict, extra: str = '') -> str:
+        """Belt games, changes, defenses, holders and longest reign for a season, decade or conference"""
+        response = f"📊 **{title}**\n\n"
+        response += f"**Belt Games:** {stats['belt_games']:,}\n\n"
+        response += f"**Belt Changes:** {stats['changes']:,}\n\n"
+        response += f"**Defenses:** {stats['defenses']:,}\n\n"
+        response += f"**Teams That Held the Belt:** {stats['holders']:,}\n\n"
+
+        longest = stats['longest_reign']
+        if longest:
+            champion_name = self.fetcher.get_school_name(longest['champion_id'])
+            response += f"**Longest Reign Started:** {champion_name}, {longest['days']:,} days "
+            response += f"(from {longest['start_date'].strftime('%B %d, %Y')})\n\n"
+
+        response += extra
+        response += f"[Full history]({config.WEBSITE_URL})"
+        return response
+
+    def _season_section(self, snapshot: Dict, season: Optional[str] = None) -> str:
+        """A season's belt games"""
+        if not season or not season.isdigit():
+            return "Please specify a season! Example: `!beltbot season 1998`"
+
+        stats = self.fetcher.get_season_stats(int(season))
+        if not stats:
+            return f"No belt games found for the {season} season."
+
+        # From the season's replayed pre-season chase, once it has been replayed
+        extra = ''
+        chase = self.fetcher.get_season_chase(int(season))
+        if chase and chase['contenders']:
+            extra += f"**Teams That Could Have Won It:** {chase['contenders']:,}\n\n"
+        if chase and chase['longest_odds']:
+            longest_odds = chase['longest_odds']
+            games_away = longest_odds['games_away']
+            extra += f"**Longest-Odds Winner:** {self.fetcher.get_school_name(longest_odds['winner_id'])}, "
+            extra += f"{games_away} game{'s' if games_away != 1 else ''} away before the season\n\n"
+        return self._aggregate_section(f"{season} Season Belt Stats", stats, extra)
+
+    def _decade_section(self, snapshot: Dict, decade: Optional[str] = None) -> str:
+        """A decade's belt games"""
+        match = DECADE_RE.match(decade or '')
+        if not match:
+            return "Please specify a decade! Example: `!beltbot decade 1950s`"
+
+        decade = int(match.group(1)) * 10
+        stats = self.fetcher.get_decade_stats(decade)
+        if not stats:
+            return f"No belt games found for the {decade}s."
+        return self._aggregate_section(f"{decade}s Belt Stats", stats)
+
+    def _conference_section(self, snapshot: Dict, conference: Optional[str] = None) -> str:
+        """Belt games won by a conference's current members"""
+        if not conference:
+            return "Please specify a conference! Example: `!beltbot conference SEC`"
+
+        stats = self.fetcher.get_conference_stats(conference)
+        if not stats:
+            return f"Couldn't find belt stats for a conference named '{conference}'."
+        return self._aggregate_section(f"{stats['conference']} Belt Stats (current members)", stats)
+
+    def _whatif_section(self, snapshot: Dict, matchup: Optional[str] = None) -> str:
+        """The belt chase if one team beats another in their next game"""
+        match = WHATIF_RE.match(matchup or '')
+        if not match:
+            return "Please specify a result! Example: `!beltbot whatif Michigan beats Ohio State`"
+
+        teams = []
+        for team_name in match.groups():
+            result = self.fetcher.find_team_by_name(team_name)
+            if not result:
+                return f"Couldn't find a team matching '{team_name}'. Try a different spelling!"
+            teams.append(result)
+        (winner_id, winner_name), (loser_id, loser_name) = teams
+
+        what_if = self.fetcher.what_if(winner_id, loser_id)
+        if what_if is None:
+            return "Unable to fetch belt data right now. Try again later!"
+        game = what_if['game']
+        if game is None:
+            return f"{winner_name} and {loser_name} don't have a game left on the schedule."
+
+        response = f"🔮 **What If {winner_name} Beats {loser_name}?**\n\n"
+        response += f"📅 Week {game['week']}, {game['start_date'].strftime('%A, %B %d')}\n\n"
+        if what_if['belt_game']:
+            if winner_id == what_if['champion_id']:
+                response += f"🏆 **{winner_name}** would keep the belt\n\n"
+            else:
+                response += f"🏆 **{winner_name}** would take the belt from **{loser_name}**!\n\n"
+
+        # The team holding the belt after a belt game isn't out of the chase
+        alive = {team['team_id'] for team in what_if['what_if_chase']}
+        if what_if['belt_game']:
+            alive.add(winner_id)
+        knocked_out = [team['name'] for team in what_if['chase'] if team['team_id'] not in alive]
+        response += f"**Teams Still Alive:** {len(what_if['what_if_chase'])} (currently {len(what_if['chase'])})\n\n"
+        if knocked_out:
+            listed = ', '.join(knocked_out[:WHATIF_LISTED])
+            if len(knocked_out) > WHATIF_LISTED:
+                listed += f" and {len(knocked_out) - WHATIF_LISTED} more"
+            response += f"**Knocked Out:** {listed}\n\n"
+
+        contenders = [f"{team['name']} ({team['games_away']} away, Week {team['earliest_week']})"
+                      for team in what_if['what_if_chase'][:5]]
+        if contenders:
+            response += f"**Closest Contenders:** {', '.join(contenders)}\n\n"
+
+        response += f"[Live tracker]({config.WEBSITE_URL})"
         return response
 
 
@@ -1,5 +1,7 @@
 """Configuration for CFB Belt Bot"""
+import json
 import os
+import platform
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,11 +16,29 @@ REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'CFBBeltBot v1.0')
 # Target subreddit
 TARGET_SUBREDDIT = os.getenv('TARGET_SUBREDDIT', 'test')
 
+# All subreddits to run in (comma-separated); defaults to TARGET_SUBREDDIT.
+# Scheduled posts go to the first one unless SUBREDDIT_SETTINGS says otherwise.
+TARGET_SUBREDDITS = [
+    name.strip() for name in os.getenv('TARGET_SUBREDDITS', TARGET_SUBREDDIT).split(',') if name.strip()
+]
+
+# Per-subreddit overrides as JSON, e.g.
+# {"Rutgers": {"game_threads": false, "max_replies_per_hour": 5}}
+# Keys: commands, game_threads, scheduled_posts, max_replies_per_hour,
+# max_posts_per_hour, reply_cooldown_seconds
+SUBREDDIT_SETTINGS = {
+    name.lower(): settings for name, settings in json.loads(os.getenv('SUBREDDIT_SETTINGS') or '{}').items()
+}
+
 # Data sources
 GAMES_CSV_URL = os.getenv('GAMES_CSV_URL')
 SCHOOLS_CSV_URL = os.getenv('SCHOOLS_CSV_URL')
 SCHEDULE_CSV_URL = os.getenv('SCHEDULE_CSV_URL')
 
+# Optional local CSV of final scores (date,winner_id,loser_id,winner_score,loser_score)
+# applied as provisional results until the games sheet catches up
+SCORES_FEED_PATH = os.getenv('SCORES_FEED_PATH')
+
 # Website
 WEBSITE_URL = os.getenv('WEBSITE_URL', 'https://rutgersstartedthis.com')
 
@@ -45,5 +65,60 @@ WEEKLY_UPDATE_MINUTE = 0
 # Commands
 COMMAND_TRIGGERS = ['!beltbot', '!belt']
 
+# Provisional results not confirmed by the games sheet within this window are dropped
+PROVISIONAL_RESULT_DAYS = 7
+
 # Rate limiting
 REPLY_COOLDOWN_SECONDS = 60  # Don't reply to same thread within 60 seconds
+
+# Adaptive cadence: seconds between Reddit polls and minutes between data
+# reloads, tightened around the belt holder's games and relaxed otherwise
+CADENCE = {
+    'game': {'poll_seconds': 10, 'refresh_minutes': 2},  # Belt game in progress
+    'game_day': {'poll_seconds': 30, 'refresh_minutes': 15},  # Belt game within 12 hours
+    'idle': {'poll_seconds': 90, 'refresh_minutes': 60},  # Nothing at stake soon
+}
+GAME_WINDOW_BEFORE_MINUTES = 30  # Game mode starts this long before kickoff
+GAME_WINDOW_AFTER_HOURS = 4.5  # ...and lasts this long after it
+GAME_DAY_HOURS = 12
+
+# Belt state saved after each data change, read by the beltbot CLI
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'snapshot.json')
+
+# Optional read-only JSON API over the snapshot (0 = off)
+API_HOST = os.getenv('API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('API_PORT') or 0)
+
+# Listing cursors are saved here so a restart resumes where it stopped
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', 'checkpoints.json')
+CATCHUP_MAX_SECONDS = 6 * 3600  # Don't answer anything older than this after downtime
+COLD_START_SECONDS = 600  # Without a checkpoint, only handle items (comments, mentions, threads) from the last 10 min
+
+# Replicas: point several bots at the same SQLite ledger file to share the
+# work, with exactly one reply per item and one replica running scheduled posts
+LEDGER_PATH = os.getenv('LEDGER_PATH')
+REPLICA_ID = os.getenv('REPLICA_ID') or f"{platform.node()}-{os.getpid()}"
+# A replica silent this long drops out; it heartbeats once per poll, so
+# allow a few of the slowest polls before counting it gone
+LEDGER_LEASE_SECONDS = 3 * max(mode['poll_seconds'] for mode in CADENCE.values())
+
+# Logging: JSON lines by default, LOG_FORMAT=text for a terminal
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_SAMPLE_SECONDS = 60  # Debug events from the polling paths: at most one per kind per minute
+
+# Worker processes for the belt chase search and the past-season replays (0 = run them on the main loop)
+CHASE_WORKERS = int(os.getenv('CHASE_WORKERS', '1'))
+
+
+def subreddit_setting(subreddit: str, key: str):
+    """Look up a per-subreddit setting, falling back to the global default"""
+    defaults = {
+        'commands': True,
+        'game_threads': True,
+        'scheduled_posts': subreddit.lower() == TARGET_SUBREDDITS[0].lower(),
+        'max_replies_per_hour': MAX_REPLIES_PER_HOUR,
+        'max_posts_per_hour': MAX_POSTS_PER_HOUR,
+        'reply_cooldown_seconds': REPLY_COOLDOWN_SECONDS,
+    }
+    return SUBREDDIT_SETTINGS.get(subreddit.lower(), {}).get(key, defaults[key])
@@ -0,0 +1,194 @@
+"""Belt aggregates by season, decade and conference"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from lineage import BELT_CHANGE, BELT_DEFENSE, date_array
+
+# Games before July count toward the previous season (bowls, the spring 2021 season)
+SEASON_START_MONTH = 7
+
+
+def season_of(dates: np.ndarray) -> np.ndarray:
+    """Season year of each datetime64 date"""
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    months = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    return years - (months < SEASON_START_MONTH)
+
+
+def _holders(column: pd.Series) -> np.ndarray:
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class BeltCubes:
+    """
+    Small precomputed aggregates, built once per games load so season,
+    decade and conference questions never touch the games table.
+
+    Seasons and decades are parallel NumPy arrays indexed from the first
+    season; conferences (from the schools sheet, by each team's current
+    conference) are indexed by conference code. Each cell holds belt
+    games, changes, defenses, distinct holders and the longest reign that
+    started in it (open reigns counted to the load time).
+    """
+
+    def __init__(self, games: pd.DataFrame, reigns: List[Dict], conferences: Optional[Dict[int, str]] = None,
+                 now: Optional[datetime] = None):
+        self.first_season = None
+        self.seasons = {}
+        self.first_decade = None
+        self.decades = {}
+        self.conference_names = []
+        self.conference_codes = {}  # Lowercase name -> code
+        self.conferences = {}
+        if games.empty or 'belt_game' not in games or not reigns:
+            return
+
+        now = now or datetime.now()
+        belt_game = games['belt_game'].to_numpy()
+        winners = games['winner_id'].to_numpy(dtype=np.int64)
+        seasons = season_of(date_array(games['date']))
+        # Holders going into and coming out of every game cover everyone who held it in a span
+        holder_seasons = np.concatenate((seasons, seasons))
+        holders = np.concatenate((_holders(games['holder_before']), _holders(games['holder_after'])))
+        held = ~np.isnan(holders)
+        holder_seasons, holders = holder_seasons[held], holders[held].astype(np.int64)
+
+        champions = np.array([reign['champion_id'] for reign in reigns], dtype=np.int64)
+        starts = date_array(pd.Series([reign['start_date'] for reign in reigns]))
+        ends = date_array(pd.Series([reign['end_date'] or now for reign in reigns]))
+        reign_days = (ends - starts).astype('timedelta64[D]').astype(np.int64)
+        reign_seasons = season_of(starts)
+
+        self.first_season = int(seasons.min())
+        count = int(seasons.max()) - self.first_season + 1
+        self.seasons = self._aggregate(
+            seasons - self.first_season, count, belt_game,
+            holder_seasons - self.first_season, holders,
+            reign_seasons - self.first_season, reign_days, champions, starts
+        )
+
+        decades = seasons // 10
+        self.first_decade = int(decades.min()) * 10
+        count = int(decades.max()) - self.first_decade // 10 + 1
+        self.decades = self._aggregate(
+            decades - self.first_decade // 10, count, belt_game,
+            holder_seasons // 10 - self.first_decade // 10, holders,
+            reign_seasons // 10 - self.first_decade // 10, reign_days, champions, starts
+        )
+
+        if conferences:
+            self.conference_names = sorted(set(conferences.values()))
+            self.conference_codes = {name.lower(): code for code, name in enumerate(self.conference_names)}
+            size = max(int(winners.max()), int(champions.max()), max(conferences)) + 1
+            code_of = np.full(size, -1, dtype=np.int64)
+            for team_id, name in conferences.items():
+                if team_id >= 0:
+                    code_of[team_id] = self.conference_codes[name.lower()]
+
+            # Credited to the winner's conference; holders are the teams that won reigns
+            winner_codes = code_of[winners]
+            reign_codes = code_of[champions]
+            known = reign_codes >= 0
+            self.conferences = self._aggregate(
+                winner_codes, len(self.conference_names), belt_game,
+                reign_codes[known], champions[known],
+                reign_codes, reign_days, champions, starts
+            )
+
+    @staticmethod
+    def _aggregate(group: np.ndarray, count: int, belt_game: np.ndarray,
+                   holder_group: np.ndarray, holders: np.ndarray,
+                   reign_group: np.ndarray, reign_days: np.ndarray, champions: np.ndarray,
+                   starts: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-group arrays; rows with a negative group are left out"""
+        def tally(mask):
+            return np.bincount(group[mask & (group >= 0)], minlength=count)
+
+        changes = tally(belt_game == BELT_CHANGE)
+        defenses = tally(belt_game == BELT_DEFENSE)
+
+        # Distinct (group, holder) pairs
+        pairs = np.unique(np.stack((holder_group, holders)), axis=1) if len(holders) else np.empty((2, 0), np.int64)
+        distinct = np.bincount(pairs[0], minlength=count)
+
+        # Longest reign per group, the earlier one on ties
+        longest = np.full(count, -1, dtype=np.int64)
+        valid = np.flatnonzero(reign_group >= 0)
+        order = valid[np.lexsort((-valid, reign_days[valid], reign_group[valid]))]
+        if len(order):
+            last = np.flatnonzero(np.append(np.diff(reign_group[order]) != 0, True))
+            longest[reign_group[order[last]]] = order[last]
+
+        return {
+            'belt_games': changes + defenses,
+            'changes': changes,
+            'defenses': defenses,
+            'holders': distinct,
+            'longest_reign': longest,  # Index into the reign arrays, -1 if none started
+            'reign_champion': champions,
+            'reign_start': starts,
+            'reign_days': reign_days,
+        }
+
+    @staticmethod
+    def _row(cube: Dict[str, np.ndarray], i: int) -> Dict:
+        reign = int(cube['longest_reign'][i])
+        longest = None
+        if reign >= 0:
+            longest = {
+                'champion_id': int(cube['reign_champion'][reign]),
+                'start_date': cube['reign_start'][reign].astype(datetime),
+                'days': int(cube['reign_days'][reign])
+            }
+        return {
+            'belt_games': int(cube['belt_games'][i]),
+            'changes': int(cube['changes'][i]),
+            'defenses': int(cube['defenses'][i]),
+            'holders': int(cube['holders'][i]),
+            'longest_reign': longest
+        }
+
+    def season(self, season: int) -> Optional[Dict]:
+        """Aggregates for one season, or None outside the lineage"""
+        if self.first_season is None:
+            return None
+        i = season - self.first_season
+        return self._row(self.seasons, i) if 0 <= i < len(self.seasons['belt_games']) else None
+
+    def decade(self, decade: int) -> Optional[Dict]:
+        """Aggregates for the decade starting at `decade` (e.g. 1950)"""
+        if self.first_decade is None or decade % 10:
+            return None
+        i = (decade - self.first_decade) // 10
+        return self._row(self.decades, i) if 0 <= i < len(self.decades['belt_games']) else None
+
+    def conference(self, name: str) -> Optional[Dict]:
+        """Aggregates for a conference, by name (any case)"""
+        code = self.conference_codes.get(name.lower())
+        if code is None:
+            return None
+        return dict(self._row(self.conferences, code), conference=self.conference_names[code])
+
+    def as_json(self) -> Dict:
+        """Every cell as plain JSON, keyed by season, decade and conference name"""
+        def rows(count, label, lookup):
+            cells = {}
+            for i in range(count):
+                row = lookup(i)
+                if row['longest_reign']:
+                    row['longest_reign'] = dict(row['longest_reign'],
+                                                start_date=row['longest_reign']['start_date'].isoformat())
+                cells[label(i)] = row
+            return cells
+
+        return {
+            'seasons': rows(len(self.seasons.get('belt_games', ())), lambda i: str(self.first_season + i),
+                            lambda i: self._row(self.seasons, i)),
+            'decades': rows(len(self.decades.get('belt_games', ())), lambda i: str(self.first_decade + 10 * i),
+                            lambda i: self._row(self.decades, i)),
+            'conferences': rows(len(self.conference_names), lambda i: self.conference_names[i],
+                                lambda i: self._row(self.conferences, i)),
+        }
@@ -1,19 +1,104 @@
 """Fetch and process belt data from Google Sheets"""
+import csv
+import hashlib
+import io
+import logging
+import os
+import sys
+import time
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dateutil import parser as date_parser
 import config
+from chase import ChaseEngine
+from chase_history import ChaseHistory, SeasonJob, replay_seasons
+from cubes import BeltCubes
+from leaderboard import ReignLeaderboard
+from log import Sampler, log_event
+from lineage import BELT_CHANGE, BELT_DEFENSE, LineageBuilder, build_reigns, build_team_histories, classified, replay
+from schedule_index import ScheduleIndex, utc_now
+from title_matcher import TeamTitleMatcher, find_team
+
+logger = logging.getLogger(__name__)
+
+# Columns the bot reads from the games sheet and how to parse them
+GAMES_COLUMNS = {
+    'date': 'str',
+    'winner_id': 'Int64',
+    'loser_id': 'Int64',
+    'winner_score': 'Int64',
+    'loser_score': 'Int64',
+    'belt_change': 'str',
+}
+GAMES_CHUNK_ROWS = 2000
+
+# How far apart a provisional result and a sheet game can be and still be the same game
+PROVISIONAL_MATCH_WINDOW = timedelta(days=3)
+
+
+def content_digest(df: pd.DataFrame) -> str:
+    """Hash of a frame's columns and values, to tell a reload with new data from a repeat"""
+    digest = hashlib.blake2b(repr(list(df.columns)).encode(), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
 
 class BeltDataFetcher:
     def __init__(self):
         self.schools_cache = {}
+        self.school_names = []  # Indexed by school ID
+        self.school_ids_by_name = {}  # Lowercase name -> school ID
+        self.school_conferences = {}  # School ID -> conference, if the sheet has them
         self.games_cache = None
         self.schedule_cache = None
+        self._no_games = pd.DataFrame(columns=list(GAMES_COLUMNS))  # Served until the games sheet first loads
+        self._no_schedule = pd.DataFrame()  # ...and until the schedule does
+        self.schedule_index = ScheduleIndex(pd.DataFrame())
         self.cache_timestamp = None
+        self.schedule_timestamp = None
         self.cache_duration = timedelta(minutes=15)
 
+        # Content hashes of the last parsed sheets; reloads that match keep the
+        # loaded frames and the data version
+        self._games_digest = None
+        self._games_reigns = []
+        self._schedule_digest = None
+
+        # Bumped whenever games, schedule or provisional results change
+        self.data_version = 0
+        self.sampler = Sampler(config.LOG_SAMPLE_SECONDS)  # Cache hit debug events
+
+        # Thread title matcher, built once the schools are loaded
+        self.title_matcher = None
+        self._title_matcher_source = None
+
+        # Reign leaderboard, rebuilt when a new games frame is loaded
+        self.leaderboard = ReignLeaderboard()
+        self._leaderboard_source = None
+
+        # Team ID -> belt history, rebuilt with the leaderboard; teams that
+        # never held the belt are absent
+        self.team_histories = {}
+
+        # Season, decade and conference aggregates, rebuilt with the leaderboard
+        self.cubes = BeltCubes(pd.DataFrame(), [])
+
+        # (chase_key, chase teams) for the last belt chase computed
+        self._chase_cache = (None, [])
+
+        # Memoized chase states, reused by what-ifs until the next kickoff
+        self._chase_engine = None
+
+        # Pre-season chases replayed for every past season, and the games frame last checked
+        self.chase_history = ChaseHistory()
+        self._chase_history_source = None
+
+        # Final scores applied ahead of the games sheet, oldest first
+        self.provisional_results = []
+        self._scores_feed_mtime = None
+
         # Team name aliases for common alternate names
         self.team_aliases = {
             'usc': 'USC',
@@ -43,7 +128,7 @@ class BeltDataFetcher:
             'virginia polytechnic institute': 'Virginia Tech',
         }
 
-    def fetch_schools(self) -> Dict[str, str]:
+    def fetch_schools(self) -> Dict[int, str]:
         """Fetch school ID to name mapping"""
         if self.schools_cache:
             return self.schools_cache
@@ -52,29 +137,61 @@ class BeltDataFetcher:
             response = requests.get(config.SCHOOLS_CSV_URL)
             response.raise_for_status()
 
-            lines = response.text.strip().split('\n')
-            for line in lines[1:]:  # Skip header
-                parts = line.split(',')
-                if len(parts) >= 2:
-                    school_id = parts[0].strip()
-                    school_name = parts[1].strip()
-                    self.schools_cache[school_id] = school_name
-
+            reader = csv.reader(io.StringIO(response.text))
+            header = [column.strip().lower() for column in next(reader, [])]
+            conference_column = header.index('conference') if 'conference' in header else None
+            for row in reader:
+                if len(row) < 2:
+                    continue
+                try:
+                    school_id = int(row[0])
+                except ValueError:
+                    continue
+                self.schools_cache[school_id] = sys.intern(row[1].strip())
+                if conference_column is not None and len(row) > conference_column and row[conference_column].strip():
+                    self.school_conferences[school_id] = sys.intern(row[conference_column].strip())
+
+            self._index_schools()
             return self.schools_cache
-        except Exception as e:
-            print(f"Error fetching schools: {e}")
+        except Exception:
+            log_event(logger, 'fetch_failed', logging.ERROR, exc_info=True, sheet='schools')
             return {}
 
+    def _index_schools(self):
+        """Build the ID-indexed name array and the reverse name index"""
+        size = max(self.schools_cache, default=-1) + 1
+        self.school_names = [None] * size
+        self.school_ids_by_name = {}
+        for school_id, school_name in self.schools_cache.items():
+            if school_id >= 0:
+                self.school_names[school_id] = school_name
+            self.school_ids_by_name.setdefault(school_name.lower(), school_id)
+
     def get_school_name(self, school_id) -> str:
         """Get school name from ID"""
-        schools = self.fetch_schools()
-        # Convert to string if it's numeric (handles pandas int/float types)
+        if not self.schools_cache:
+            self.fetch_schools()
+
+        # Fast path: integer IDs (including numpy ints) index straight into the array
+        try:
+            if school_id >= 0:
+                name = self.school_names[school_id]
+                if name is not None:
+                    return name
+        except (IndexError, TypeError):
+            pass
+
         if school_id is None:
             return "Unknown"
-        school_id_str = str(int(school_id)) if isinstance(school_id, (int, float)) or hasattr(school_id, 'item') else str(school_id)
-        return schools.get(school_id_str, school_id_str)
-
-    def find_team_by_name(self, team_name: str) -> Optional[Tuple[str, str]]:
+        try:
+            school_id = int(float(school_id))
+        except (TypeError, ValueError):
+            return str(school_id)
+        if 0 <= school_id < len(self.school_names) and self.school_names[school_id] is not None:
+            return self.school_names[school_id]
+        return str(school_id)
+
+    def find_team_by_name(self, team_name: str) -> Optional[Tuple[int, str]]:
         """
         Find team ID and official name by searching for the team name.
         Returns (team_id, official_name) or None if not found.
@@ -84,101 +201,135 @@ class BeltDataFetcher:
             return None
 
         schools = self.fetch_schools()
-        team_name_lower = team_name.lower().strip()
-
-        # First, check aliases
-        if team_name_lower in self.team_aliases:
-            canonical_name = self.team_aliases[team_name_lower]
-            # Find the school with this canonical name
-            for school_id, school_name in schools.items():
-                if school_name.lower() == canonical_name.lower():
-                    return (school_id, school_name)
-
-        # Exact match
-        for school_id, school_name in schools.items():
-            if school_name.lower() == team_name_lower:
-                return (school_id, school_name)
-
-        # Partial match
-        for school_id, school_name in schools.items():
-            if team_name_lower in school_name.lower():
-                return (school_id, school_name)
+        return find_team(team_name, schools, self.school_ids_by_name, self.team_aliases)
 
-        return None
+    def get_title_matcher(self) -> TeamTitleMatcher:
+        """Get the thread title matcher over every school name and alias"""
+        schools = self.fetch_schools()
+        if self.title_matcher is None or self._title_matcher_source is not schools:
+            names = {school_name: school_id for school_id, school_name in schools.items()}
+            for alias, canonical_name in self.team_aliases.items():
+                school_id = self.school_ids_by_name.get(canonical_name.lower())
+                if school_id is not None:
+                    names[alias] = school_id
+            self.title_matcher = TeamTitleMatcher(names)
+            self._title_matcher_source = schools
+        return self.title_matcher
 
     def fetch_games(self, force_refresh: bool = False) -> pd.DataFrame:
         """Fetch all historical games"""
         if not force_refresh and self.games_cache is not None:
             if self.cache_timestamp and datetime.now() - self.cache_timestamp < self.cache_duration:
+                self.sampler.debug(logger, 'cache', key='cache:games', sheet='games', cache='hit',
+                                   data_version=self.data_version)
                 return self.games_cache
 
         try:
-            df = pd.read_csv(config.GAMES_CSV_URL)
-            # Parse dates manually to handle old dates (before 1677)
-            df['date'] = df['date'].apply(lambda x: date_parser.parse(x))
-            self.games_cache = df
+            started = time.perf_counter()
+            builder = LineageBuilder()
+            chunks = []
+
+            # Stream the sheet so only one chunk of raw rows is parsed at a time
+            with requests.get(config.GAMES_CSV_URL, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                reader = pd.read_csv(
+                    response.raw,
+                    usecols=lambda column: column in GAMES_COLUMNS,
+                    dtype=GAMES_COLUMNS,
+                    chunksize=GAMES_CHUNK_ROWS
+                )
+                for chunk in reader:
+                    chunk = chunk.dropna(subset=['date', 'winner_id', 'loser_id'])
+                    chunk = chunk.astype({'winner_id': 'int64', 'loser_id': 'int64'})
+                    # Parse dates manually to handle old dates (before 1677)
+                    chunk['date'] = chunk['date'].apply(lambda x: date_parser.parse(x))
+                    # Classified as it's replayed, so queries filter on belt_game
+                    chunks.append(builder.feed(chunk))
+
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(GAMES_COLUMNS))
+            if builder.out_of_order:
+                df, reigns = replay(df)
+            else:
+                reigns = builder.finish()
+
             self.cache_timestamp = datetime.now()
+            digest = content_digest(df)
+            unchanged = self.games_cache is not None and digest == self._games_digest
+            if unchanged:
+                # Keep the loaded frame, so nothing keyed on it or on the data version is rebuilt
+                df = self.games_cache
+                pending = len(self.provisional_results)
+                self._reconcile_provisional_results(df)
+                if len(self.provisional_results) != pending:
+                    self._load_lineage(df, self._games_reigns)  # An unconfirmed result expired
+                    self.data_version += 1
+            else:
+                self.games_cache = df
+                self._games_digest = digest
+                self._games_reigns = reigns
+                self._load_lineage(df, reigns)
+                self.chase_history.prune(df)
+                self.data_version += 1
+            log_event(logger, 'sheet_loaded', sheet='games', cache='miss', rows=len(df), reigns=len(reigns),
+                      out_of_order=builder.out_of_order, unchanged=unchanged, data_version=self.data_version,
+                      latency_ms=round((time.perf_counter() - started) * 1000))
             return df
-        except Exception as e:
-            print(f"Error fetching games: {e}")
-            return pd.DataFrame()
+        except Exception:
+            # Keep serving the last good games: a new empty frame would rebuild the lineage from nothing
+            log_event(logger, 'fetch_failed', logging.ERROR, exc_info=True, sheet='games')
+            return self.games_cache if self.games_cache is not None else self._no_games
 
     def fetch_schedule(self, force_refresh: bool = False) -> pd.DataFrame:
         """Fetch future schedule"""
         if not force_refresh and self.schedule_cache is not None:
-            if self.cache_timestamp and datetime.now() - self.cache_timestamp < self.cache_duration:
+            if self.schedule_timestamp and datetime.now() - self.schedule_timestamp < self.cache_duration:
+                self.sampler.debug(logger, 'cache', key='cache:schedule', sheet='schedule', cache='hit',
+                                   data_version=self.data_version)
                 return self.schedule_cache
 
         try:
+            started = time.perf_counter()
             df = pd.read_csv(config.SCHEDULE_CSV_URL)
             df['start_date'] = pd.to_datetime(df['start_date'], utc=True).dt.tz_localize(None)
-            self.schedule_cache = df
+            self.schedule_timestamp = datetime.now()
+            digest = content_digest(df)
+            unchanged = self.schedule_cache is not None and digest == self._schedule_digest
+            if unchanged:
+                df = self.schedule_cache  # Same games: keep the index (and the chase memo over it)
+            else:
+                self.schedule_cache = df
+                self._schedule_digest = digest
+                self.schedule_index = ScheduleIndex(df)
+                self.data_version += 1
+            log_event(logger, 'sheet_loaded', sheet='schedule', cache='miss', rows=len(df), unchanged=unchanged,
+                      data_version=self.data_version, latency_ms=round((time.perf_counter() - started) * 1000))
             return df
-        except Exception as e:
-            print(f"Error fetching schedule: {e}")
-            return pd.DataFrame()
+        except Exception:
+            # Keep the last good schedule and its index
+            log_event(logger, 'fetch_failed', logging.ERROR, exc_info=True, sheet='schedule')
+            return self.schedule_cache if self.schedule_cache is not None else self._no_schedule
 
-    def get_current_champion(self) -> Tuple[Optional[str], Optional[datetime], int]:
+    def get_current_champion(self) -> Tuple[Optional[int], Optional[datetime], int]:
         """
         Returns: (champion_id, reign_start_date, defenses)
+        Includes provisional results not yet in the games sheet.
         """
-        games = self.fetch_games()
-        if games.empty:
+        reign = self.get_reign_leaderboard().current
+        if reign is None:
             return None, None, 0
 
-        # Get most recent completed game with belt_change data (where belt changed hands)
-        belt_games = games[games['belt_change'].notna()].copy()
-        if belt_games.empty:
-            return None, None, 0
-
-        belt_games = belt_games.sort_values('date', ascending=False)
-
-        # Find current champion (winner of most recent belt change game)
-        current_champion = belt_games.iloc[0]['winner_id']
-        reign_start = belt_games.iloc[0]['date']
+        return reign['champion_id'], reign['start_date'], reign['defenses']
 
-        # Now count all wins by current champion since they won the belt
-        # This includes both belt change games and regular wins
-        all_games = games.sort_values('date', ascending=True)
+    def is_champion_provisional(self) -> bool:
+        """Whether the current reign relies on results not yet in the games sheet"""
+        reign = self.get_reign_leaderboard().current
+        return bool(reign and reign.get('provisional'))
 
-        # Get all games after the reign started, but only completed games (in the past)
-        now = datetime.now()
-        games_since_reign_start = all_games[
-            (all_games['date'] >= reign_start) &
-            (all_games['date'] <= now)
-        ]
-
-        # Count wins by the champion (excluding the initial win that started the reign)
-        defenses = 0
-        for idx, game in games_since_reign_start.iterrows():
-            if game['winner_id'] == current_champion:
-                if game['date'] > reign_start:  # Don't count the initial win
-                    defenses += 1
-            elif game['loser_id'] == current_champion:
-                # Champion lost - reign is over, but this shouldn't happen if data is correct
-                break
-
-        return current_champion, reign_start, defenses
+    def get_schedule_index(self) -> ScheduleIndex:
+        """Get the per-team schedule index, reloading the schedule if it's due"""
+        self.fetch_schedule()
+        return self.schedule_index
 
     def get_next_belt_game(self) -> Optional[Dict]:
         """Get the next scheduled belt game"""
@@ -186,48 +337,29 @@ class BeltDataFetcher:
         if not champion:
             return None
 
-        schedule = self.fetch_schedule()
-        if schedule.empty:
-            return None
-
-        # Filter to future games involving champion
-        now = datetime.now()
-        future_games = schedule[
-            (schedule['start_date'] > now) &
-            (schedule['completed'] == False) &
-            ((schedule['home_id'] == champion) | (schedule['away_id'] == champion))
-        ]
-
-        if future_games.empty:
+        next_game = self.get_schedule_index().next_game(champion, utc_now())
+        if next_game is None:
             return None
 
-        # Get earliest game
-        next_game = future_games.sort_values('start_date').iloc[0]
-
-        # Convert IDs to strings for school lookup
-        home_id = str(int(next_game['home_id'])) if pd.notna(next_game['home_id']) else None
-        away_id = str(int(next_game['away_id'])) if pd.notna(next_game['away_id']) else None
-        champion_str = str(int(champion)) if pd.notna(champion) else None
-
-        opponent = away_id if home_id == champion_str else home_id
-        location = next_game['venue'] if pd.notna(next_game['venue']) else 'TBD'
-
         return {
             'date': next_game['start_date'],
-            'opponent_id': opponent,
-            'opponent_name': self.get_school_name(opponent),
-            'location': location,
-            'week': next_game.get('week', 'TBD'),
-            'home_id': home_id,
-            'away_id': away_id,
-            'home_name': self.get_school_name(home_id),
-            'away_name': self.get_school_name(away_id)
+            'opponent_id': next_game['opponent_id'],
+            'opponent_name': self.get_school_name(next_game['opponent_id']),
+            'location': next_game['venue'],
+            'week': next_game['week'],
+            'home_id': next_game['home_id'],
+            'away_id': next_game['away_id'],
+            'home_name': self.get_school_name(next_game['home_id']),
+            'away_name': self.get_school_name(next_game['away_id'])
         }
 
     def get_team_belt_history(self, team_id: str) -> Dict:
         """Get a team's complete belt history"""
-        games = self.fetch_games()
-        if games.empty:
+        self.get_reign_leaderboard()  # Reloads the games and the history cache if due
+
+        # Teams that never held the belt aren't in the cache
+        history = self.team_histories.get(int(team_id))
+        if history is None:
             return {
                 'total_reigns': 0,
                 'total_days': 0,
@@ -238,71 +370,26 @@ class BeltDataFetcher:
                 'last_lost_to': None
             }
 
-        # Convert team_id to int for comparison with pandas data
-        team_id_int = int(team_id)
-
-        # Trace through all games chronologically to find this team's belt history
-        all_games_sorted = games.sort_values('date')
-
-        total_reigns = 0
-        total_days = 0
-        total_defenses = 0
-        best_reign_days = 0
-        last_held = None
-        last_won_from = None
-        last_lost_to = None
-
-        current_champion = None
-        current_reign_start = None
-
-        for idx, game in all_games_sorted.iterrows():
-            # Check if this is a belt change game
-            if pd.notna(game['belt_change']):
-                winner_id = game['winner_id']
-                loser_id = game['loser_id']
-
-                # If team won the belt
-                if winner_id == team_id_int:
-                    total_reigns += 1
-                    current_champion = team_id_int
-                    current_reign_start = game['date']
-                    last_won_from = self.get_school_name(loser_id)
-
-                # If team lost the belt
-                elif loser_id == team_id_int and current_champion == team_id_int:
-                    reign_days = (game['date'] - current_reign_start).days
-                    total_days += reign_days
-                    best_reign_days = max(best_reign_days, reign_days)
-                    last_held = game['date']
-                    last_lost_to = self.get_school_name(winner_id)
-                    current_champion = winner_id
-                    current_reign_start = None
-
-                # Belt changed to someone else
-                else:
-                    current_champion = winner_id
-
-            # Check for defensive wins
-            elif current_champion == team_id_int:
-                if game['winner_id'] == team_id_int:
-                    # Team defended the belt
-                    total_defenses += 1
+        total_days = history['total_days']
+        best_reign_days = history['best_reign_days']
+        last_held = history['last_held']
 
         # If team currently holds the belt
-        if current_champion == team_id_int and current_reign_start is not None:
-            reign_days = (datetime.now() - current_reign_start).days
+        if history['reign_start'] is not None:
+            now = datetime.now()
+            reign_days = (now - history['reign_start']).days
             total_days += reign_days
             best_reign_days = max(best_reign_days, reign_days)
-            last_held = datetime.now()
+            last_held = now
 
         return {
-            'total_reigns': total_reigns,
+            'total_reigns': history['total_reigns'],
             'total_days': total_days,
-            'total_defenses': total_defenses,
+            'total_defenses': history['total_defenses'],
             'best_reign_days': best_reign_days,
             'last_held': last_held,
-            'last_won_from': last_won_from,
-            'last_lost_to': last_lost_to
+            'last_won_from': self.get_school_name(history['last_won_from_id']) if history['last_won_from_id'] is not None else None,
+            'last_lost_to': self.get_school_name(history['last_lost_to_id']) if history['last_lost_to_id'] is not None else None
         }
 
     def get_overall_stats(self) -> Dict:
@@ -311,37 +398,12 @@ class BeltDataFetcher:
         if games.empty:
             return {}
 
-        # Games where belt changed hands
-        belt_change_games = games[games['belt_change'].notna()]
-        total_belt_changes = len(belt_change_games)
-
-        # Now trace through ALL games chronologically to count belt games and defenses
-        all_games_sorted = games.sort_values('date')
-
-        current_champion = None
-        total_belt_games = 0
-        total_defenses = 0
-        start_date = None
-
-        for idx, game in all_games_sorted.iterrows():
-            # Check if this is a belt change game
-            if pd.notna(game['belt_change']):
-                # Belt changed hands
-                total_belt_games += 1
-                current_champion = game['winner_id']
-
-                if start_date is None:
-                    start_date = game['date']
-            elif current_champion is not None:
-                # Check if current champion played
-                if game['winner_id'] == current_champion:
-                    # Champion won - this is a defense
-                    total_belt_games += 1
-                    total_defenses += 1
-                elif game['loser_id'] == current_champion:
-                    # Champion lost - belt should have changed, but might be missing data
-                    # This shouldn't happen in clean data
-                    pass
+        belt_game = classified(games)['belt_game']
+        changes = games['date'][belt_game == BELT_CHANGE]
+        total_belt_changes = len(changes)
+        total_defenses = int((belt_game == BELT_DEFENSE).sum())
+        total_belt_games = total_belt_changes + total_defenses
+        start_date = min(changes) if total_belt_changes else None
 
         return {
             'total_games': total_belt_games,
@@ -351,13 +413,29 @@ class BeltDataFetcher:
             'days_since_start': (datetime.now() - start_date).days if start_date else 0
         }
 
+    def get_season_stats(self, season: int) -> Optional[Dict]:
+        """Belt aggregates for a season (games before July count toward the season before)"""
+        self.get_reign_leaderboard()  # Reloads the games and the cubes if due
+        return self.cubes.season(season)
+
+    def get_decade_stats(self, decade: int) -> Optional[Dict]:
+        """Belt aggregates for the decade starting at `decade`"""
+        self.get_reign_leaderboard()
+        return self.cubes.decade(decade)
+
+    def get_conference_stats(self, conference: str) -> Optional[Dict]:
+        """Belt aggregates for a conference's current members"""
+        self.get_reign_leaderboard()
+        return self.cubes.conference(conference)
+
     def get_games_on_this_day(self, month: int, day: int) -> List[Dict]:
-        """Get belt games that happened on this date in history"""
+        """Get belt games (changes and defenses) that happened on this date in history"""
         games = self.fetch_games()
         if games.empty:
             return []
 
-        belt_games = games[games['belt_change'].notna()].copy()
+        games = classified(games)
+        belt_games = games[games['belt_game'].isin((BELT_CHANGE, BELT_DEFENSE))]
 
         # Filter to games on this month/day
         matching_games = []
@@ -366,6 +444,7 @@ class BeltDataFetcher:
                 matching_games.append({
                     'date': game['date'],
                     'year': game['date'].year,
+                    'result': game['belt_game'],
                     'winner_id': game['winner_id'],
                     'winner_name': self.get_school_name(game['winner_id']),
                     'loser_id': game['loser_id'],
@@ -376,170 +455,233 @@ class BeltDataFetcher:
 
         return sorted(matching_games, key=lambda x: x['year'], reverse=True)
 
+    def chase_key(self) -> Optional[Tuple[int, int]]:
+        """What the belt chase depends on: (data version, champion), or None without a champion"""
+        self.get_schedule_index()  # Reload first so the version is current
+        champion_id, _, _ = self.get_current_champion()
+        return (self.data_version, int(champion_id)) if champion_id else None
+
+    def has_chase(self, key: Tuple[int, int]) -> bool:
+        return self._chase_cache[0] == key
+
+    def _chase_teams(self, paths: List[Tuple[int, int, int]]) -> List[Dict]:
+        return [{
+            'team_id': team_id,
+            'name': self.get_school_name(team_id),
+            'games_away': games_away,
+            'earliest_week': earliest_week
+        } for team_id, games_away, earliest_week in paths]
+
+    def store_chase(self, key: Tuple[int, int], paths: List[Tuple[int, int, int]]):
+        """Keep a belt chase computed elsewhere (e.g. in a ChaseWorker) for `key`"""
+        self._chase_cache = (key, self._chase_teams(paths))
+
+    def get_chase_engine(self) -> ChaseEngine:
+        """The memoized chase engine for the current schedule, rebuilt once a game kicks off"""
+        index = self.get_schedule_index()
+        now = utc_now()
+        if self._chase_engine is None or not self._chase_engine.usable_for(index, now):
+            self._chase_engine = ChaseEngine(index, now)
+        return self._chase_engine
+
     def compute_belt_chase_teams(self) -> List[Dict]:
         """
         Compute all teams that can still win the belt this season.
         Returns list of teams with their earliest path to the belt.
+        Reuses the last result until the data version or champion changes.
         """
-        champion_id, _, _ = self.get_current_champion()
-        if not champion_id:
-            return []
-
-        schedule = self.fetch_schedule()
-        if schedule.empty:
+        key = self.chase_key()
+        if key is None:
             return []
 
-        # Filter to incomplete games only
-        now = datetime.now()
-        upcoming_games = schedule[
-            (schedule['completed'] == False) &
-            (schedule['start_date'] > now) &
-            (schedule['home_id'].notna()) &
-            (schedule['away_id'].notna())
-        ].copy()
+        if not self.has_chase(key):
+            self.store_chase(key, self.get_chase_engine().chase(key[1]))
+        return self._chase_cache[1]
 
-        if upcoming_games.empty:
-            return []
-
-        # Convert IDs to int for comparison
-        champion_id_int = int(champion_id)
-
-        # Build a map of team -> their upcoming games
-        from collections import defaultdict
-        team_games = defaultdict(list)
-
-        for idx, game in upcoming_games.iterrows():
-            home_id = int(game['home_id'])
-            away_id = int(game['away_id'])
-            week = int(game['week']) if pd.notna(game['week']) else 999
-
-            game_info = {
-                'week': week,
-                'home_id': home_id,
-                'away_id': away_id
-            }
-
-            team_games[home_id].append(game_info)
-            team_games[away_id].append(game_info)
+    def what_if(self, winner_id: int, loser_id: int) -> Optional[Dict]:
+        """
+        The belt chase if `winner_id` beats `loser_id` in their next
+        scheduled game. Only chase states before that game's week are
+        searched again; later ones come from the engine's memo.
 
-        # Sort each team's games by week
-        for team_id in team_games:
-            team_games[team_id].sort(key=lambda x: x['week'])
+        Returns None without a champion; 'game' is None if the teams
+        don't play again.
+        """
+        champion_id, _, _ = self.get_current_champion()
+        if not champion_id:
+            return None
+        champion_id = int(champion_id)
 
-        # BFS to find all possible paths to the belt
-        belt_paths = {}
-        queue = [{
-            'holder': champion_id_int,
-            'week': 0,
-            'games_deep': 0
-        }]
+        index = self.get_schedule_index()
+        engine = self.get_chase_engine()
+        game = index.next_game_between(winner_id, loser_id, engine.now)
+        if game is None:
+            return {'game': None, 'champion_id': champion_id}
 
-        visited = set()
+        # The belt is on the line if this is the champion's next game
+        next_belt_game = index.next_game(champion_id, engine.now)
+        return {
+            'game': game,
+            'champion_id': champion_id,
+            'belt_game': next_belt_game is not None and next_belt_game['row'] == game['row'],
+            'chase': self._chase_teams(engine.chase(champion_id)),
+            'what_if_chase': self._chase_teams(engine.chase(champion_id, {game['row']: winner_id}))
+        }
 
-        while queue:
-            state = queue.pop(0)
-            holder = state['holder']
-            week = state['week']
-            games_deep = state['games_deep']
+    def season_chase_jobs(self) -> List[SeasonJob]:
+        """Seasons to replay since the games were last checked (e.g. to run in a ChaseWorker)"""
+        games = self.fetch_games()
+        if games is self._chase_history_source:
+            return []
+        self._chase_history_source = games
+        return self.chase_history.pending(games)
+
+    def store_season_chases(self, jobs: List[SeasonJob], results: List[Dict]):
+        self.chase_history.store(jobs, results)
+
+    def get_season_chases(self) -> Dict[str, Dict]:
+        """Every season's pre-season chase and actual path, replaying any seasons not done yet"""
+        jobs = self.chase_history.pending(self.fetch_games())
+        if jobs:
+            started = time.perf_counter()
+            self.store_season_chases(jobs, replay_seasons(jobs, config.CHASE_WORKERS))
+            log_event(logger, 'season_chases_computed', seasons=len(jobs), workers=config.CHASE_WORKERS,
+                      latency_ms=round((time.perf_counter() - started) * 1000))
+        return self.chase_history.as_json()
+
+    def get_season_chase(self, season: int) -> Optional[Dict]:
+        """A season's replayed chase, if it has been replayed"""
+        return self.chase_history.season(season)
+
+    def _load_lineage(self, games: pd.DataFrame, reigns: List[Dict]):
+        """
+        Rebuild the leaderboard and team histories from the sheet, then re-apply
+        unconfirmed results. Callers bump data_version if the content changed.
+        """
+        self.leaderboard.rebuild(reigns)
+        self.team_histories = build_team_histories(games)
+        self.fetch_schools()  # Conferences for the cubes
+        self.cubes = BeltCubes(classified(games), reigns, self.school_conferences)
+        self._leaderboard_source = games
+        self._reconcile_provisional_results(games)
+        for result in self.provisional_results:
+            self.leaderboard.record_result(result['winner_id'], result['loser_id'], result['date'], provisional=True)
+
+    def get_reign_leaderboard(self) -> ReignLeaderboard:
+        """Get the reign leaderboard, rebuilding it only when games were reloaded"""
+        games = self.fetch_games()
+        if games is not self._leaderboard_source:
+            self._load_lineage(games, [] if games.empty else build_reigns(games))
+        self._check_scores_feed()
+        return self.leaderboard
 
-            state_key = f"{holder}-{week}"
-            if state_key in visited:
+    def record_provisional_result(self, winner_id: int, loser_id: int, date: Optional[datetime] = None,
+                                  winner_score: Optional[int] = None, loser_score: Optional[int] = None) -> bool:
+        """
+        Apply a final score (e.g. from a postgame thread) before the games sheet has it.
+        The result stays provisional until a sheet refresh contains the same game;
+        results the loaded sheet already has, or already recorded, are skipped.
+        Returns True if the result involved the belt holder.
+        """
+        date = date or datetime.now()
+        leaderboard = self.get_reign_leaderboard()
+        if self._in_sheet(self.games_cache, winner_id, loser_id, date):
+            return False  # Already counted by the sheet
+        for result in self.provisional_results:
+            if (result['winner_id'], result['loser_id']) == (winner_id, loser_id) and \
+                    abs(result['date'] - date) <= PROVISIONAL_MATCH_WINDOW:
+                return False
+
+        self.provisional_results.append({
+            'winner_id': winner_id,
+            'loser_id': loser_id,
+            'date': date,
+            'winner_score': winner_score,
+            'loser_score': loser_score
+        })
+        self.provisional_results.sort(key=lambda result: result['date'])
+        applied = leaderboard.record_result(winner_id, loser_id, date, provisional=True)
+        if applied:
+            self.data_version += 1
+        return applied
+
+    def _reconcile_provisional_results(self, games: pd.DataFrame):
+        """Drop provisional results the sheet now has, or that it never confirmed"""
+        if not self.provisional_results:
+            return
+
+        cutoff = datetime.now() - timedelta(days=config.PROVISIONAL_RESULT_DAYS)
+        pending = []
+        for result in self.provisional_results:
+            if result['date'] < cutoff:
+                log_event(logger, 'provisional_result_dropped', logging.WARNING, winner_id=result['winner_id'],
+                          loser_id=result['loser_id'], date=result['date'])
                 continue
-            visited.add(state_key)
-
-            # Find the next game for the current belt holder
-            holder_games = team_games.get(holder, [])
-            next_game = None
-            for game in holder_games:
-                if game['week'] > week:
-                    next_game = game
-                    break
-
-            if not next_game:
-                # No more games for this holder
+            if self._in_sheet(games, result['winner_id'], result['loser_id'], result['date']):
                 continue
+            pending.append(result)
+        self.provisional_results = pending
+
+    @staticmethod
+    def _in_sheet(games: Optional[pd.DataFrame], winner_id: int, loser_id: int, date: datetime) -> bool:
+        """Whether the games sheet has this result, within PROVISIONAL_MATCH_WINDOW of `date`"""
+        if games is None or games.empty:
+            return False
+        return bool((
+            (games['winner_id'] == winner_id) &
+            (games['loser_id'] == loser_id) &
+            (games['date'] >= date - PROVISIONAL_MATCH_WINDOW) &
+            (games['date'] <= date + PROVISIONAL_MATCH_WINDOW)
+        ).any())
+
+    def _check_scores_feed(self):
+        """Pick up new results from the local scores feed file, if configured"""
+        if not config.SCORES_FEED_PATH:
+            return
 
-            game_week = next_game['week']
-            opponent = next_game['away_id'] if next_game['home_id'] == holder else next_game['home_id']
-
-            # Scenario 1: Opponent wins (gets the belt)
-            if opponent not in belt_paths:
-                belt_paths[opponent] = {
-                    'team_id': opponent,
-                    'name': self.get_school_name(str(opponent)),
-                    'games_away': games_deep + 1,
-                    'earliest_week': game_week
-                }
-            else:
-                # Update if this is an earlier path
-                if games_deep + 1 < belt_paths[opponent]['games_away']:
-                    belt_paths[opponent]['games_away'] = games_deep + 1
-                if game_week < belt_paths[opponent]['earliest_week']:
-                    belt_paths[opponent]['earliest_week'] = game_week
-
-            # Continue the path if opponent wins
-            queue.append({
-                'holder': opponent,
-                'week': game_week,
-                'games_deep': games_deep + 1
-            })
-
-            # Scenario 2: Current holder wins (keeps the belt)
-            queue.append({
-                'holder': holder,
-                'week': game_week,
-                'games_deep': games_deep
-            })
-
-        return list(belt_paths.values())
-
-    def get_longest_reigns(self, limit: int = 10) -> List[Dict]:
-        """Get the longest belt reigns in history"""
-        games = self.fetch_games()
-        if games.empty:
-            return []
+        try:
+            mtime = os.path.getmtime(config.SCORES_FEED_PATH)
+        except OSError:
+            return
+        if mtime == self._scores_feed_mtime:
+            return
+        self._scores_feed_mtime = mtime
 
-        belt_games = games[games['belt_change'].notna()].sort_values('date')
+        try:
+            with open(config.SCORES_FEED_PATH, newline='') as feed:
+                for row in csv.DictReader(feed):
+                    self.record_provisional_result(
+                        int(row['winner_id']),
+                        int(row['loser_id']),
+                        date_parser.parse(row['date']),
+                        int(row['winner_score']) if row.get('winner_score') else None,
+                        int(row['loser_score']) if row.get('loser_score') else None
+                    )
+        except Exception:
+            log_event(logger, 'scores_feed_failed', logging.ERROR, exc_info=True, path=config.SCORES_FEED_PATH)
+
+    def _reign_summary(self, reign: Dict) -> Dict:
+        summary = {
+            'champion_id': reign['champion_id'],
+            'champion_name': self.get_school_name(reign['champion_id']),
+            'start_date': reign['start_date'],
+            'end_date': reign['end_date'],
+            'days': reign['days'],
+            'defenses': reign['defenses']
+        }
+        if reign.get('current'):
+            summary['current'] = True
+        return summary
 
-        reigns = []
-        current_champion = None
-        reign_start = None
+    def get_longest_reigns(self, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+        """Get the longest belt reigns in history"""
+        leaderboard = self.get_reign_leaderboard()
+        return [self._reign_summary(reign) for reign in leaderboard.top_by_days(limit, now)]
 
-        for idx, game in belt_games.iterrows():
-            winner = game['winner_id']
-            game_date = game['date']
-
-            if current_champion != winner:
-                # New reign starting
-                if current_champion is not None and reign_start is not None:
-                    # End previous reign
-                    reign_days = (game_date - reign_start).days
-                    reigns.append({
-                        'champion_id': current_champion,
-                        'champion_name': self.get_school_name(current_champion),
-                        'start_date': reign_start,
-                        'end_date': game_date,
-                        'days': reign_days
-                    })
-
-                current_champion = winner
-                reign_start = game_date
-
-        # Add current reign if ongoing
-        if current_champion is not None and reign_start is not None:
-            reign_days = (datetime.now() - reign_start).days
-            reigns.append({
-                'champion_id': current_champion,
-                'champion_name': self.get_school_name(current_champion),
-                'start_date': reign_start,
-                'end_date': None,
-                'days': reign_days,
-                'current': True
-            })
-
-        # Sort by days and return top N
-        reigns.sort(key=lambda x: x['days'], reverse=True)
-        return reigns[:limit]
+    def get_most_defended_reigns(self, limit: int = 10) -> List[Dict]:
+        """Get the reigns with the most defenses in history"""
+        leaderboard = self.get_reign_leaderboard()
+        return [self._reign_summary(reign) for reign in leaderboard.top_by_defenses(limit)]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,165 @@
+"""Cursor-based ingestion of Reddit listings"""
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from log import log_event
+
+logger = logging.getLogger(__name__)
+
+
+class ListingCursor:
+    """
+    Walks a Reddit listing forward from the newest item already seen.
+
+    Each poll pages with the fullname-based `before` parameter, so every
+    item posted since the last poll is returned exactly once, oldest first,
+    no matter how many arrived in between.
+
+    `fetch_page` takes a params dict and returns one page of items,
+    newest first (e.g. `reddit.get('r/CFB/new', params=params)`).
+
+    Items created before `since` (a Unix timestamp) are skipped, which
+    bounds how far back a fresh start or a restore from a checkpoint reaches.
+    """
+
+    def __init__(self, fetch_page: Callable[[Dict], List], page_size: int = 100,
+                 resync_every: int = 10, max_pages: int = 10, since: Optional[float] = None):
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.resync_every = resync_every  # Empty polls before checking the cursor is still live
+        self.max_pages = max_pages  # Pages per poll; the rest is picked up next poll
+        self.since = since
+        self.cursor = None
+        self.cursor_time = None  # created_utc of the cursor item
+        self._empty_polls = 0
+        self._restored = False
+        self._seen = set()
+        self._seen_order = deque()
+
+    def checkpoint(self) -> Optional[Dict]:
+        """The cursor position to persist, or None before the first item"""
+        if self.cursor is None:
+            return None
+        return {'fullname': self.cursor, 'created_utc': self.cursor_time}
+
+    def restore(self, checkpoint: Dict, max_age: Optional[float] = None):
+        """
+        Resume from a persisted checkpoint. Catch-up skips anything older
+        than the checkpoint, or than `max_age` seconds if that is later.
+        """
+        self.cursor = checkpoint['fullname']
+        self.cursor_time = checkpoint.get('created_utc')
+        self._restored = True
+        self._mark_seen_name(self.cursor)
+        since = self.cursor_time
+        if max_age is not None:
+            since = max(since or 0, time.time() - max_age)
+        if since is not None:
+            self.since = since
+
+    def _mark_seen(self, item) -> bool:
+        """Record an item, returning False if it was already seen or is too old"""
+        if not self._mark_seen_name(item.fullname):
+            return False
+        created = getattr(item, 'created_utc', None)
+        return self.since is None or created is None or created >= self.since
+
+    def _mark_seen_name(self, fullname: str) -> bool:
+        if fullname in self._seen:
+            return False
+        self._seen.add(fullname)
+        self._seen_order.append(fullname)
+        if len(self._seen_order) > self.page_size * self.max_pages:
+            self._seen.discard(self._seen_order.popleft())
+        return True
+
+    def _newest_pages(self) -> List:
+        """Page back from the newest item until reaching one already seen"""
+        items = []
+        params = {'limit': self.page_size}
+        for _ in range(self.max_pages):
+            page = list(self.fetch_page(params))
+            if not page:
+                break
+            items.extend(page)
+            if len(page) < self.page_size or any(item.fullname in self._seen for item in page):
+                break
+            params = {'limit': self.page_size, 'after': page[-1].fullname}
+        items.reverse()
+        return items
+
+    def _pages_since(self, cursor: str) -> List:
+        items = []
+        for _ in range(self.max_pages):
+            page = list(self.fetch_page({'limit': self.page_size, 'before': cursor}))
+            if not page:
+                break
+            page.reverse()
+            items.extend(page)
+            cursor = page[-1].fullname
+            if len(page) < self.page_size:
+                break
+        return items
+
+    def poll(self) -> List:
+        """Return every item posted since the last poll, oldest first"""
+        if self.cursor is None:
+            items = self._newest_pages()
+        else:
+            items = self._pages_since(self.cursor)
+            if items:
+                self._empty_polls = 0
+            else:
+                # `before` returns nothing forever if the cursor item was
+                # deleted, so periodically re-anchor on the newest page.
+                # After a restore, check straight away: the checkpointed
+                # item may have been removed while the bot was down.
+                self._empty_polls += 1
+                if self._restored or self._empty_polls >= self.resync_every:
+                    self._empty_polls = 0
+                    items = self._newest_pages()
+        self._restored = False
+
+        new_items = [item for item in items if self._mark_seen(item)]
+        if items:
+            self.cursor = items[-1].fullname
+            self.cursor_time = getattr(items[-1], 'created_utc', None)
+        return new_items
+
+
+class CheckpointStore:
+    """
+    Listing cursors persisted to a small JSON file, written atomically
+    (temp file + rename) so a crash mid-write never corrupts it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.checkpoints = {}
+        try:
+            with open(path) as f:
+                self.checkpoints = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log_event(logger, 'checkpoint_unreadable', logging.WARNING, path=path, error=str(e))
+
+    def get(self, stream: str) -> Optional[Dict]:
+        return self.checkpoints.get(stream)
+
+    def save(self, stream: str, checkpoint: Optional[Dict]):
+        """Persist a stream's checkpoint if it moved"""
+        if checkpoint is None or self.checkpoints.get(stream) == checkpoint:
+            return
+        self.checkpoints[stream] = checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoints, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
@@ -0,0 +1,128 @@
+"""Incrementally maintained leaderboard of belt reigns"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sortedcontainers import SortedList
+
+
+class ReignLeaderboard:
+    """
+    Keeps completed reigns in sorted order by days and by defenses so the
+    current reign's rank and top-K lists are a bisect away instead of a
+    full rebuild and sort. The orders are SortedLists, so adding a reign
+    is O(log n) too.
+
+    Reigns are dicts with champion_id, start_date, end_date and defenses.
+    Ties rank the earlier reign first, matching the old sort order.
+    """
+
+    def __init__(self, reigns: Optional[List[Dict]] = None):
+        self.rebuild(reigns or [])
+
+    def rebuild(self, reigns: List[Dict]):
+        """Reset the leaderboard from a chronological list of reigns"""
+        self._completed = []  # seq -> reign
+        self._by_days = SortedList()  # (-days, seq)
+        self._by_defenses = SortedList()  # (-defenses, seq)
+        self.current = None
+
+        for reign in reigns:
+            if reign.get('end_date') is None:
+                self.current = dict(reign)
+            else:
+                self._add_completed(dict(reign))
+
+    def _add_completed(self, reign: Dict):
+        seq = len(self._completed)
+        reign['days'] = (reign['end_date'] - reign['start_date']).days
+        self._completed.append(reign)
+        self._by_days.add((-reign['days'], seq))
+        self._by_defenses.add((-reign['defenses'], seq))
+
+    def start_reign(self, champion_id, start_date: datetime):
+        """Close the current reign and start a new one"""
+        if self.current is not None:
+            finished = self.current
+            finished['end_date'] = start_date
+            self._add_completed(finished)
+
+        self.current = {
+            'champion_id': champion_id,
+            'start_date': start_date,
+            'end_date': None,
+            'defenses': 0
+        }
+
+    def record_defense(self):
+        """Count a successful defense for the current reign"""
+        if self.current is not None:
+            self.current['defenses'] += 1
+
+    def record_result(self, winner_id, loser_id, date: datetime, provisional: bool = False) -> bool:
+        """
+        Apply a completed game on top of the current reign.
+        Returns True if the game involved the holder and was applied.
+        """
+        if self.current is None or date <= self.current['start_date']:
+            return False
+
+        if loser_id == self.current['champion_id']:
+            self.start_reign(winner_id, date)
+        elif winner_id == self.current['champion_id']:
+            self.record_defense()
+        else:
+            return False
+
+        if provisional:
+            self.current['provisional'] = True
+        return True
+
+    def _current_days(self, now: Optional[datetime]) -> int:
+        return ((now or datetime.now()) - self.current['start_date']).days
+
+    def _current_entry(self, now: Optional[datetime]) -> Dict:
+        entry = dict(self.current)
+        entry['days'] = self._current_days(now)
+        entry['current'] = True
+        return entry
+
+    def _top(self, keys: SortedList, current_value: Optional[int], limit: int, now: Optional[datetime]) -> List[Dict]:
+        if current_value is None:
+            return [self._completed[seq] for _, seq in keys[:limit]]
+
+        # Current reign ranks after completed reigns it ties with
+        position = keys.bisect_right((-current_value, len(self._completed)))
+        if position >= limit:
+            return [self._completed[seq] for _, seq in keys[:limit]]
+
+        top = [self._completed[seq] for _, seq in keys[:limit - 1]]
+        top.insert(position, self._current_entry(now))
+        return top
+
+    def top_by_days(self, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+        """Longest reigns, including the current one if it qualifies"""
+        current_days = self._current_days(now) if self.current else None
+        return self._top(self._by_days, current_days, limit, now)
+
+    def top_by_defenses(self, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+        """Reigns with the most defenses, including the current one"""
+        current_defenses = self.current['defenses'] if self.current else None
+        return self._top(self._by_defenses, current_defenses, limit, now)
+
+    def current_rank(self, now: Optional[datetime] = None) -> Optional[int]:
+        """All-time rank of the current reign by days held"""
+        if self.current is None:
+            return None
+        days = self._current_days(now)
+        return self._by_days.bisect_right((-days, len(self._completed))) + 1
+
+    def days_until_next_rank(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Days until the current reign passes the reign ranked just above it (ties rank below)"""
+        if self.current is None:
+            return None
+        days = self._current_days(now)
+        position = self._by_days.bisect_right((-days, len(self._completed)))
+        if position == 0:
+            return None
+        next_days = -self._by_days[position - 1][0]
+        return next_days - days + 1
@@ -0,0 +1,166 @@
+"""Shared work ledger so several bot replicas can run side by side"""
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, List
+
+
+class WorkLedger:
+    """
+    SQLite file shared by every replica (on one host or a shared volume).
+
+    - Heartbeats: each replica records itself every loop; replicas that
+      miss `lease_seconds` drop out of the partition.
+    - Partitions: new items are split across live replicas by a hash of
+      their fullname, so replicas don't all do the same work.
+    - Claims: one row per reply/comment/post. A replica claims an item
+      when it queues the work; the claim stays open until `start_send`
+      closes it just before the send, so exactly one replica sends it.
+      An open claim whose replica stopped heartbeating can be taken over,
+      so work a crashed replica had queued still goes out.
+    - Leadership: one replica at a time holds the lease for scheduled jobs.
+    """
+
+    CLAIM_RETENTION = 7 * 24 * 3600  # Claims older than this are pruned
+
+    def __init__(self, path: str, replica_id: str, lease_seconds: float = 90,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.replica_id = replica_id
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self.replicas = [replica_id]
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS replicas (
+                replica_id TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS claims (
+                key TEXT PRIMARY KEY,
+                replica_id TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                sent_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                replica_id TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(claims)")]
+        if 'sent_at' not in columns:
+            # Ledgers from before open claims: every claim there was sent on the spot
+            self._db.execute("ALTER TABLE claims ADD COLUMN sent_at REAL")
+            self._db.execute("UPDATE claims SET sent_at = claimed_at")
+
+    def heartbeat(self) -> List[str]:
+        """Record this replica as alive and refresh the list of live replicas"""
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO replicas (replica_id, seen_at) VALUES (?, ?)",
+                (self.replica_id, now)
+            )
+            rows = self._db.execute(
+                "SELECT replica_id FROM replicas WHERE seen_at >= ? ORDER BY replica_id",
+                (now - self.lease_seconds,)
+            ).fetchall()
+            self._db.execute("DELETE FROM claims WHERE claimed_at < ?", (now - self.CLAIM_RETENTION,))
+        self.replicas = [row[0] for row in rows] or [self.replica_id]
+        return self.replicas
+
+    def owns(self, key: str) -> bool:
+        """Whether `key` falls in this replica's share of the work"""
+        if self.replica_id not in self.replicas:
+            return True
+        index = zlib.crc32(key.encode()) % len(self.replicas)
+        return self.replicas[index] == self.replica_id
+
+    def claim(self, key: str) -> bool:
+        """
+        Atomically claim `key` for this replica. True if it was unclaimed,
+        is already this replica's, or was claimed by a replica whose lease
+        lapsed before sending it; False once sent or while another live
+        replica holds it.
+        """
+        now = self.clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT claims.replica_id, claims.sent_at, replicas.seen_at FROM claims "
+                    "LEFT JOIN replicas ON replicas.replica_id = claims.replica_id WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    claimed = True
+                    self._db.execute(
+                        "INSERT INTO claims (key, replica_id, claimed_at) VALUES (?, ?, ?)",
+                        (key, self.replica_id, now)
+                    )
+                else:
+                    owner, sent_at, seen_at = row
+                    lapsed = seen_at is None or seen_at < now - self.lease_seconds
+                    claimed = sent_at is None and (owner == self.replica_id or lapsed)
+                    if claimed and owner != self.replica_id:
+                        self._db.execute(
+                            "UPDATE claims SET replica_id = ?, claimed_at = ? WHERE key = ?",
+                            (self.replica_id, now, key)
+                        )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def start_send(self, key: str) -> bool:
+        """Close this replica's claim on `key` right before sending; False if it's no longer ours to send"""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE claims SET sent_at = ? WHERE key = ? AND replica_id = ? AND sent_at IS NULL",
+                (self.clock(), key, self.replica_id)
+            )
+        return cursor.rowcount == 1
+
+    def abort_send(self, key: str):
+        """Reopen a claim whose send failed, so it can be retried"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE claims SET sent_at = NULL WHERE key = ? AND replica_id = ?", (key, self.replica_id)
+            )
+
+    def is_done(self, key: str) -> bool:
+        """Whether `key` has been sent (or settled without a send)"""
+        with self._lock:
+            row = self._db.execute("SELECT sent_at FROM claims WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] is not None
+
+    def is_leader(self, name: str = 'scheduler') -> bool:
+        """Take or renew the `name` lease; True if this replica holds it"""
+        now = self.clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT replica_id, expires_at FROM leases WHERE name = ?", (name,)
+                ).fetchone()
+                leader = row is None or row[0] == self.replica_id or row[1] < now
+                if leader:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO leases (name, replica_id, expires_at) VALUES (?, ?, ?)",
+                        (name, self.replica_id, now + self.lease_seconds)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return leader
+
+    def leave(self):
+        """Drop out of the partition and give up any leases on shutdown"""
+        with self._lock:
+            self._db.execute("DELETE FROM replicas WHERE replica_id = ?", (self.replica_id,))
+            self._db.execute("DELETE FROM leases WHERE replica_id = ?", (self.replica_id,))
@@ -0,0 +1,216 @@
+"""Replay the belt lineage from the games sheet"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Values of the 'belt_game' column the builder adds to each game
+NOT_BELT_GAME = 'not_belt'
+BELT_DEFENSE = 'defense'
+BELT_CHANGE = 'change'
+
+
+def date_array(dates: pd.Series) -> np.ndarray:
+    """
+    Dates as datetime64[us], which (unlike pandas' nanosecond Timestamps)
+    covers every year the sheet could hold
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.to_numpy().astype('datetime64[us]')
+    return np.array(dates.tolist(), dtype='datetime64[us]')
+
+
+class LineageBuilder:
+    """
+    Builds the chronological list of reigns from games fed in chunks.
+
+    Chunks are expected in date order, which is how the sheet is kept.
+    If a chunk goes back in time the builder flags itself as out of order
+    and the caller should replay the full, sorted frame instead.
+
+    Each chunk is replayed with array operations rather than row by row:
+    belt change rows whose winner differs from the previous change start
+    reigns, a cumulative sum over those starts labels every game with its
+    reign, and defenses are a grouped count of the holder's wins.
+
+    Every game comes back classified, so nothing downstream has to replay
+    the lineage again:
+      belt_game      'change' (started a reign), 'defense' (the holder won
+                     after the reign started) or 'not_belt'. A holder loss
+                     the sheet doesn't mark as a change is 'not_belt'; the
+                     sheet's belt_change column is authoritative.
+      holder_before  Belt holder going into the game (NA before 1869)
+      holder_after   Belt holder coming out of it
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.now = now or datetime.now()
+        self.reigns = []
+        self.current = None
+        self.last_date = None
+        self.out_of_order = False
+
+    def feed(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Replay a chunk of games, returning it with the classification columns"""
+        if chunk.empty or self.out_of_order:
+            return chunk
+
+        games = chunk.sort_values('date', kind='mergesort')
+        first_date = games['date'].iloc[0]
+        if self.last_date is not None and first_date < self.last_date:
+            self.out_of_order = True
+            return chunk
+        self.last_date = games['date'].iloc[-1]
+
+        dates = date_array(games['date'])
+        winners = games['winner_id'].to_numpy(dtype=np.int64)
+        belt_change = games['belt_change'].notna().to_numpy()
+
+        # A belt change row starts a reign unless the holder won it again
+        change_rows = np.flatnonzero(belt_change)
+        change_winners = winners[change_rows]
+        previous = np.empty_like(change_winners)
+        if len(previous):
+            previous[0] = self.current['champion_id'] if self.current is not None else -1
+            previous[1:] = change_winners[:-1]
+        start_rows = change_rows[change_winners != previous]
+
+        # Reign of every game; the reign carried over from earlier chunks is 0
+        carried = 1 if self.current is not None else 0
+        is_start = np.zeros(len(games), dtype=bool)
+        is_start[start_rows] = True
+        reign_of = np.cumsum(is_start) - 1 + carried
+
+        champions = winners[start_rows]
+        start_dates = dates[start_rows]
+        if carried:
+            champions = np.concatenate(([self.current['champion_id']], champions))
+            start_dates = np.concatenate(([np.datetime64(self.current['start_date'], 'us')], start_dates))
+
+        if not len(champions):
+            # No holder yet
+            return self._classify(chunk, games, np.zeros(len(games), dtype=bool), is_start,
+                                  np.full(len(games), -1), np.full(len(games), -1))
+
+        # Wins by the holder after the reign started are defenses
+        held = reign_of >= 0
+        reign = np.where(held, reign_of, 0)
+        defended = held & (winners == champions[reign]) & (dates > start_dates[reign]) & \
+            (dates <= np.datetime64(self.now, 'us'))
+        defenses = np.bincount(reign[defended], minlength=len(champions))
+
+        # Holders around each game; a reign's first game came from the one before
+        holder_after = np.where(held, champions[reign], -1)
+        before = reign_of - is_start
+        holder_before = np.where(before >= 0, champions[np.maximum(before, 0)], -1)
+
+        if carried:
+            self.current['defenses'] += int(defenses[0])
+
+        start_values = games['date'].iloc[start_rows].tolist()
+        for i, start_date in enumerate(start_values):
+            if self.current is not None:
+                self.current['end_date'] = start_date
+            self.current = {
+                'champion_id': int(champions[i + carried]),
+                'start_date': start_date,
+                'end_date': None,
+                'defenses': int(defenses[i + carried])
+            }
+            self.reigns.append(self.current)
+
+        return self._classify(chunk, games, defended, is_start, holder_before, holder_after)
+
+    @staticmethod
+    def _classify(chunk: pd.DataFrame, games: pd.DataFrame, defended: np.ndarray, is_start: np.ndarray,
+                  holder_before: np.ndarray, holder_after: np.ndarray) -> pd.DataFrame:
+        """Add the classification columns (computed in date order) to the chunk as given"""
+        belt_game = np.where(is_start, BELT_CHANGE, np.where(defended, BELT_DEFENSE, NOT_BELT_GAME))
+        chunk = chunk.copy()
+        chunk['belt_game'] = pd.Series(belt_game, index=games.index)
+        for column, holders in (('holder_before', holder_before), ('holder_after', holder_after)):
+            chunk[column] = pd.Series(holders, index=games.index).astype('Int64').replace(-1, pd.NA)
+        return chunk
+
+    def finish(self) -> List[Dict]:
+        """Return the reigns replayed so far"""
+        return self.reigns
+
+
+def replay(games: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Replay a complete games frame: the classified games and the chronological reigns"""
+    builder = LineageBuilder()
+    games = builder.feed(games)
+    return games, builder.finish()
+
+
+def build_reigns(games: pd.DataFrame) -> List[Dict]:
+    """Replay a complete games frame into a chronological list of reigns"""
+    return replay(games)[1]
+
+
+def classified(games: pd.DataFrame) -> pd.DataFrame:
+    """`games` with the classification columns, replaying only if they're missing"""
+    return games if games.empty or 'belt_game' in games else replay(games)[0]
+
+
+def build_team_histories(games: pd.DataFrame) -> Dict[int, Dict]:
+    """
+    Every team's belt history from the classified games, for each team
+    that has ever won the belt: reigns from the change rows, defenses from
+    the defense rows.
+
+    The current holder's open reign is left in 'reign_start' so its days
+    can be counted at query time.
+    """
+    if games.empty:
+        return {}
+
+    games = classified(games).sort_values('date', kind='mergesort')
+    belt_game = games['belt_game'].to_numpy()
+    winners = games['winner_id'].to_numpy(dtype=np.int64)
+
+    defense_teams, defense_counts = np.unique(winners[belt_game == BELT_DEFENSE], return_counts=True)
+    defenses = dict(zip(defense_teams.tolist(), defense_counts.tolist()))
+
+    histories = {}
+    holder = None
+    changes = games[belt_game == BELT_CHANGE]
+    lost_by = changes['holder_before'].astype(object).where(changes['holder_before'].notna(), None)
+    for date, winner_id, loser_id, previous in zip(changes['date'].tolist(), changes['winner_id'].tolist(),
+                                                   changes['loser_id'].tolist(), lost_by.tolist()):
+        history = histories.get(winner_id)
+        if history is None:
+            history = histories[winner_id] = {
+                'total_reigns': 0,
+                'total_days': 0,
+                'total_defenses': defenses.get(winner_id, 0),
+                'best_reign_days': 0,
+                'last_held': None,
+                'last_won_from_id': None,
+                'last_lost_to_id': None,
+                'reign_start': None
+            }
+        history['total_reigns'] += 1
+        history['reign_start'] = date
+        history['last_won_from_id'] = loser_id
+
+        # The holder going into the game lost the belt
+        if previous is not None and previous in histories:
+            lost = histories[previous]
+            reign_days = (date - lost['reign_start']).days
+            lost['total_days'] += reign_days
+            lost['best_reign_days'] = max(lost['best_reign_days'], reign_days)
+            lost['last_held'] = date
+            lost['last_lost_to_id'] = winner_id
+            lost['reign_start'] = None
+
+        holder = winner_id
+
+    # Only the current holder has a reign still open
+    for team_id, history in histories.items():
+        if team_id != holder:
+            history['reign_start'] = None
+
+    return histories
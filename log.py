@@ -0,0 +1,104 @@
+"""Structured logging: one JSON object per event, written off the main loop"""
+import atexit
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+# Libraries that log every request or job run; only their warnings get through
+QUIET_LOGGERS = ('urllib3', 'prawcore', 'praw', 'apscheduler')
+
+
+class JSONFormatter(logging.Formatter):
+    """{"ts", "level", "logger", "event", ...fields} on one line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_text:
+            entry['traceback'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The same events for a terminal: time, level, event, key=value fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{datetime.fromtimestamp(record.created):%H:%M:%S} {record.levelname:<7} {record.getMessage()}"
+        fields = getattr(record, 'fields', {})
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+def setup_logging(level: str = 'INFO', fmt: str = 'json', stream=None, background: bool = True):
+    """
+    Route every logger through a bounded queue to a writer thread, so a
+    slow stdout never stalls the caller. The writer is flushed at exit.
+    One-shot tools pass `background=False` to write records directly,
+    without starting (or importing) the writer thread.
+    """
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(TextFormatter() if fmt == 'text' else JSONFormatter())
+
+    root = logging.getLogger()
+    listener = None
+    if background:
+        import queue
+        from log_queue import QUEUE_SIZE, DroppingQueueHandler, LogWriter
+        records = queue.Queue(QUEUE_SIZE)
+        listener = LogWriter(records, writer)
+        listener.start()
+        atexit.register(listener.stop)
+        root.handlers = [DroppingQueueHandler(records)]
+    else:
+        root.handlers = [writer]
+    root.setLevel(level.upper())
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return listener
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, exc_info: bool = False, **fields):
+    """Log `event` with structured fields (item_id, command, latency_ms, cache, data_version, ...)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={'fields': fields})
+
+
+class Sampler:
+    """
+    Lets an event through at most once per key every `interval` seconds
+    and counts what it held back, for debug logging in the polling paths.
+    """
+
+    def __init__(self, interval: float, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._next = {}  # key -> time the next event may go out
+        self._suppressed: Dict[str, int] = {}
+
+    def allow(self, key: str) -> Optional[int]:
+        """None if this event should be skipped, else how many were skipped since the last one"""
+        now = self.clock()
+        if now < self._next.get(key, 0):
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return None
+        self._next[key] = now + self.interval
+        return self._suppressed.pop(key, 0)
+
+    def debug(self, logger: logging.Logger, event: str, key: Optional[str] = None, **fields):
+        """Sampled debug event; costs one level check when debug logging is off"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        suppressed = self.allow(key or event)
+        if suppressed is not None:
+            log_event(logger, event, logging.DEBUG, suppressed=suppressed, **fields)
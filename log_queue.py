@@ -0,0 +1,46 @@
+"""Bounded log queue and its writer thread, for the long-running bot"""
+import copy
+import logging
+import logging.handlers
+import queue
+
+# Records waiting for the writer thread; past this, new ones are dropped
+QUEUE_SIZE = 10000
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread; drops them rather than block when it falls behind"""
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep the fields for the real formatter; only render what can't cross threads safely
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.dropped:
+                # The next record that gets through says how many didn't
+                record.fields = dict(getattr(record, 'fields', {}), records_dropped=self.dropped)
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter(logging.handlers.QueueListener):
+    """Writes queued records on a background thread; stopping twice is harmless"""
+    stopped = False
+
+    def stop(self):
+        if not self.stopped:
+            self.stopped = True
+            super().stop()
@@ -0,0 +1,212 @@
+"""Central rate limiting for everything the bot sends to Reddit"""
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from log import log_event
+from work_queue import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# Sends that fail for other reasons than a rate limit are retried this many
+# times, waiting RETRY_BASE_SECONDS and doubling, before they're given up
+MAX_SEND_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30.0
+
+
+class TokenBucket:
+    """Allows `per_hour` actions an hour, with bursts up to `capacity`"""
+
+    def __init__(self, per_hour: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self.rate = per_hour / 3600.0
+        self.capacity = capacity if capacity is not None else max(1.0, per_hour)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def seconds_until_token(self) -> float:
+        self._refill()
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateGovernor:
+    """
+    Queues replies, comments and posts and sends them as fast as the
+    limits allow: a token bucket per action type, a cooldown per thread
+    (or per post type), and the global budget Reddit reports in its
+    X-Ratelimit-Remaining/Reset headers. Work is deferred rather than
+    dropped: a rate-limited send waits as long as Reddit asks, and any
+    other failed send is retried with backoff; only after
+    MAX_SEND_ATTEMPTS failures is it given up (logged as send_dropped).
+    """
+
+    def __init__(self, limits: Dict[str, float], cooldown_seconds: float,
+                 budget: Optional[Callable[[], Dict]] = None, reserve: int = 5,
+                 clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.buckets = {action: TokenBucket(per_hour, clock=clock) for action, per_hour in limits.items()}
+        self.cooldown_seconds = cooldown_seconds
+        self.budget = budget  # e.g. lambda: reddit.auth.limits
+        self.reserve = reserve  # Requests kept back for listing and reading
+        self.blocked_until = 0.0
+        self.last_sent = {}  # key -> time of last action
+        self.queue = deque()
+        self.latency = LatencyStats()  # submitted -> sent, per priority
+        self._lock = threading.Lock()
+
+    def submit(self, action: str, key: str, send: Callable[[], None],
+               description: str = '', cooldown: Optional[float] = None, priority: int = 0,
+               on_drop: Optional[Callable[[], None]] = None):
+        """
+        Queue an action; `key` identifies the thread (or post type) for cooldowns.
+        Lower priorities are sent first when they compete for the same budget.
+        `on_drop` is called if the action is given up on.
+        """
+        with self._lock:
+            self.queue.append({
+                'action': action,
+                'key': key,
+                'send': send,
+                'description': description or action,
+                'cooldown': self.cooldown_seconds if cooldown is None else cooldown,
+                'priority': priority,
+                'submitted': self.clock(),
+                'not_before': 0.0,
+                'attempts': 0,
+                'on_drop': on_drop
+            })
+
+    def _check_budget(self):
+        """Hold all work once Reddit's request budget is nearly spent"""
+        if self.budget is None:
+            return
+        limits = self.budget() or {}
+        remaining = limits.get('remaining')
+        reset_at = limits.get('reset_timestamp')
+        if remaining is not None and reset_at is not None and remaining <= self.reserve:
+            self.blocked_until = max(self.blocked_until, reset_at)
+
+    def _ready(self, item: Dict, now: float) -> bool:
+        if item['not_before'] > now:
+            return False
+        last = self.last_sent.get(item['key'])
+        return last is None or now - last >= item['cooldown']
+
+    def run_ready(self) -> int:
+        """Send every queued action the limits allow right now; returns how many were sent"""
+        sent = 0
+        self._check_budget()
+
+        with self._lock:
+            items = sorted(self.queue, key=lambda item: item['priority'])
+            self.queue.clear()
+
+        deferred = []
+        for item in items:
+            now = self.clock()
+            if now < self.blocked_until or not self._ready(item, now):
+                deferred.append(item)
+                continue
+
+            bucket = self.buckets.get(item['action'])
+            if bucket is not None and not bucket.try_take():
+                deferred.append(item)
+                continue
+
+            try:
+                item['send']()
+                self.last_sent[item['key']] = now
+                self.latency.record(item['priority'], now - item['submitted'])
+                sent += 1
+            except Exception as e:
+                # Nothing was sent, so the token goes back either way
+                if bucket is not None:
+                    bucket.refund()
+                retry_after = self._retry_after(e)
+                if retry_after is None:
+                    item['attempts'] += 1
+                    if item['attempts'] >= MAX_SEND_ATTEMPTS:
+                        log_event(logger, 'send_dropped', logging.ERROR, exc_info=True,
+                                  description=item['description'], action=item['action'],
+                                  attempts=item['attempts'])
+                        if item['on_drop'] is not None:
+                            item['on_drop']()
+                        continue
+                    retry_after = RETRY_BASE_SECONDS * 2 ** (item['attempts'] - 1)
+                    log_event(logger, 'send_failed', logging.ERROR, exc_info=True, description=item['description'],
+                              action=item['action'], attempts=item['attempts'], retry_seconds=round(retry_after))
+                else:
+                    log_event(logger, 'send_rate_limited', logging.WARNING, description=item['description'],
+                              action=item['action'], retry_seconds=round(retry_after))
+                item['not_before'] = now + retry_after
+                deferred.append(item)
+
+            self._check_budget()
+
+        with self._lock:
+            # Keep deferred work ahead of anything submitted meanwhile
+            self.queue.extendleft(reversed(deferred))
+
+        return sent
+
+    def seconds_until_ready(self) -> Optional[float]:
+        """How long until some queued action could be sent, or None if the queue is empty"""
+        with self._lock:
+            items = list(self.queue)
+        if not items:
+            return None
+
+        now = self.clock()
+        waits = []
+        for item in items:
+            wait = max(item['not_before'], self.blocked_until) - now
+            last = self.last_sent.get(item['key'])
+            if last is not None:
+                wait = max(wait, last + item['cooldown'] - now)
+            bucket = self.buckets.get(item['action'])
+            if bucket is not None:
+                wait = max(wait, bucket.seconds_until_token())
+            waits.append(max(0.0, wait))
+        return min(waits)
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds to wait if `error` is a Reddit rate limit, else None"""
+        # praw.exceptions.RedditAPIException: "...try again in 5 minutes."
+        for item in getattr(error, 'items', []) or []:
+            if getattr(item, 'error_type', None) == 'RATELIMIT':
+                match = re.search(r'(\d+)\s+(minute|second)', getattr(item, 'message', '') or '')
+                if not match:
+                    return 60.0
+                amount = float(match.group(1))
+                return amount * 60 if match.group(2) == 'minute' else amount
+
+        # prawcore.TooManyRequests (HTTP 429)
+        response = getattr(error, 'response', None)
+        if response is not None and getattr(response, 'status_code', None) == 429:
+            try:
+                return float(response.headers.get('retry-after', 60))
+            except (TypeError, ValueError):
+                return 60.0
+
+        return None
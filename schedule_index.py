@@ -0,0 +1,142 @@
+"""Per-team index over the remaining schedule"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+NO_WEEK = 999  # Sorts games without a week last
+NO_TEAM = -1  # Opponent not announced yet
+ENTRY_KEYS = ('start', 'week', 'opponent', 'is_home', 'row')
+
+
+def utc_now() -> datetime:
+    """The current time as a naive UTC datetime, comparable with schedule start dates"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ScheduleIndex:
+    """
+    Built once per schedule refresh from the games not yet completed.
+
+    Each team gets its games as parallel NumPy arrays (start date, week,
+    opponent, home/away, row), kept in two orders: by start date, so "next
+    game after T" is a bisect, and by week, so the chase engine can step a
+    holder through the season week by week the same way.
+
+    The per-team arrays are views into flat arrays grouped by team
+    (`arrays`), so the whole index can be handed to another process as a
+    few buffers and rebuilt there with `from_arrays`.
+    """
+
+    def __init__(self, schedule: pd.DataFrame):
+        self.teams = {}
+        self.venues = []
+        self.arrays = {}
+        if schedule.empty:
+            return
+
+        games = schedule[schedule['completed'] == False]
+        starts = games['start_date'].to_numpy().astype('datetime64[us]')
+        weeks = games['week'].fillna(NO_WEEK).to_numpy(dtype=np.int64) if 'week' in games else \
+            np.full(len(games), NO_WEEK, dtype=np.int64)
+        home = games['home_id'].fillna(NO_TEAM).to_numpy(dtype=np.int64)
+        away = games['away_id'].fillna(NO_TEAM).to_numpy(dtype=np.int64)
+        self.venues = [venue if pd.notna(venue) else 'TBD' for venue in games['venue']] if 'venue' in games else \
+            ['TBD'] * len(games)
+
+        # One entry per (team, game): each game is listed for both teams
+        rows = np.arange(len(games))
+        team = np.concatenate((home, away))
+        entries = {
+            'start': np.concatenate((starts, starts)),
+            'week': np.concatenate((weeks, weeks)),
+            'opponent': np.concatenate((away, home)),
+            'is_home': np.concatenate((np.ones(len(games), bool), np.zeros(len(games), bool))),
+            'row': np.concatenate((rows, rows)),
+        }
+
+        known = team != NO_TEAM
+        team = team[known]
+        entries = {key: values[known] for key, values in entries.items()}
+
+        # Group by team, ordered by start date (and separately by week) within each team
+        arrays = {}
+        for order_name, sort_key in (('start', entries['start']), ('week', entries['week'])):
+            order = np.lexsort((entries['row'], sort_key, team))
+            arrays.update({f"{order_name}_{key}": values[order] for key, values in entries.items()})
+        arrays['team'] = np.sort(team)  # Same grouping in both orders
+        self._split(arrays)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], venues: Optional[List[str]] = None) -> 'ScheduleIndex':
+        """
+        Rebuild an index over flat arrays (e.g. in shared memory) without
+        copying them. Without `venues` every game's venue is 'TBD'.
+        """
+        index = cls(pd.DataFrame())
+        index.venues = venues
+        if len(arrays.get('team', ())):
+            index._split(arrays)
+        return index
+
+    def _split(self, arrays: Dict[str, np.ndarray]):
+        """Per-team views into the flat arrays"""
+        self.arrays = arrays
+        team = arrays['team']
+        bounds = np.flatnonzero(np.diff(team)) + 1
+        for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(team)]))):
+            self.teams[int(team[lo])] = {
+                order_name: {key: arrays[f"{order_name}_{key}"][lo:hi] for key in ENTRY_KEYS}
+                for order_name in ('start', 'week')
+            }
+
+    def _game(self, games: Dict, i: int, team_id: int) -> Dict:
+        opponent = int(games['opponent'][i])
+        opponent = None if opponent == NO_TEAM else opponent
+        week = int(games['week'][i])
+        return {
+            'start_date': pd.Timestamp(games['start'][i]),
+            'week': 'TBD' if week == NO_WEEK else week,
+            'week_number': week,  # NO_WEEK if unknown, for ordering
+            'opponent_id': opponent,
+            'home_id': team_id if games['is_home'][i] else opponent,
+            'away_id': opponent if games['is_home'][i] else team_id,
+            'venue': self.venues[games['row'][i]] if self.venues is not None else 'TBD',
+            'row': int(games['row'][i])  # Identifies the game across both teams' entries
+        }
+
+    def next_game(self, team_id: int, after: datetime) -> Optional[Dict]:
+        """A team's first game starting after `after`"""
+        team = self.teams.get(team_id)
+        if team is None:
+            return None
+        games = team['start']
+        i = np.searchsorted(games['start'], np.datetime64(after, 'us'), side='right')
+        return self._game(games, i, team_id) if i < len(games['start']) else None
+
+    def next_game_after_week(self, team_id: int, week: int, after: datetime) -> Optional[Dict]:
+        """
+        A team's first game in a later week than `week` that starts after
+        `after` and has a known opponent (how the chase engine steps).
+        """
+        team = self.teams.get(team_id)
+        if team is None:
+            return None
+        games = team['week']
+        after = np.datetime64(after, 'us')
+        i = np.searchsorted(games['week'], week, side='right')
+        while i < len(games['week']):
+            if games['start'][i] > after and games['opponent'][i] != NO_TEAM:
+                return self._game(games, i, team_id)
+            i += 1
+        return None
+
+    def next_game_between(self, team_id: int, opponent_id: int, after: datetime) -> Optional[Dict]:
+        """The first game between two teams starting after `after`"""
+        team = self.teams.get(team_id)
+        if team is None:
+            return None
+        games = team['start']
+        upcoming = np.flatnonzero((games['opponent'] == opponent_id) & (games['start'] > np.datetime64(after, 'us')))
+        return self._game(games, upcoming[0], team_id) if len(upcoming) else None
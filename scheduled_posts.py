@@ -1,11 +1,18 @@
 """Scheduled post generators for CFB Belt Bot"""
 from datetime import datetime, timedelta
-from data_fetcher import BeltDataFetcher
+from typing import TYPE_CHECKING, Optional
 import config
 
+if TYPE_CHECKING:
+    from data_fetcher import BeltDataFetcher
+
 class ScheduledPosts:
-    def __init__(self):
-        self.fetcher = BeltDataFetcher()
+    def __init__(self, fetcher: Optional['BeltDataFetcher'] = None):
+        if fetcher is None:
+            # Imported here so rendering from a snapshot never loads pandas
+            from data_fetcher import BeltDataFetcher
+            fetcher = BeltDataFetcher()
+        self.fetcher = fetcher
 
     def generate_weekly_update(self) -> str:
         """Generate Monday weekly belt status update"""
@@ -150,9 +157,9 @@ class ScheduledPosts:
 
         return {"title": title, "body": body}
 
-    def _get_week_number(self) -> int:
+    def _get_week_number(self, now: Optional[datetime] = None) -> int:
         """Approximate current week of CFB season"""
-        now = datetime.now()
+        now = now or datetime.now()
         # Assume season starts around late August/early September
         # This is approximate - could be enhanced with actual week data
         season_start = datetime(now.year, 8, 25)
@@ -171,9 +178,9 @@ class ScheduledPosts:
             suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
         return f"{n}{suffix}"
 
-    def generate_on_this_day(self) -> dict:
+    def generate_on_this_day(self, now: Optional[datetime] = None) -> dict:
         """Generate 'On This Day' historical post (Saturdays)"""
-        now = datetime.now()
+        now = now or datetime.now()
         games = self.fetcher.get_games_on_this_day(now.month, now.day)
 
         if not games:
@@ -193,8 +200,10 @@ class ScheduledPosts:
         body += f"**{years_ago} years ago**, {featured_game['winner_name']} "
 
         # Determine if they won or defended the belt
-        # (Would need more context to know if this was a belt change or defense)
-        body += f"won the CFB Linear Championship Belt!\n\n"
+        if featured_game.get('result') == 'defense':
+            body += f"defended the CFB Linear Championship Belt!\n\n"
+        else:
+            body += f"won the CFB Linear Championship Belt!\n\n"
 
         # Show other games on this date if any
         if len(games) > 1:
@@ -204,6 +213,8 @@ class ScheduledPosts:
                 body += f"• **{game['year']}**: {game['winner_name']} beat {game['loser_name']}"
                 if game['winner_score'] != 'N/A':
                     body += f" {game['winner_score']}-{game['loser_score']}"
+                if game.get('result') == 'defense':
+                    body += " (defense)"
                 body += "\n\n"
 
         body += f"📊 [Full Belt History]({config.WEBSITE_URL})\n\n"
@@ -211,14 +222,15 @@ class ScheduledPosts:
 
         return {"title": title, "body": body}
 
-    def generate_longest_reign_alert(self, current_rank: int) -> dict:
+    def generate_longest_reign_alert(self, current_rank: int, now: Optional[datetime] = None) -> dict:
         """Generate post when current reign enters top 10"""
+        now = now or datetime.now()
         champion_id, reign_start, defenses = self.fetcher.get_current_champion()
         if not champion_id:
             return None
 
         champion_name = self.fetcher.get_school_name(champion_id)
-        reign_days = (datetime.now() - reign_start).days if reign_start else 0
+        reign_days = (now - reign_start).days if reign_start else 0
 
         ordinal_rank = self._ordinal(current_rank)
 
@@ -230,7 +242,8 @@ class ScheduledPosts:
         body += f"**Started:** {reign_start.strftime('%B %d, %Y')}\n\n"
 
         # Get top 10 for context
-        top_reigns = self.fetcher.get_longest_reigns(10)
+        top_reigns = self.fetcher.get_longest_reigns(10, now)
+        days_to_next = self.fetcher.get_reign_leaderboard().days_until_next_rank(now)
 
         body += "---\n\n"
         body += "**Top 10 Longest Reigns:**\n\n"
@@ -248,9 +261,7 @@ class ScheduledPosts:
             body += "\n\n"
 
         # Next milestone
-        if current_rank > 1:
-            next_reign = top_reigns[current_rank - 2]
-            days_to_next = next_reign['days'] - reign_days
+        if current_rank > 1 and days_to_next is not None:
             body += f"**Next Milestone:** {days_to_next} more days to reach #{current_rank - 1}\n\n"
 
         next_game = self.fetcher.get_next_belt_game()
@@ -260,16 +271,17 @@ class ScheduledPosts:
         body += f"📊 [Live Tracker]({config.WEBSITE_URL})\n\n"
         body += f"🏆 Can {champion_name} keep it going?"
 
-        return {"title": title, "body": body}
+        return {"title": title, "body": body, "rank": current_rank}
 
-    def generate_belt_chase_update(self) -> dict:
+    def generate_belt_chase_update(self, now: Optional[datetime] = None) -> dict:
         """Generate weekly belt chase update (Sundays)"""
+        now = now or datetime.now()
         champion_id, reign_start, defenses = self.fetcher.get_current_champion()
         if not champion_id:
             return None
 
         champion_name = self.fetcher.get_school_name(champion_id)
-        week_num = self._get_week_number()
+        week_num = self._get_week_number(now)
 
         # Compute all teams that can win the belt this season
         chase_teams = self.fetcher.compute_belt_chase_teams()
@@ -318,7 +330,7 @@ class ScheduledPosts:
                 body += f"{distant_teams} teams could theoretically win the belt, but need multiple games to break their way.\n\n"
 
         body += "---\n\n"
-        body += f"Current Reign: {(datetime.now() - reign_start).days if reign_start else 0} days\n\n"
+        body += f"Current Reign: {(now - reign_start).days if reign_start else 0} days\n\n"
         body += f"Last Belt Change: {reign_start.strftime('%B %d, %Y') if reign_start else 'Unknown'}\n\n"
         body += f"Full Chase Tree: {config.WEBSITE_URL}\n\n"
         body += "Rutgers started this in 1869. Who's next?"
@@ -326,6 +338,52 @@ class ScheduledPosts:
         return {"title": title, "body": body}
 
 
+class PrerenderedPosts:
+    """
+    Scheduled post bodies rendered ahead of their cron time.
+
+    Each post is stored with the data version and the date it was rendered
+    for, so publishing at the cron tick is a lookup unless the data changed
+    in between.
+    """
+
+    def __init__(self, posts: ScheduledPosts):
+        self.posts = posts
+        self.fetcher = posts.fetcher
+        self.renderers = {
+            'on_this_day': posts.generate_on_this_day,
+            'belt_chase': posts.generate_belt_chase_update,
+            'longest_reign': self._render_longest_reign,
+        }
+        self._cache = {}  # post_type -> (data_version, date, post_data)
+
+    def _render_longest_reign(self, now: datetime) -> Optional[dict]:
+        """Reign alert, only when the current reign is in the top 10 at `now`"""
+        current_rank = self.fetcher.get_reign_leaderboard().current_rank(now)
+        if not current_rank or current_rank > 10:
+            return None
+        return self.posts.generate_longest_reign_alert(current_rank, now)
+
+    def is_stale(self, post_type: str, publish_at: datetime) -> bool:
+        entry = self._cache.get(post_type)
+        return entry is None or entry[0] != self.fetcher.data_version or entry[1] != publish_at.date()
+
+    def render(self, post_type: str, publish_at: datetime) -> Optional[dict]:
+        """Render a post for the given publish time and store it"""
+        # Render first: a reload during rendering bumps the data version
+        post_data = self.renderers[post_type](publish_at)
+        self._cache[post_type] = (self.fetcher.data_version, publish_at.date(), post_data)
+        return post_data
+
+    def get(self, post_type: str, publish_at: Optional[datetime] = None) -> Optional[dict]:
+        """Get the pre-rendered post, re-rendering only if the data changed"""
+        publish_at = publish_at or datetime.now()
+        self.fetcher.get_reign_leaderboard()  # Pick up a pending reload first
+        if self.is_stale(post_type, publish_at):
+            return self.render(post_type, publish_at)
+        return self._cache[post_type][2]
+
+
 if __name__ == '__main__':
     # Test scheduled posts
     posts = ScheduledPosts()
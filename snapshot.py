@@ -0,0 +1,238 @@
+"""Belt state saved to JSON so one-shot tools can answer without loading the sheets"""
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from title_matcher import find_team
+
+SNAPSHOT_FORMAT = 4
+TOP_REIGNS = 25  # Reigns kept per leaderboard
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _score(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None  # Missing (pandas NA) or not a number
+
+
+def _reign_json(reign: Dict) -> Dict:
+    return dict(
+        reign,
+        champion_id=int(reign['champion_id']),
+        start_date=_iso(reign['start_date']),
+        end_date=_iso(reign['end_date'])
+    )
+
+
+def build_snapshot(fetcher) -> Dict:
+    """Everything the CLI needs, from a loaded BeltDataFetcher"""
+    from lineage import BELT_CHANGE, BELT_DEFENSE, classified  # Keeps pandas off the CLI's fast path
+
+    games = fetcher.fetch_games()
+    schools = fetcher.fetch_schools()
+    champion_id, reign_start, defenses = fetcher.get_current_champion()
+
+    next_game = fetcher.get_next_belt_game() if champion_id else None
+    if next_game:
+        next_game = dict(next_game, date=_iso(next_game['date']))
+
+    stats = fetcher.get_overall_stats()
+    if stats:
+        stats = dict(stats, start_date=_iso(stats['start_date']))
+
+    if not games.empty:
+        games = classified(games)
+        games = games[games['belt_game'].isin((BELT_CHANGE, BELT_DEFENSE))]
+
+    # History for every team that has held the belt; anyone else never has
+    history = {}
+    for team_id in sorted(fetcher.team_histories):
+        team_history = fetcher.get_team_belt_history(team_id)
+        history[str(team_id)] = dict(team_history, last_held=_iso(team_history['last_held']))
+
+    belt_games = []
+    if not games.empty:
+        no_scores = [None] * len(games)
+        for date, result, winner_id, loser_id, winner_score, loser_score in zip(
+                games['date'], games['belt_game'], games['winner_id'], games['loser_id'],
+                games.get('winner_score', no_scores), games.get('loser_score', no_scores)):
+            belt_games.append({
+                'date': _iso(date),
+                'result': result,
+                'winner_id': int(winner_id),
+                'loser_id': int(loser_id),
+                'winner_score': _score(winner_score),
+                'loser_score': _score(loser_score)
+            })
+
+    top_reigns = {
+        'days': [_reign_json(reign) for reign in fetcher.get_longest_reigns(TOP_REIGNS)],
+        'defenses': [_reign_json(reign) for reign in fetcher.get_most_defended_reigns(TOP_REIGNS)]
+    }
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'data_version': fetcher.data_version,
+        'generated_at': datetime.now().isoformat(),
+        'schools': {str(school_id): name for school_id, name in schools.items()},
+        'aliases': fetcher.team_aliases,
+        'champion': {
+            'id': int(champion_id) if champion_id else None,
+            'start_date': _iso(reign_start),
+            'defenses': defenses,
+            'provisional': fetcher.is_champion_provisional()
+        },
+        'next_game': next_game,
+        'stats': stats,
+        'history': history,
+        'chase': fetcher.compute_belt_chase_teams(),
+        'top_reigns': top_reigns,
+        'belt_games': belt_games,
+        'cubes': fetcher.cubes.as_json(),
+        'season_chases': fetcher.get_season_chases()
+    }
+
+
+def is_complete(snapshot: Dict) -> bool:
+    """Whether a snapshot was built from a loaded games sheet, rather than during an outage"""
+    return snapshot['champion']['id'] is not None and bool(snapshot['belt_games'])
+
+
+def write_snapshot(snapshot: Dict, path: str):
+    """Write a snapshot atomically (temp file + rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """Read a snapshot, or None if it's missing, unreadable, an old format or incomplete"""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT or not is_complete(snapshot):
+        return None
+    return snapshot
+
+
+class SnapshotReader:
+    """
+    Answers the read-only BeltDataFetcher queries used by CommandHandler
+    and ScheduledPosts from a saved snapshot, so they can run without
+    pandas or network access.
+    """
+
+    def __init__(self, snapshot: Dict):
+        self.snapshot = snapshot
+        self.generated_at = _date(snapshot['generated_at'])
+        self.schools = {int(school_id): name for school_id, name in snapshot['schools'].items()}
+        self.school_ids_by_name = {}
+        for school_id, name in self.schools.items():
+            self.school_ids_by_name.setdefault(name.lower(), school_id)
+        self.team_aliases = snapshot['aliases']
+
+    def get_school_name(self, school_id) -> str:
+        if school_id is None:
+            return "Unknown"
+        return self.schools.get(int(school_id), str(school_id))
+
+    def find_team_by_name(self, team_name: str) -> Optional[Tuple[int, str]]:
+        return find_team(team_name, self.schools, self.school_ids_by_name, self.team_aliases)
+
+    def get_current_champion(self) -> Tuple[Optional[int], Optional[datetime], int]:
+        champion = self.snapshot['champion']
+        return champion['id'], _date(champion['start_date']), champion['defenses']
+
+    def is_champion_provisional(self) -> bool:
+        return self.snapshot['champion']['provisional']
+
+    def get_next_belt_game(self) -> Optional[Dict]:
+        next_game = self.snapshot['next_game']
+        if not next_game:
+            return None
+        date = _date(next_game['date'])
+        if date <= datetime.now(timezone.utc).replace(tzinfo=None):  # Kickoffs are naive UTC
+            return None  # Already kicked off; the snapshot doesn't know the one after
+        return dict(next_game, date=date)
+
+    def get_overall_stats(self) -> Dict:
+        stats = self.snapshot['stats']
+        if not stats:
+            return {}
+        start_date = _date(stats['start_date'])
+        return dict(
+            stats,
+            start_date=start_date,
+            days_since_start=(datetime.now() - start_date).days if start_date else 0
+        )
+
+    def get_team_belt_history(self, team_id) -> Dict:
+        history = self.snapshot['history'].get(str(team_id))
+        if history is None:
+            return {
+                'total_reigns': 0,
+                'total_days': 0,
+                'total_defenses': 0,
+                'best_reign_days': 0,
+                'last_held': None,
+                'last_won_from': None,
+                'last_lost_to': None
+            }
+        return dict(history, last_held=_date(history['last_held']))
+
+    def compute_belt_chase_teams(self) -> List[Dict]:
+        return self.snapshot['chase']
+
+    def _cube_row(self, cube: str, key: str) -> Optional[Dict]:
+        row = self.snapshot['cubes'][cube].get(key)
+        if row is None or not row['longest_reign']:
+            return row
+        return dict(row, longest_reign=dict(row['longest_reign'],
+                                            start_date=_date(row['longest_reign']['start_date'])))
+
+    def get_season_stats(self, season: int) -> Optional[Dict]:
+        return self._cube_row('seasons', str(season))
+
+    def get_decade_stats(self, decade: int) -> Optional[Dict]:
+        return self._cube_row('decades', str(decade))
+
+    def get_conference_stats(self, conference: str) -> Optional[Dict]:
+        for name in self.snapshot['cubes']['conferences']:
+            if name.lower() == conference.lower():
+                return dict(self._cube_row('conferences', name), conference=name)
+        return None
+
+    def get_season_chase(self, season: int) -> Optional[Dict]:
+        return self.snapshot['season_chases'].get(str(season))
+
+    def get_games_on_this_day(self, month: int, day: int) -> List[Dict]:
+        matching_games = []
+        for game in self.snapshot['belt_games']:
+            date = _date(game['date'])
+            if date.month == month and date.day == day:
+                matching_games.append({
+                    'date': date,
+                    'year': date.year,
+                    'result': game['result'],
+                    'winner_id': game['winner_id'],
+                    'winner_name': self.get_school_name(game['winner_id']),
+                    'loser_id': game['loser_id'],
+                    'loser_name': self.get_school_name(game['loser_id']),
+                    'winner_score': 'N/A' if game['winner_score'] is None else game['winner_score'],
+                    'loser_score': 'N/A' if game['loser_score'] is None else game['loser_score']
+                })
+
+        return sorted(matching_games, key=lambda x: x['year'], reverse=True)
@@ -0,0 +1,81 @@
+"""BeltAPI responses and conditional requests, without a server"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import snapshot
+from api import BeltAPI
+
+SNAPSHOT = {
+    'data_version': 7,
+    'generated_at': '2026-10-17T12:00:00',
+    'schools': {'1': 'Georgia', '2': 'Alabama'},
+    'aliases': {},
+    'champion': {'id': 1, 'start_date': '2026-10-10', 'defenses': 1, 'provisional': False},
+    'next_game': None,
+    'history': {},
+    'top_reigns': {'days': [], 'defenses': []},
+    'chase': [],
+    'belt_games': [{'date': '2026-10-10', 'result': 'change', 'winner_id': 1, 'loser_id': 2,
+                    'winner_score': 24, 'loser_score': 10}],
+}
+
+
+@pytest.fixture
+def api():
+    api = BeltAPI('127.0.0.1', 0)
+    api.update(SNAPSHOT)
+    return api
+
+
+def test_not_loaded_yet():
+    assert BeltAPI('127.0.0.1', 0).respond('/champion')[0] == 503
+
+
+def test_ok_then_not_modified(api):
+    status, etag, body = api.respond('/champion')
+    assert status == 200 and json.loads(body)['champion_name'] == 'Georgia'
+    assert api.respond('/champion', etag) == (304, etag, b'')
+    assert api.respond('/champion', '"stale"') == (200, etag, body)
+
+
+@pytest.mark.parametrize('path, status', [
+    ('/nowhere', 404),
+    ('/history/Atlantis', 404),
+    ('/reigns/top?by=luck', 400),
+    ('/reigns/top?limit=ten', 400),
+])
+def test_errors_are_never_not_modified(api, path, status):
+    etag = api.respond('/champion')[1]
+    assert api.respond(path, etag)[:2] == (status, None)
+
+
+def test_snapshots_from_an_outage_are_not_served(api):
+    etag, body = api.respond('/champion')[1:]
+    api.update(dict(SNAPSHOT, data_version=8, champion=dict(SNAPSHOT['champion'], id=None), belt_games=[]))
+    assert api.respond('/champion') == (200, etag, body)
+
+
+class FrozenDatetime(datetime):
+    now_utc = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.now_utc.replace(tzinfo=tz) if tz else cls.now_utc
+
+
+def test_next_empties_at_kickoff(api, monkeypatch):
+    monkeypatch.setattr(snapshot, 'datetime', FrozenDatetime)
+    kickoff = datetime(2026, 10, 24, 19, 30)
+    FrozenDatetime.now_utc = kickoff - timedelta(hours=1)
+    api.update(dict(SNAPSHOT, next_game={'date': kickoff.isoformat(), 'opponent_id': 2}))
+    status, etag, body = api.respond('/next')
+    assert json.loads(body)['opponent_id'] == 2
+    assert api.respond('/next', etag)[0] == 304
+
+    FrozenDatetime.now_utc = kickoff + timedelta(minutes=1)
+    status, new_etag, body = api.respond('/next', etag)
+    assert (status, json.loads(body)) == (200, None)
+    assert new_etag != etag
+    assert api.respond('/next', new_etag)[0] == 304
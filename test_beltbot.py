@@ -0,0 +1,68 @@
+"""The beltbot CLI's fast path: answered from the snapshot without the heavy imports"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from data_fetcher import BeltDataFetcher
+from snapshot import build_snapshot, write_snapshot
+from test_data_fetcher import sheets  # noqa: F401 (fixture)
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+HEAVY = {'pandas', 'numpy', 'praw', 'prawcore', 'apscheduler', 'requests', 'dateutil', 'pytz'}
+STATUS_BUDGET_SECONDS = 0.2  # Wall time for `beltbot status`, interpreter start included
+
+# Runs the CLI, then reports every module it loaded
+CHILD = """
+import json, sys
+import beltbot
+beltbot.main(sys.argv[1:])
+print('MODULES ' + json.dumps(sorted(sys.modules)))
+"""
+
+
+@pytest.fixture
+def snapshot_path(sheets, tmp_path):  # noqa: F811
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(build_snapshot(BeltDataFetcher()), path)
+    return path
+
+
+def _slowest_imports(report: str, count: int = 10) -> str:
+    """The imports (and what beltbot imports directly) that took longest, from `-X importtime` output"""
+    rows = []
+    for line in report.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            if cumulative.strip().isdigit() and depth <= 1:
+                rows.append((int(cumulative), name.strip()))
+    return '\n'.join(f"{micros / 1000:7.1f} ms  {name}" for micros, name in sorted(rows, reverse=True)[:count])
+
+
+def test_status_skips_the_heavy_imports(snapshot_path, tmp_path):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD, '--snapshot', snapshot_path, 'status'],
+        cwd=REPO, capture_output=True, text=True, check=True
+    )
+    (tmp_path / 'importtime.txt').write_text(result.stderr)
+    slowest = _slowest_imports(result.stderr)
+    print(f"Slowest imports for `beltbot status`:\n{slowest}")
+
+    output, _, modules = result.stdout.rpartition('MODULES ')
+    assert 'Current Champion' in output
+    loaded = {name.split('.')[0] for name in json.loads(modules)}
+    assert not loaded & HEAVY, f"{sorted(loaded & HEAVY)} imported on the fast path\n{slowest}"
+
+
+def test_status_is_fast(snapshot_path):
+    command = [sys.executable, os.path.join(REPO, 'beltbot.py'), '--snapshot', snapshot_path, 'status']
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=REPO, capture_output=True, check=True)
+        timings.append(time.perf_counter() - started)
+    assert min(timings) < STATUS_BUDGET_SECONDS, f"best of 5: {min(timings) * 1000:.0f} ms"
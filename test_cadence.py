@@ -0,0 +1,42 @@
+"""Cadence modes around the holder's next game, in UTC like the schedule"""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import config
+from cadence import Cadence
+from schedule_index import ScheduleIndex, utc_now
+
+CHAMPION = 1
+
+
+def _cadence(kickoff):
+    index = ScheduleIndex(pd.DataFrame({
+        'start_date': [kickoff], 'week': [1], 'completed': [False], 'home_id': [CHAMPION], 'away_id': [2]
+    }))
+    fetcher = SimpleNamespace(get_current_champion=lambda: (CHAMPION, None, 0), get_schedule_index=lambda: index)
+    return Cadence(fetcher)
+
+
+@pytest.fixture
+def far_from_utc(monkeypatch):
+    """Local time 10 hours behind UTC, so local/UTC mix-ups land outside every window"""
+    monkeypatch.setenv('TZ', 'Pacific/Honolulu')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('offset, mode', [
+    (timedelta(minutes=10), 'game'),
+    (-timedelta(hours=2), 'game'),
+    (timedelta(hours=6), 'game_day'),
+    (timedelta(days=2), 'idle'),
+    (-timedelta(hours=config.GAME_WINDOW_AFTER_HOURS + 1), 'idle'),
+])
+def test_mode_follows_kickoff_in_utc(far_from_utc, offset, mode):
+    assert _cadence(utc_now() + offset).current_mode() == mode
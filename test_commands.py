@@ -0,0 +1,25 @@
+"""Parsing triggers and subcommands out of comments"""
+import pytest
+
+from commands import CommandHandler
+
+
+@pytest.fixture
+def handler():
+    return CommandHandler(fetcher=object())  # Parsing never touches the fetcher
+
+
+@pytest.mark.parametrize('text, commands', [
+    ('!beltbot', [('status', None)]),
+    ('!beltbot history michigan', [('history', 'michigan')]),
+    ('!beltbot\nhistory michigan', [('history', 'michigan')]),
+    ('!beltbot\n\n  history michigan\n\nthanks!', [('history', 'michigan')]),
+    ('!beltbot!\nseason 1950 and more', [('season', '1950')]),
+    ('!beltbot next\nhistory michigan', [('next', None)]),
+    ('!beltbot next !belt history ohio state', [('next', None), ('history', 'ohio state')]),
+    ('!beltbot\n!belt stats', [('status', None), ('stats', None)]),
+    ('great game\n!beltbot status\nnice', [('status', None)]),
+    ('history michigan', [('history', 'michigan')]),
+])
+def test_parse_commands(handler, text, commands):
+    assert handler.parse_commands(text) == commands
@@ -0,0 +1,158 @@
+"""BeltDataFetcher reloads against fake sheets, including sheet outages"""
+import io
+
+import pytest
+
+import config
+import data_fetcher
+from data_fetcher import BeltDataFetcher
+from snapshot import build_snapshot, is_complete, load_snapshot, write_snapshot
+
+SCHOOLS = """id,school,conference
+1,Georgia,SEC
+2,Alabama,SEC
+3,Texas,SEC
+4,Boston College,ACC
+"""
+
+GAMES = """date,season,week,winner_id,loser_id,winner_score,loser_score,belt_change
+2024-09-07,2024,2,1,2,24,10,Yes
+2024-09-14,2024,3,1,3,31,17,
+2025-09-06,2025,2,2,1,21,20,Yes
+2025-09-13,2025,3,2,4,35,7,
+"""
+
+SCHEDULE = """id,week,start_date,completed,home_id,away_id,venue
+1,5,2099-09-27T19:00:00.000Z,false,2,3,Stadium 2
+2,6,2099-10-04T19:00:00.000Z,false,1,4,Stadium 1
+"""
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.raw = io.BytesIO(text.encode())
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Sheets:
+    """Serves the sheets by URL; a URL in `down` fails like an outage"""
+
+    def __init__(self, tmp_path):
+        self.sheets = {'schools': SCHOOLS, 'games': GAMES}
+        self.down = set()
+        self.schedule_path = tmp_path / 'schedule.csv'
+        self.schedule_path.write_text(SCHEDULE)
+
+    def get(self, url, **kwargs):
+        if url in self.down:
+            raise ConnectionError(f"{url} is down")
+        return FakeResponse(self.sheets[url])
+
+    def schedule_down(self):
+        self.schedule_path.unlink()
+
+
+@pytest.fixture
+def sheets(tmp_path, monkeypatch):
+    sheets = Sheets(tmp_path)
+    monkeypatch.setattr(config, 'SCHOOLS_CSV_URL', 'schools')
+    monkeypatch.setattr(config, 'GAMES_CSV_URL', 'games')
+    monkeypatch.setattr(config, 'SCHEDULE_CSV_URL', str(sheets.schedule_path))
+    monkeypatch.setattr(config, 'SCORES_FEED_PATH', None)
+    monkeypatch.setattr(data_fetcher.requests, 'get', sheets.get)
+    return sheets
+
+
+def test_games_outage_keeps_the_lineage(sheets):
+    fetcher = BeltDataFetcher()
+    assert fetcher.get_current_champion()[0] == 2
+    history = fetcher.team_histories
+    version = fetcher.data_version
+
+    sheets.down.add('games')
+    for _ in range(3):
+        assert fetcher.fetch_games(force_refresh=True) is fetcher.games_cache
+        assert fetcher.get_current_champion()[:2] == (2, fetcher.leaderboard.current['start_date'])
+    assert fetcher.team_histories is history
+    assert fetcher.data_version == version
+
+
+def test_games_outage_before_the_first_load_is_stable(sheets):
+    sheets.down.add('games')
+    fetcher = BeltDataFetcher()
+    assert fetcher.get_current_champion()[0] is None
+    version = fetcher.data_version
+    fetcher.get_current_champion()
+    fetcher.get_current_champion()
+    assert fetcher.data_version == version
+
+
+def test_unchanged_reloads_keep_the_version(sheets):
+    fetcher = BeltDataFetcher()
+    fetcher.get_current_champion()
+    fetcher.get_schedule_index()
+    version = fetcher.data_version
+
+    fetcher.fetch_games(force_refresh=True)
+    fetcher.fetch_schedule(force_refresh=True)
+    assert fetcher.data_version == version
+
+    sheets.sheets['games'] += "2025-09-20,2025,4,3,2,28,27,Yes\n"
+    fetcher.fetch_games(force_refresh=True)
+    assert fetcher.data_version == version + 1
+    assert fetcher.get_current_champion()[0] == 3
+
+
+def test_schedule_outage_keeps_the_index(sheets):
+    fetcher = BeltDataFetcher()
+    fetcher.get_current_champion()
+    index = fetcher.get_schedule_index()
+    schedule = fetcher.schedule_cache
+    version = fetcher.data_version
+
+    sheets.schedule_down()
+    assert fetcher.fetch_schedule(force_refresh=True) is schedule
+    assert fetcher.schedule_index is index
+    assert fetcher.get_next_belt_game()['opponent_id'] == 3
+    assert fetcher.data_version == version
+
+
+def test_snapshot_of_a_games_outage_is_not_kept(sheets, tmp_path):
+    path = str(tmp_path / 'snapshot.json')
+    fetcher = BeltDataFetcher()
+    write_snapshot(build_snapshot(fetcher), path)
+    assert load_snapshot(path)['champion']['id'] == 2
+
+    sheets.down.add('games')
+    outage = build_snapshot(BeltDataFetcher())
+    assert outage['champion']['id'] is None and not is_complete(outage)
+
+    write_snapshot(outage, path)  # e.g. written by an older bot
+    assert load_snapshot(path) is None
+
+
+def test_games_outage_keeps_replayed_seasons(sheets):
+    fetcher = BeltDataFetcher()
+    assert set(fetcher.get_season_chases()) == {'2024', '2025'}
+
+    sheets.down.add('games')
+    fetcher.fetch_games(force_refresh=True)
+    assert not fetcher.chase_history.pending(fetcher._no_games)
+    assert set(fetcher.chase_history.as_json()) == {'2024', '2025'}
+    assert not fetcher.season_chase_jobs()
+
+    # A sheet that really lost a season forgets it
+    sheets.down.clear()
+    sheets.sheets['games'] = GAMES.replace('2024-09-14,2024,3,1,3,31,17,\n', '').replace(
+        '2024-09-07,2024,2,1,2,24,10,Yes\n', '')
+    fetcher.fetch_games(force_refresh=True)
+    assert set(fetcher.chase_history.as_json()) == {'2025'}
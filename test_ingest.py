@@ -0,0 +1,120 @@
+"""ListingCursor against a fake Reddit listing: nothing missed or repeated under bursty posting"""
+import random
+import time
+from types import SimpleNamespace
+
+from ingest import ListingCursor
+
+
+class FakeListing:
+    """A Reddit listing served newest first, paged with `before`/`after` fullnames like the real API"""
+
+    def __init__(self):
+        self.items = []  # Oldest first
+        self.posted = 0
+
+    def post(self, count: int, created_utc: float = None):
+        for _ in range(count):
+            self.posted += 1
+            number = self.posted
+            self.items.append(SimpleNamespace(
+                fullname=f"t3_{number}", id=str(number),
+                created_utc=time.time() if created_utc is None else created_utc
+            ))
+
+    def delete(self, fullname: str):
+        self.items = [item for item in self.items if item.fullname != fullname]
+
+    def _position(self, fullname: str):
+        for i, item in enumerate(self.items):
+            if item.fullname == fullname:
+                return i
+        return None
+
+    def fetch_page(self, params):
+        limit = params['limit']
+        if 'before' in params:
+            i = self._position(params['before'])
+            if i is None:
+                return []  # Reddit returns nothing for a deleted anchor
+            newer = self.items[i + 1:i + 1 + limit]
+            return list(reversed(newer))
+        if 'after' in params:
+            i = self._position(params['after'])
+            if i is None:
+                return []
+            older = self.items[max(0, i - limit):i]
+            return list(reversed(older))
+        return list(reversed(self.items[-limit:]))
+
+
+def _drain(cursor: ListingCursor, rounds: int = 10):
+    seen = []
+    for _ in range(rounds):
+        seen.extend(item.fullname for item in cursor.poll())
+    return seen
+
+
+def test_bursty_posting_misses_nothing():
+    random.seed(29)
+    listing = FakeListing()
+    listing.post(50)
+    cursor = ListingCursor(listing.fetch_page)
+    cursor.poll()  # Anchor on what's already there
+    already = len(listing.items)
+
+    returned = []
+    for _ in range(40):
+        listing.post(random.choice([0, 0, 1, 5, 99, 100, 101, 250, 1500]))
+        returned.extend(item.fullname for item in cursor.poll())
+    returned.extend(_drain(cursor))
+
+    expected = [item.fullname for item in listing.items[already:]]
+    assert returned == expected  # Every new item once, oldest first
+
+
+def test_burst_larger_than_one_poll_is_picked_up_next_poll():
+    listing = FakeListing()
+    listing.post(1)
+    cursor = ListingCursor(listing.fetch_page, page_size=100, max_pages=10)
+    cursor.poll()
+
+    listing.post(2500)
+    first = cursor.poll()
+    assert len(first) == 1000
+    rest = _drain(cursor)
+    assert [item.fullname for item in first] + rest == [item.fullname for item in listing.items[1:]]
+
+
+def test_cold_start_skips_old_items():
+    listing = FakeListing()
+    listing.post(1000, created_utc=time.time() - 86400)
+    listing.post(3)
+    cursor = ListingCursor(listing.fetch_page, since=time.time() - 600)
+
+    assert [item.fullname for item in cursor.poll()] == ['t3_1001', 't3_1002', 't3_1003']
+
+
+def test_deleted_cursor_item_resyncs():
+    listing = FakeListing()
+    listing.post(10)
+    cursor = ListingCursor(listing.fetch_page, resync_every=2)
+    cursor.poll()
+
+    listing.delete('t3_10')
+    listing.post(3)
+    returned = _drain(cursor, rounds=3)
+    assert returned == ['t3_11', 't3_12', 't3_13']
+
+
+def test_restore_resumes_after_checkpoint():
+    listing = FakeListing()
+    listing.post(20)
+    cursor = ListingCursor(listing.fetch_page)
+    cursor.poll()
+    checkpoint = cursor.checkpoint()
+
+    listing.post(150)
+    resumed = ListingCursor(listing.fetch_page)
+    resumed.restore(checkpoint, max_age=3600)
+    assert _drain(resumed) == [item.fullname for item in listing.items[20:]]
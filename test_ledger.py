@@ -0,0 +1,258 @@
+"""Replicas sharing a WorkLedger, on a fake clock against a fake Reddit"""
+import sqlite3
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+import bot
+from bot import CFBBeltBot
+from ingest import CheckpointStore
+from ledger import WorkLedger
+from rate_governor import RateGovernor
+from work_queue import PRIORITY_INTERACTIVE, WorkQueue
+
+LEASE = 90
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class FakeComment:
+    """A comment that counts the replies it gets"""
+
+    def __init__(self, n: int):
+        self.id = f"c{n}"
+        self.fullname = f"t1_c{n}"
+        self.replies = []
+
+    def reply(self, body: str):
+        self.replies.append(body)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(bot.time, 'time', clock)
+    return clock
+
+
+def _replica(path, replica_id, clock):
+    """Just the parts of the bot that claim, queue and send replies"""
+    replica = CFBBeltBot.__new__(CFBBeltBot)
+    replica.ledger = WorkLedger(str(path), replica_id, LEASE, clock=clock)
+    replica._unowned = deque()
+    replica._sending = set()
+    replica._pending = {}
+    replica.cursors = {}
+    replica.subreddit_names = set()
+    replica.work = WorkQueue(clock=clock)
+    replica.governor = RateGovernor({}, cooldown_seconds=0, clock=clock)
+    return replica
+
+
+def _see(replica, comments):
+    """What the comment stream does for each new command"""
+    for comment in comments:
+        replica._claim('comments', f"reply:{comment.fullname}", PRIORITY_INTERACTIVE,
+                       lambda comment=comment: replica._queue_reply('reply', comment, f"re {comment.id}",
+                                                                    f"reply to {comment.id}", PRIORITY_INTERACTIVE),
+                       f"command {comment.id}")
+
+
+def _cycle(replica):
+    replica._heartbeat()
+    replica.work.run()
+    replica.governor.run_ready()
+
+
+@pytest.fixture
+def replicas(tmp_path, clock):
+    path = tmp_path / 'ledger.sqlite'
+    a, b = _replica(path, 'a', clock), _replica(path, 'b', clock)
+    for replica in (a, b, a):  # Both see each other before polling
+        replica.ledger.heartbeat()
+    return a, b
+
+
+def test_every_item_is_replied_to_once(replicas, clock):
+    a, b = replicas
+    comments = [FakeComment(n) for n in range(40)]
+    _see(a, comments)
+    _see(b, comments)
+
+    for _ in range(3):
+        _cycle(a)
+        _cycle(b)
+        clock.advance(LEASE)
+
+    assert [len(comment.replies) for comment in comments] == [1] * 40
+    assert not a._unowned and not b._unowned
+
+
+def test_work_queued_by_a_crashed_replica_is_taken_over(replicas, clock):
+    a, b = replicas
+    comments = [FakeComment(n) for n in range(40)]
+    _see(a, comments)
+    _see(b, comments)
+
+    # a claims and queues its share, then dies before sending any of it
+    a.work.run()
+    assert a.governor.queue
+    _cycle(b)
+
+    for _ in range(3):
+        clock.advance(LEASE)
+        _cycle(b)
+
+    assert [len(comment.replies) for comment in comments] == [1] * 40
+
+
+def test_a_slow_replica_keeps_its_work(replicas, clock):
+    a, b = replicas
+    comments = [FakeComment(n) for n in range(40)]
+    _see(a, comments)
+    _see(b, comments)
+
+    # a holds its sends past b's takeover deadline, but is still alive
+    a.work.run()
+    a.governor.blocked_until = clock() + 3 * LEASE
+    for _ in range(4):
+        clock.advance(LEASE)
+        _cycle(a)
+        _cycle(b)
+
+    assert [len(comment.replies) for comment in comments] == [1] * 40
+    assert not b._unowned
+
+
+def test_a_replica_back_from_a_stall_does_not_send_again(replicas, clock):
+    a, b = replicas
+    comments = [FakeComment(n) for n in range(40)]
+    _see(a, comments)
+    _see(b, comments)
+
+    a.work.run()
+    _cycle(b)
+    clock.advance(2 * LEASE)
+    _cycle(b)
+    _cycle(b)
+    assert [len(comment.replies) for comment in comments] == [1] * 40
+
+    # a wakes up with its queue intact and finds every claim taken over
+    _cycle(a)
+    assert [len(comment.replies) for comment in comments] == [1] * 40
+    assert not a._sending
+
+
+def test_a_failed_send_reopens_the_claim(replicas, clock):
+    a, b = replicas
+    comment = FakeComment(0)
+    key = f"reply:{comment.fullname}"
+    owner = a if a.ledger.owns(key) else b
+    other = b if owner is a else a
+
+    def fail(body):
+        raise RuntimeError('500')
+
+    comment.reply = fail
+    _see(owner, [comment])
+    _see(other, [comment])
+    owner.work.run()
+    owner.governor.run_ready()
+    assert not owner.ledger.is_done(key)
+
+    # The owner dies before its retry; the other replica sends it
+    del comment.reply
+    clock.advance(2 * LEASE)
+    _cycle(other)
+    _cycle(other)
+    assert comment.replies == ['re c0']
+
+
+def test_old_ledgers_count_their_claims_as_sent(tmp_path, clock):
+    path = str(tmp_path / 'ledger.sqlite')
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE claims (key TEXT PRIMARY KEY, replica_id TEXT NOT NULL, claimed_at REAL NOT NULL)")
+    db.execute("INSERT INTO claims VALUES ('reply:t1_old', 'gone', ?)", (clock(),))
+    db.commit()
+    db.close()
+
+    ledger = WorkLedger(path, 'a', LEASE, clock=clock)
+    assert ledger.is_done('reply:t1_old')
+    assert not ledger.claim('reply:t1_old')
+
+
+def test_unsent_items_are_checkpointed_and_resumed(tmp_path, clock):
+    a = _replica(tmp_path / 'ledger.sqlite', 'a', clock)
+    a.ledger.heartbeat()
+    comments = [FakeComment(n) for n in range(4)]
+    for n, comment in enumerate(comments):
+        comment.created_utc = clock() - n
+    a.cursors = {'comments': SimpleNamespace(checkpoint=lambda: {'fullname': 't1_c3', 'created_utc': clock()})}
+    a.checkpoints = CheckpointStore(str(tmp_path / 'checkpoints.json'))
+    _see(a, comments)
+    a.work.run()
+    a._save_checkpoints()
+
+    # a stops here; the cursor is past every comment but none was replied to
+    pending = CheckpointStore(a.checkpoints.path).get('comments')['pending']
+    assert pending == sorted(comment.fullname for comment in comments)
+
+    restarted = _replica(tmp_path / 'ledger.sqlite', 'a2', clock)
+    routed = []
+    restarted._resume = {'comments': pending}
+    restarted.reddit = SimpleNamespace(info=lambda fullnames: [c for c in comments if c.fullname in fullnames])
+    restarted._route_commands = routed.extend
+    restarted._resume_pending()
+    assert routed == comments
+
+    # Once sent, nothing is pending
+    a.governor.run_ready()
+    a._save_checkpoints()
+    assert a.checkpoints.get('comments')['pending'] == []
+
+
+@pytest.mark.parametrize('shared', [True, False])
+def test_a_send_leaves_the_checkpoint_before_the_reply(tmp_path, clock, shared):
+    a = _replica(tmp_path / 'ledger.sqlite', 'a', clock)
+    if shared:
+        a.ledger.heartbeat()
+    else:
+        a.ledger = None
+    comments = [FakeComment(n) for n in range(2)]
+    a.cursors = {'comments': SimpleNamespace(checkpoint=lambda: {'fullname': 't1_c1', 'created_utc': clock()})}
+    a.checkpoints = CheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+    def saved_pending():
+        return CheckpointStore(a.checkpoints.path).get('comments')['pending']
+
+    def crash(body):
+        # What a restart would resume if the process died mid-reply
+        comments[0].seen_at_reply = saved_pending()
+
+    def fail(body):
+        raise RuntimeError('500')
+
+    comments[0].reply = crash
+    comments[1].reply = fail
+    _see(a, comments)
+    a.work.run()
+    a.governor.run_ready()
+
+    assert comments[0].seen_at_reply == ['t1_c1']
+    assert saved_pending() == ['t1_c1']  # The failed one is back, for the retry
+
+    del comments[1].reply
+    clock.advance(3600)
+    a.governor.run_ready()
+    assert comments[1].replies == ['re c1']
+    assert saved_pending() == []
@@ -0,0 +1,148 @@
+"""RateGovernor and TokenBucket on a fake clock"""
+from types import SimpleNamespace
+
+from rate_governor import MAX_SEND_ATTEMPTS, RETRY_BASE_SECONDS, RateGovernor, TokenBucket
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def _governor(clock, limits=None, cooldown=0.0, budget=None):
+    return RateGovernor(limits or {'reply:*': 10}, cooldown_seconds=cooldown, budget=budget, clock=clock)
+
+
+def _recorder(sent, name):
+    return lambda: sent.append(name)
+
+
+def test_token_bucket_refills_at_its_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(per_hour=10, clock=clock)
+    assert all(bucket.try_take() for _ in range(10))
+    assert not bucket.try_take()
+    assert bucket.seconds_until_token() == 360.0
+
+    clock.advance(359)
+    assert not bucket.try_take()
+    clock.advance(1)
+    assert bucket.try_take()
+
+
+def test_bucket_limits_are_deferred_not_dropped():
+    clock = FakeClock()
+    governor = _governor(clock, {'reply:*': 2})
+    sent = []
+    for i in range(4):
+        governor.submit('reply:*', f"thread{i}", _recorder(sent, i))
+
+    assert governor.run_ready() == 2
+    assert sent == [0, 1]
+    assert governor.seconds_until_ready() == 1800.0
+
+    clock.advance(3600)
+    assert governor.run_ready() == 2
+    assert sent == [0, 1, 2, 3]
+    assert governor.seconds_until_ready() is None
+
+
+def test_thread_cooldown_and_priority():
+    clock = FakeClock()
+    governor = _governor(clock, cooldown=60)
+    sent = []
+    governor.submit('reply:*', 'thread', _recorder(sent, 'first'), priority=1)
+    governor.submit('reply:*', 'thread', _recorder(sent, 'second'), priority=1)
+    governor.submit('reply:*', 'other', _recorder(sent, 'urgent'), priority=0)
+
+    governor.run_ready()
+    assert sent == ['urgent', 'first']
+    assert governor.seconds_until_ready() == 60.0
+
+    clock.advance(60)
+    governor.run_ready()
+    assert sent == ['urgent', 'first', 'second']
+
+
+def test_reddit_budget_holds_everything_until_reset():
+    clock = FakeClock()
+    limits = {'remaining': 3, 'reset_timestamp': clock.now + 120}
+    governor = _governor(clock, budget=lambda: limits)
+    sent = []
+    governor.submit('reply:*', 'thread', _recorder(sent, 'held'))
+
+    assert governor.run_ready() == 0
+    assert governor.seconds_until_ready() == 120.0
+
+    clock.advance(120)
+    limits.update(remaining=600, reset_timestamp=clock.now + 600)
+    assert governor.run_ready() == 1
+    assert sent == ['held']
+
+
+def test_rate_limited_send_waits_as_asked_and_keeps_its_token():
+    clock = FakeClock()
+    governor = _governor(clock, {'reply:*': 1})
+    attempts = []
+
+    def send():
+        attempts.append(clock.now)
+        if len(attempts) == 1:
+            error = Exception('rate limited')
+            error.items = [SimpleNamespace(error_type='RATELIMIT', message='try again in 5 minutes.')]
+            raise error
+
+    governor.submit('reply:*', 'thread', send)
+    assert governor.run_ready() == 0
+    assert governor.buckets['reply:*'].tokens == 1
+    assert governor.seconds_until_ready() == 300.0
+
+    clock.advance(300)
+    assert governor.run_ready() == 1
+    assert len(attempts) == 2
+
+
+def test_failed_send_is_retried_with_backoff_then_dropped():
+    clock = FakeClock()
+    governor = _governor(clock, {'reply:*': 100})
+    attempts = []
+
+    def send():
+        attempts.append(clock.now)
+        raise RuntimeError('server error')
+
+    governor.submit('reply:*', 'thread', send)
+    for attempt in range(1, MAX_SEND_ATTEMPTS):
+        governor.run_ready()
+        assert len(attempts) == attempt
+        assert governor.seconds_until_ready() == RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+        assert governor.buckets['reply:*'].tokens == 100  # Refunded
+        clock.advance(governor.seconds_until_ready())
+
+    governor.run_ready()
+    assert len(attempts) == MAX_SEND_ATTEMPTS
+    assert governor.seconds_until_ready() is None  # Given up
+
+
+def test_failed_send_succeeds_on_retry():
+    clock = FakeClock()
+    governor = _governor(clock)
+    sent = []
+
+    def send():
+        if not sent:
+            sent.append('failed')
+            raise RuntimeError('timeout')
+        sent.append('sent')
+
+    governor.submit('reply:*', 'thread', send)
+    governor.run_ready()
+    clock.advance(RETRY_BASE_SECONDS)
+    assert governor.run_ready() == 1
+    assert sent == ['failed', 'sent']
@@ -0,0 +1,34 @@
+"""Team names in game and postgame thread titles"""
+import pytest
+
+from title_matcher import TeamTitleMatcher
+
+GEORGIA, ALABAMA, TEXAS, BOSTON_COLLEGE, NORTH_TEXAS = 1, 2, 3, 4, 5
+
+
+@pytest.fixture
+def matcher():
+    return TeamTitleMatcher({
+        'Georgia': GEORGIA, 'Alabama': ALABAMA, 'Texas': TEXAS, 'North Texas': NORTH_TEXAS,
+        'Boston College': BOSTON_COLLEGE, 'bc': BOSTON_COLLEGE,
+    })
+
+
+@pytest.mark.parametrize('title, teams', [
+    ('[Game Thread] Georgia @ Alabama (7:30 PM ET, ESPN/BC feed)', [GEORGIA, ALABAMA]),
+    ('[Game Thread] Georgia (5-0) vs. Alabama (4-1) (ESPN/BC)', [GEORGIA, ALABAMA]),
+    ('[Game Thread] BC at Georgia (12:00 PM ET, ACCN', [BOSTON_COLLEGE, GEORGIA]),
+    ('[Game Thread] North Texas vs. Texas', [NORTH_TEXAS, TEXAS]),
+    ('[Postgame Thread] Georgia Defeats Alabama 24-17 (BC feed)', [GEORGIA, ALABAMA]),
+])
+def test_thread_teams_ignore_parentheticals(matcher, title, teams):
+    assert matcher.find_thread_teams(title) == teams
+
+
+def test_postgame_ignores_parentheticals(matcher):
+    assert matcher.parse_postgame('[Postgame Thread] Georgia Defeats Alabama (ESPN/BC)') == {
+        'winner_id': GEORGIA, 'loser_id': ALABAMA, 'winner_score': None, 'loser_score': None
+    }
+    assert matcher.parse_postgame('[Postgame Thread] Texas Defeats North Texas 31-30 (2OT)') == {
+        'winner_id': TEXAS, 'loser_id': NORTH_TEXAS, 'winner_score': 31, 'loser_score': 30
+    }
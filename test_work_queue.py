@@ -0,0 +1,37 @@
+"""WorkQueue ordering and the main loop's wake-up"""
+import threading
+import time
+
+from work_queue import PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, PRIORITY_THREAD, WorkQueue
+
+
+def test_runs_by_priority_with_bulk_work_rationed():
+    queue = WorkQueue()
+    ran = []
+    for priority, name in ((PRIORITY_SCHEDULED, 'bulk1'), (PRIORITY_SCHEDULED, 'bulk2'),
+                           (PRIORITY_THREAD, 'thread'), (PRIORITY_INTERACTIVE, 'reply')):
+        queue.put(priority, lambda name=name: ran.append(name))
+
+    assert queue.run() == 3
+    assert ran == ['reply', 'thread', 'bulk1']
+    queue.run()
+    assert ran[-1] == 'bulk2'
+
+
+def test_wait_wakes_when_work_is_put():
+    queue = WorkQueue()
+    timer = threading.Timer(0.05, queue.put, (PRIORITY_SCHEDULED, lambda: None))
+    started = time.monotonic()
+    timer.start()
+    assert queue.wait(30)
+    assert time.monotonic() - started < 5
+    timer.join()
+
+
+def test_wait_times_out_without_work():
+    queue = WorkQueue()
+    assert not queue.wait(0.01)
+    queue.put(PRIORITY_INTERACTIVE, lambda: None)
+    queue.run()
+    assert queue.wait(0)  # Work put since the last wait still counts once
+    assert not queue.wait(0)
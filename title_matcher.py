@@ -0,0 +1,132 @@
+"""Match team names in game and postgame thread titles"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9&']+")
+POSTGAME_RE = re.compile(
+    r"\[Postgame Thread\]\s+(?P<winner>.+?)\s+defeats\s+(?P<loser>.+?)"
+    r"(?:\s+(?P<winner_score>\d+)\s*-\s*(?P<loser_score>\d+)\b.*)?$",
+    re.IGNORECASE
+)
+
+# Thread titles: "[Game Thread] Team @ Team (7:30 PM ET, ESPN)"; the teams
+# are between the tag and any parentheticals (records, time, network)
+THREAD_TAG_RE = re.compile(r"^\s*\[[^\]]*\]")
+PARENTHETICAL_RE = re.compile(r"\([^)]*\)?")
+SIDES_RE = re.compile(r"\s(?:@|at|vs\.?|versus|def\.?|defeats)\s", re.IGNORECASE)
+
+_END = object()
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def find_team(team_name: str, schools: Dict[int, str], school_ids_by_name: Dict[str, int],
+              aliases: Dict[str, str]) -> Optional[Tuple[int, str]]:
+    """
+    Resolve a user-typed team name: aliases first, then an exact name,
+    then the first school whose name contains it.
+    Returns (team_id, official_name) or None if not found.
+    """
+    if not team_name:
+        return None
+
+    team_name_lower = team_name.lower().strip()
+
+    # First, check aliases
+    if team_name_lower in aliases:
+        canonical_name = aliases[team_name_lower].lower()
+        if canonical_name in school_ids_by_name:
+            school_id = school_ids_by_name[canonical_name]
+            return (school_id, schools[school_id])
+
+    # Exact match
+    if team_name_lower in school_ids_by_name:
+        school_id = school_ids_by_name[team_name_lower]
+        return (school_id, schools[school_id])
+
+    # Partial match
+    for school_id, school_name in schools.items():
+        if team_name_lower in school_name.lower():
+            return (school_id, school_name)
+
+    return None
+
+
+class TeamTitleMatcher:
+    """
+    Word-level trie over every school name and alias.
+
+    Titles are scanned once, left to right, taking the longest name that
+    starts at each word, so "North Texas" is not read as "Texas" and the
+    cost depends on the title length rather than the number of aliases.
+    """
+
+    def __init__(self, names: Dict[str, int]):
+        """`names` maps each school name or alias to its school ID"""
+        self._trie = {}
+        for name, team_id in names.items():
+            node = self._trie
+            for token in _tokens(name):
+                node = node.setdefault(token, {})
+            if node is not self._trie:
+                node[_END] = team_id
+
+    def find_teams(self, title: str) -> List[int]:
+        """Return the IDs of the teams named in a title, in order"""
+        tokens = _tokens(title)
+        teams = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            match = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+
+            if match:
+                if match[0] not in teams:
+                    teams.append(match[0])
+                i = match[1]
+            else:
+                i += 1
+        return teams
+
+    def find_thread_teams(self, title: str) -> List[int]:
+        """
+        Return the IDs of the teams a game or postgame thread is about, in
+        order. Only the teams on either side of "@"/"vs"/"defeats" are
+        read, so a short alias can't match the broadcast note or the
+        records in parentheses (e.g. "BC" in "(ESPN/BC feed)").
+        """
+        teams = []
+        for side in SIDES_RE.split(PARENTHETICAL_RE.sub(' ', THREAD_TAG_RE.sub('', title))):
+            for team_id in self.find_teams(side):
+                if team_id not in teams:
+                    teams.append(team_id)
+        return teams
+
+    def parse_postgame(self, title: str) -> Optional[Dict]:
+        """
+        Parse "[Postgame Thread] Winner Defeats Loser 24-17".
+        Returns winner/loser IDs and scores, or None if the title doesn't parse.
+        """
+        match = POSTGAME_RE.search(PARENTHETICAL_RE.sub(' ', title).strip())
+        if not match:
+            return None
+
+        winners = self.find_teams(match.group('winner'))
+        losers = self.find_teams(match.group('loser'))
+        if not winners or not losers:
+            return None
+
+        return {
+            'winner_id': winners[0],
+            'loser_id': losers[0],
+            'winner_score': int(match.group('winner_score')) if match.group('winner_score') else None,
+            'loser_score': int(match.group('loser_score')) if match.group('loser_score') else None
+        }
@@ -0,0 +1,101 @@
+"""Prioritized work queue run from the bot's main loop"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from log import log_event
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0  # Replies to user commands and mentions
+PRIORITY_THREAD = 1  # Game and postgame thread comments
+PRIORITY_SCHEDULED = 2  # Scheduled posts and bulk computations
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_THREAD: 'thread',
+    PRIORITY_SCHEDULED: 'scheduled',
+}
+
+
+class LatencyStats:
+    """Queue latency (submitted -> started) per priority"""
+
+    def __init__(self):
+        self._stats = {}
+
+    def record(self, priority: int, seconds: float):
+        stats = self._stats.setdefault(priority, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            PRIORITY_NAMES.get(priority, str(priority)): {
+                'count': stats['count'],
+                'mean_seconds': stats['total'] / stats['count'],
+                'max_seconds': stats['max']
+            }
+            for priority, stats in sorted(self._stats.items())
+        }
+
+
+class WorkQueue:
+    """
+    Work submitted from any thread (the ingest loop, APScheduler jobs) and
+    run on the main loop, highest priority first, so bot state is only
+    touched from one thread and user replies never wait behind bulk jobs.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.latency = LatencyStats()
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()  # Set whenever work is put
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def put(self, priority: int, work: Callable[[], None], description: str = ''):
+        with self._lock:
+            heapq.heappush(self._heap, (priority, next(self._order), self.clock(), work, description))
+        self._ready.set()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds, waking as soon as work is put; True if it was"""
+        woken = self._ready.wait(timeout)
+        self._ready.clear()
+        return woken
+
+    def run(self, bulk_limit: int = 1) -> int:
+        """
+        Run queued work in priority order. At most `bulk_limit` scheduled
+        items run per call, so the loop gets back to ingesting in between.
+        """
+        ran = 0
+        bulk_ran = 0
+        while True:
+            with self._lock:
+                if not self._heap:
+                    break
+                if self._heap[0][0] >= PRIORITY_SCHEDULED and bulk_ran >= bulk_limit:
+                    break
+                priority, _, submitted, work, description = heapq.heappop(self._heap)
+
+            self.latency.record(priority, self.clock() - submitted)
+            if priority >= PRIORITY_SCHEDULED:
+                bulk_ran += 1
+            try:
+                work()
+            except Exception:
+                log_event(logger, 'work_failed', logging.ERROR, exc_info=True,
+                          description=description or 'queued work', priority=PRIORITY_NAMES.get(priority, priority))
+            ran += 1
+        return ran